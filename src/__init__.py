@@ -1,2 +1,6 @@
-from .. import bl_info
+try:
+    from .. import bl_info
+except ImportError:
+    # Imported on its own, outside the add-on (e.g. headless use of model.py)
+    bl_info = None
 __all__ = ['bl_info']
\ No newline at end of file
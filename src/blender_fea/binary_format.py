@@ -0,0 +1,347 @@
+"""
+Columnar binary model format (.feab)
+
+The JSON format stores every coordinate as text inside nested objects, which
+makes large files slow to write and slower to parse. This format stores the
+model as flat NumPy arrays that can be memory-mapped, so opening a model with
+a million elements does not parse anything:
+
+    magic       8 bytes  b'FEAMODEL'
+    version     uint32
+    header_len  uint32
+    header      JSON - array table (dtype, shape, offset) and metadata
+    arrays      raw little-endian arrays, each aligned to 64 bytes
+
+Arrays:
+
+    strings_offsets   int64  (N+1,)  string table - every name, utf-8
+    strings_blob      uint8  (...)
+    point_name        int32  (P,)    string index
+    point_coords      float64 (P, 3)
+    section_name      int32  (S,)
+    section_type      int8   (S,)    index into SECTION_TYPES
+    section_dims      float64 (S, 4) diameter, width, height, poly_diameter
+    section_sides     int32  (S,)
+    section_walls     float64 (S, 3) web, flange and wall thickness (version 2)
+    beam_name         int32  (B,)
+    beam_nodes        int32  (B, 2)  start/end point index, -1 if unresolved
+    beam_section      int32  (B,)    section index, -1 if none/unresolved
+    beam_diameter     float64 (B,)   NaN when the beam has a section name
+    beam_unresolved   int32  (K, 3)  beam, column (0 start, 1 end, 2 section), string
+    shell_name        int32  (H,)
+    shell_offsets     int64  (H+1,)  CSR offsets into shell_nodes
+    shell_nodes       int32  (...)   point index, -1 if unresolved
+    shell_unresolved  int32  (K, 2)  position in shell_nodes, string
+    shell_thickness   float64 (H,)
+
+References that do not resolve to an element are kept by name in the
+*_unresolved tables, so JSON -> binary -> JSON gives back the same document.
+
+No bpy in here - it can be used outside Blender.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from . import geometry
+from . import json_stream
+
+MAGIC = b'FEAMODEL'
+VERSION = 2
+ALIGNMENT = 64
+EXTENSION = '.feab'
+
+SECTION_TYPES = geometry.SECTION_TYPES
+
+_PREFIX = struct.Struct('<8sII')
+
+
+class StringTable:
+    """Interns strings while a model is being collected"""
+
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, text):
+        i = self.index.get(text)
+        if i is None:
+            i = len(self.strings)
+            self.index[text] = i
+            self.strings.append(text)
+        return i
+
+    def to_arrays(self):
+        encoded = [text.encode('utf-8') for text in self.strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return offsets, blob
+
+
+def decode_strings(arrays):
+    """All strings of a model's string table as a list"""
+    offsets = np.asarray(arrays['strings_offsets'])
+    blob = np.asarray(arrays['strings_blob']).tobytes()
+    return [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+def arrays_from_elements(elements):
+    """Build the model arrays from (kind, name, value) tuples in the JSON value format
+
+    Accepts the output of json_stream.iter_structural_data (or iter_elements).
+    Returns (arrays, metadata).
+    """
+    strings = StringTable()
+    metadata = {}
+    points = ([], [])
+    sections = ([], [], [], [], [])
+    beams = []
+    shells = []
+
+    for kind, name, value in elements:
+        if name is None:
+            if kind == 'metadata':
+                metadata = value
+        elif kind == 'points':
+            points[0].append(strings.add(name))
+            points[1].append(value)
+        elif kind == 'sections':
+            section_type = value.get('type', 'CIRCULAR')
+            if section_type not in SECTION_TYPES:
+                raise ValueError(f"Section {name!r} has unknown type {section_type!r}")
+            sections[0].append(strings.add(name))
+            sections[1].append(SECTION_TYPES.index(section_type))
+            sections[2].append((
+                value.get('diameter', 0.1) if section_type in ('CIRCULAR', 'TUBE') else 0.1,
+                value.get('width', 0.1),
+                value.get('height', 0.15),
+                value.get('diameter', 0.1) if value.get('type') == 'POLYGONAL' else 0.1,
+            ))
+            sections[3].append(value.get('sides', 6))
+            sections[4].append(tuple(value.get(key, default) for key, default in geometry.DEFAULT_WALLS.items()))
+        elif kind == 'beams':
+            if isinstance(value, dict) and 'start_point' in value and 'end_point' in value:
+                beams.append((name, value))
+        elif kind == 'shells':
+            if isinstance(value, dict) and 'points' in value:
+                shells.append((name, value))
+
+    point_lookup = {}
+    for i, string_index in enumerate(points[0]):
+        point_lookup.setdefault(string_index, i)
+    section_lookup = {}
+    for i, string_index in enumerate(sections[0]):
+        section_lookup.setdefault(string_index, i)
+
+    arrays = {
+        'point_name': np.array(points[0], dtype=np.int32),
+        'point_coords': np.array(points[1], dtype=np.float64).reshape(-1, 3),
+        'section_name': np.array(sections[0], dtype=np.int32),
+        'section_type': np.array(sections[1], dtype=np.int8),
+        'section_dims': np.array(sections[2], dtype=np.float64).reshape(-1, 4),
+        'section_sides': np.array(sections[3], dtype=np.int32),
+        'section_walls': np.array(sections[4], dtype=np.float64).reshape(-1, 3),
+    }
+
+    # Beams - integer connectivity, unresolved names kept on the side
+    beam_name = np.empty(len(beams), dtype=np.int32)
+    beam_nodes = np.full((len(beams), 2), -1, dtype=np.int32)
+    beam_section = np.full(len(beams), -1, dtype=np.int32)
+    beam_diameter = np.full(len(beams), np.nan, dtype=np.float64)
+    beam_unresolved = []
+    for b, (name, value) in enumerate(beams):
+        beam_name[b] = strings.add(name)
+        for column, key in enumerate(('start_point', 'end_point')):
+            string_index = strings.add(value[key])
+            if string_index in point_lookup:
+                beam_nodes[b, column] = point_lookup[string_index]
+            else:
+                beam_unresolved.append((b, column, string_index))
+        if 'section' in value:
+            string_index = strings.add(value['section'])
+            if string_index in section_lookup:
+                beam_section[b] = section_lookup[string_index]
+            else:
+                beam_unresolved.append((b, 2, string_index))
+        else:
+            beam_diameter[b] = value.get('diameter', 0.1)
+
+    arrays.update({
+        'beam_name': beam_name,
+        'beam_nodes': beam_nodes,
+        'beam_section': beam_section,
+        'beam_diameter': beam_diameter,
+        'beam_unresolved': np.array(beam_unresolved, dtype=np.int32).reshape(-1, 3),
+    })
+
+    # Shells - CSR connectivity
+    shell_name = np.empty(len(shells), dtype=np.int32)
+    shell_offsets = np.zeros(len(shells) + 1, dtype=np.int64)
+    shell_thickness = np.empty(len(shells), dtype=np.float64)
+    shell_nodes = []
+    shell_unresolved = []
+    for h, (name, value) in enumerate(shells):
+        shell_name[h] = strings.add(name)
+        shell_thickness[h] = value.get('thickness', 0.05)
+        for point_name in value['points']:
+            string_index = strings.add(point_name)
+            if string_index in point_lookup:
+                shell_nodes.append(point_lookup[string_index])
+            else:
+                shell_unresolved.append((len(shell_nodes), string_index))
+                shell_nodes.append(-1)
+        shell_offsets[h + 1] = len(shell_nodes)
+
+    arrays.update({
+        'shell_name': shell_name,
+        'shell_offsets': shell_offsets,
+        'shell_nodes': np.array(shell_nodes, dtype=np.int32),
+        'shell_unresolved': np.array(shell_unresolved, dtype=np.int32).reshape(-1, 2),
+        'shell_thickness': shell_thickness,
+    })
+
+    arrays['strings_offsets'], arrays['strings_blob'] = strings.to_arrays()
+    return arrays, metadata
+
+def iter_elements(arrays, metadata=None):
+    """Yield (kind, name, value) tuples in the JSON value format, in export order"""
+    strings = decode_strings(arrays)
+    point_names = [strings[i] for i in arrays['point_name']]
+    section_names = [strings[i] for i in arrays['section_name']]
+
+    coords = arrays['point_coords']
+    for i, name in enumerate(point_names):
+        yield 'points', name, [float(c) for c in coords[i]]
+
+    beam_refs = {(int(b), int(column)): strings[s] for b, column, s in arrays['beam_unresolved']}
+    beam_nodes = arrays['beam_nodes']
+    beam_section = arrays['beam_section']
+    beam_diameter = arrays['beam_diameter']
+    for b, string_index in enumerate(arrays['beam_name']):
+        start, end = beam_nodes[b]
+        value = {
+            'start_point': point_names[start] if start >= 0 else beam_refs[(b, 0)],
+            'end_point': point_names[end] if end >= 0 else beam_refs[(b, 1)],
+        }
+        if beam_section[b] >= 0:
+            value['section'] = section_names[beam_section[b]]
+        elif (b, 2) in beam_refs:
+            value['section'] = beam_refs[(b, 2)]
+        else:
+            value['diameter'] = float(beam_diameter[b])
+        yield 'beams', strings[string_index], value
+
+    shell_refs = {int(position): strings[s] for position, s in arrays['shell_unresolved']}
+    offsets = arrays['shell_offsets']
+    shell_nodes = arrays['shell_nodes']
+    shell_thickness = arrays['shell_thickness']
+    for h, string_index in enumerate(arrays['shell_name']):
+        names = []
+        for position in range(offsets[h], offsets[h + 1]):
+            node = shell_nodes[position]
+            names.append(point_names[node] if node >= 0 else shell_refs[int(position)])
+        yield 'shells', strings[string_index], {'points': names, 'thickness': float(shell_thickness[h])}
+
+    dims = arrays['section_dims']
+    walls = arrays['section_walls']
+    for s, name in enumerate(section_names):
+        section_type = SECTION_TYPES[arrays['section_type'][s]]
+        yield 'sections', name, geometry.section_value(
+            section_type,
+            diameter=float(dims[s, 3] if section_type == 'POLYGONAL' else dims[s, 0]),
+            width=float(dims[s, 1]),
+            height=float(dims[s, 2]),
+            sides=int(arrays['section_sides'][s]),
+            web_thickness=float(walls[s, 0]),
+            flange_thickness=float(walls[s, 1]),
+            wall_thickness=float(walls[s, 2]),
+        )
+
+    if metadata:
+        yield 'metadata', None, metadata
+
+def write_model(filepath, arrays, metadata=None):
+    """Write model arrays to a .feab file"""
+    table = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        table[name] = {
+            'dtype': array.dtype.newbyteorder('<').str,
+            'shape': list(array.shape),
+            'offset': offset,
+        }
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({'arrays': table, 'metadata': metadata or {}}).encode('utf-8')
+    data_start = -(-(_PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(filepath, 'wb') as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        file.write(b'\0' * (data_start - _PREFIX.size - len(header)))
+        for name, array in arrays.items():
+            data = np.ascontiguousarray(array, dtype=table[name]['dtype']).tobytes()
+            file.write(data)
+            file.write(b'\0' * (-len(data) % ALIGNMENT))
+
+def is_binary_model(filepath):
+    """True if the file starts with the .feab magic bytes"""
+    with open(filepath, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+def read_model(filepath, mmap=True):
+    """Read a .feab file, returning (arrays, metadata)
+
+    With mmap the arrays are read-only np.memmap views - nothing is loaded
+    until it is used.
+    """
+    with open(filepath, 'rb') as file:
+        magic, version, header_len = _PREFIX.unpack(file.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a BlenderFEA binary model: {filepath}")
+        if version > VERSION:
+            raise ValueError(f"Unsupported binary model version {version}")
+        header = json.loads(file.read(header_len).decode('utf-8'))
+        data_start = -(-(_PREFIX.size + header_len) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, entry in header['arrays'].items():
+            dtype = np.dtype(entry['dtype'])
+            shape = tuple(entry['shape'])
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            elif mmap:
+                arrays[name] = np.memmap(filepath, dtype=dtype, mode='r', offset=data_start + entry['offset'], shape=shape)
+            else:
+                file.seek(data_start + entry['offset'])
+                arrays[name] = np.fromfile(file, dtype=dtype, count=count).reshape(shape)
+
+    if 'section_walls' not in arrays:
+        # Version 1 files only had solid sections
+        defaults = np.array(list(geometry.DEFAULT_WALLS.values()), dtype=np.float64)
+        arrays['section_walls'] = np.tile(defaults, (len(arrays['section_name']), 1))
+
+    return arrays, header.get('metadata', {})
+
+def json_to_binary(json_path, binary_path):
+    """Convert a structural JSON file to the binary format"""
+    with json_stream.open_model(json_path) as file:
+        arrays, metadata = arrays_from_elements(json_stream.iter_structural_data(file))
+    write_model(binary_path, arrays, metadata)
+
+def binary_to_json(binary_path, json_path, indent=2):
+    """Convert a binary model back to structural JSON"""
+    arrays, metadata = read_model(binary_path)
+    data = {"structural_data": {"points": {}, "beams": {}, "shells": {}, "sections": {}}}
+    model = data["structural_data"]
+    for kind, name, value in iter_elements(arrays, metadata):
+        if name is None:
+            model[kind] = value
+        else:
+            model[kind][name] = value
+    with json_stream.open_model(json_path, 'w') as file:
+        json.dump(data, file, indent=indent, ensure_ascii=False)
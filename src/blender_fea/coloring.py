@@ -0,0 +1,227 @@
+"""
+Colouring points, beams and shells through one shared material
+
+Every coloured element uses the same material, FEA_Attribute_Color, which
+takes its colour from attributes rather than from per-element node trees:
+
+    Attribute (Object "color")        Object.color of elements drawn by their own object
+    Attribute (Geometry "fea_color")  per-corner colour of the merged meshes
+    Mix, factor = fea_color alpha     merged meshes use their attribute, objects their colour
+
+so colouring a model is one colour array - written to Object.color or to
+the fea_color attribute with foreach_set - and the material count stays at
+one however many elements there are.
+
+Without any material at all, the same colours show in Solid viewport
+shading: color_type OBJECT draws Object.color, and color_type VERTEX
+(Attribute) draws the active colour attribute, which fea_color is made.
+color_beams_solid uses that for section colours - no materials, no node
+trees.
+"""
+
+import hashlib
+
+import bpy
+import numpy as np
+
+from . import geometry
+from . import utils
+
+MATERIAL_NAME = "FEA_Attribute_Color"
+COLOR_ATTRIBUTE = "fea_color"
+UNASSIGNED_COLOR = (0.5, 0.5, 0.5, 1.0)
+
+
+def mix_color_node(tree):
+    """Color mix node - (node, factor, a, b, result) for the 3.4+ Mix node or the legacy MixRGB"""
+    try:
+        node = tree.nodes.new('ShaderNodeMix')
+        node.data_type = 'RGBA'  # type: ignore
+        return node, node.inputs[0], node.inputs[6], node.inputs[7], node.outputs[2]
+    except RuntimeError:
+        node = tree.nodes.new('ShaderNodeMixRGB')
+        return node, node.inputs['Fac'], node.inputs['Color1'], node.inputs['Color2'], node.outputs['Color']
+
+def ensure_attribute_material(emission_strength=0.0):
+    """The shared attribute-colour material; emission_strength > 0 makes it glow in that colour"""
+    material = bpy.data.materials.get(MATERIAL_NAME)
+    if material is None:
+        material = bpy.data.materials.new(MATERIAL_NAME)
+        material.use_nodes = True
+        tree = material.node_tree
+        nodes = tree.nodes
+        links = tree.links
+        nodes.clear()  # type: ignore
+
+        object_color = nodes.new('ShaderNodeAttribute')
+        object_color.attribute_type = 'OBJECT'  # type: ignore
+        object_color.attribute_name = "color"  # type: ignore
+        geometry_color = nodes.new('ShaderNodeAttribute')
+        geometry_color.attribute_type = 'GEOMETRY'  # type: ignore
+        geometry_color.attribute_name = COLOR_ATTRIBUTE  # type: ignore
+
+        # Meshes without fea_color read alpha 0 and fall back to the object colour
+        mix, factor, color_a, color_b, color = mix_color_node(tree)
+        links.new(geometry_color.outputs['Alpha'], factor)
+        links.new(object_color.outputs['Color'], color_a)
+        links.new(geometry_color.outputs['Color'], color_b)
+
+        bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+        bsdf.name = 'Principled BSDF'
+        bsdf.inputs['Roughness'].default_value = 0.3  # type: ignore
+        emission = nodes.new('ShaderNodeEmission')
+        emission.name = 'Emission'
+        shader = nodes.new('ShaderNodeMixShader')
+        shader.name = 'Emission Mix'
+        output = nodes.new('ShaderNodeOutputMaterial')
+
+        links.new(color, bsdf.inputs['Base Color'])
+        links.new(color, emission.inputs['Color'])
+        links.new(bsdf.outputs['BSDF'], shader.inputs[1])
+        links.new(emission.outputs['Emission'], shader.inputs[2])
+        links.new(shader.outputs['Shader'], output.inputs['Surface'])
+
+        for x, column in enumerate(((object_color, geometry_color), (mix,), (bsdf, emission), (shader,), (output,))):
+            for y, node in enumerate(column):
+                node.location = (x * 250, -y * 300)
+
+    nodes = material.node_tree.nodes  # type: ignore
+    nodes['Emission'].inputs['Strength'].default_value = emission_strength  # type: ignore
+    nodes['Emission Mix'].inputs['Fac'].default_value = 1.0 if emission_strength > 0 else 0.0  # type: ignore
+    return material
+
+def assign_material(obj, material):
+    """Make material the only material of obj's mesh (left alone if it already is)"""
+    materials = obj.data.materials
+    if len(materials) != 1 or materials[0] != material:
+        materials.clear()
+        materials.append(material)
+
+def write_color_attribute(mesh, face_colors):
+    """Write (F, 4) face colours to the fea_color corner attribute in one foreach_set"""
+    attribute = mesh.attributes.get(COLOR_ATTRIBUTE)
+    if attribute is not None and (attribute.domain != 'CORNER' or attribute.data_type != 'FLOAT_COLOR'):
+        mesh.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = mesh.attributes.new(COLOR_ATTRIBUTE, 'FLOAT_COLOR', 'CORNER')
+
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+    corner_colors = np.repeat(np.asarray(face_colors, dtype=np.float32), loop_totals, axis=0)
+    attribute.data.foreach_set('color', corner_colors.ravel())
+    # Solid shading in Attribute mode draws the active colour attribute
+    if hasattr(mesh, 'color_attributes'):
+        mesh.color_attributes.active_color = attribute
+    utils.update_mesh(mesh)
+    return attribute
+
+def ramp_colors(values, color_low, color_high, color_none):
+    """(N, 4) colours running from color_low to color_high over the positive values
+
+    Values <= 0 get color_none; when all positive values are equal they get
+    the middle of the ramp.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    colors = np.tile(np.asarray(color_none, dtype=np.float32), (len(values), 1))
+    positive = values > 0
+    if not positive.any():
+        return colors
+
+    low = values[positive].min()
+    span = values[positive].max() - low
+    factor = (values[positive] - low) / span if span > 0 else np.full(positive.sum(), 0.5)
+    color_low = np.asarray(color_low, dtype=np.float64)
+    color_high = np.asarray(color_high, dtype=np.float64)
+    colors[positive] = color_low + (color_high - color_low) * factor[:, None]
+    colors[positive, 3] = color_low[3]
+    return colors
+
+def name_color(name):
+    """Consistent colour for a name, from its hash, kept away from black and white"""
+    hash_hex = hashlib.md5(name.encode()).hexdigest()
+    rgb = [max(0.3, min(0.9, int(hash_hex[i:i + 2], 16) / 255.0)) for i in (0, 2, 4)]
+    return (*rgb, 1.0)
+
+def section_colors(structural_data):
+    """(B, 4) colour of every beam from its section name - UNASSIGNED_COLOR without one"""
+    names = [beam.section_name for beam in structural_data.beams]
+    if not names:
+        return np.empty((0, 4), dtype=np.float32)
+    unique, inverse = np.unique(np.array(names, dtype=object), return_inverse=True)
+    palette = np.array([name_color(name) if name else UNASSIGNED_COLOR for name in unique], dtype=np.float32)
+    return palette[inverse]
+
+def face_colors(collection, mesh, colors):
+    """(F, 4) colour of every face of a merged mesh, from the ranges of the elements drawn in it
+
+    Faces outside every element's range get UNASSIGNED_COLOR. Returns
+    (face colours, number of elements with faces).
+    """
+    starts, counts = utils.get_element_ranges(collection)
+    owner = geometry.range_owner(starts, counts, len(mesh.polygons))
+    palette = np.vstack([np.asarray(colors, dtype=np.float32).reshape(-1, 4), UNASSIGNED_COLOR])
+    return palette[owner], int(np.count_nonzero((starts >= 0) & (counts > 0)))
+
+def color_beams_solid(structural_data, colors):
+    """Colour every beam with its row of (B, 4) colors without materials
+
+    Returns (beams coloured, Solid shading color_type that shows them).
+    Geometry Nodes beams are instances and cannot be coloured one by one.
+    """
+    mode = structural_data.beam_display_mode
+    if mode == 'MERGED':
+        beam_obj = bpy.data.objects.get(utils.BEAM_MESH_NAME)
+        if beam_obj is None or not len(beam_obj.data.polygons):
+            return 0, 'VERTEX'
+        colors, colored = face_colors(structural_data.beams, beam_obj.data, colors)
+        write_color_attribute(beam_obj.data, colors)
+        return colored, 'VERTEX'
+
+    if mode != 'OBJECTS':
+        return 0, 'OBJECT'
+
+    colored = 0
+    for beam, color in zip(structural_data.beams, colors):
+        beam_obj = utils.get_element_object(beam)
+        if beam_obj is not None:
+            beam_obj.color = color
+            colored += 1
+    return colored, 'OBJECT'
+
+def color_shells(structural_data, colors, material):
+    """Colour every shell with its row of (S, 4) colors, returning how many shells are drawn"""
+    if structural_data.shell_display_mode == 'MERGED':
+        shell_obj = bpy.data.objects.get(utils.SHELL_MESH_NAME)
+        if shell_obj is None:
+            return 0
+        colors, colored = face_colors(structural_data.shells, shell_obj.data, colors)
+        write_color_attribute(shell_obj.data, colors)
+        assign_material(shell_obj, material)
+        return colored
+
+    colored = 0
+    for shell, color in zip(structural_data.shells, colors):
+        shell_obj = utils.get_element_object(shell)
+        if shell_obj is not None:
+            shell_obj.color = color
+            assign_material(shell_obj, material)
+            colored += 1
+    return colored
+
+def show_solid_colors(context, color_type):
+    """Switch every 3D viewport to Solid shading coloured by object colour ('OBJECT') or attribute ('VERTEX')"""
+    for area in context.screen.areas:  # type: ignore
+        if area.type == 'VIEW_3D':
+            for space in area.spaces:
+                if space.type == 'VIEW_3D':
+                    space.shading.type = 'SOLID'  # type: ignore
+                    space.shading.color_type = color_type  # type: ignore
+
+def show_material_preview(context):
+    """Switch every 3D viewport to Material Preview"""
+    for area in context.screen.areas:  # type: ignore
+        if area.type == 'VIEW_3D':
+            for space in area.spaces:
+                if space.type == 'VIEW_3D':
+                    space.shading.type = 'MATERIAL'  # type: ignore
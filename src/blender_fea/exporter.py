@@ -0,0 +1,118 @@
+"""
+A scene's structural_data as elements in the structural JSON value format
+
+Numeric columns (coordinates, diameters, thicknesses) are read in bulk with
+foreach_get and the elements are yielded one at a time (iter_elements).
+model.get_model() builds its StructuralModel from them, and export writes
+that model out (StructuralModel.save), as JSON or binary.
+"""
+
+import numpy as np
+
+from . import geometry
+from . import model_index
+
+
+def section_to_dict(section):
+    """JSON description of one section, including its computed properties"""
+    return geometry.section_value(
+        section.section_type,
+        diameter=section.poly_diameter if section.section_type == 'POLYGONAL' else section.diameter,
+        width=section.width,
+        height=section.height,
+        sides=section.sides,
+        web_thickness=section.web_thickness,
+        flange_thickness=section.flange_thickness,
+        wall_thickness=section.wall_thickness,
+    )
+
+def beam_to_dict(beam):
+    """JSON description of one beam"""
+    beam_data = {
+        "start_point": beam.start_point,
+        "end_point": beam.end_point
+    }
+    if beam.section_name:
+        beam_data["section"] = beam.section_name
+    else:
+        beam_data["diameter"] = beam.diameter
+    return beam_data
+
+def shell_to_dict(shell):
+    """JSON description of one shell"""
+    return {
+        "points": model_index.split_point_list(shell.point_list),
+        "thickness": shell.thickness
+    }
+
+def read_column(collection, attr, dtype=np.float32):
+    """One numeric property of every element of a collection, via foreach_get"""
+    values = np.empty(len(collection), dtype=dtype)
+    collection.foreach_get(attr, values)
+    return values
+
+def iter_points(structural_data):
+    """Yield (name, [x, y, z]) for every point"""
+    coords = model_index.point_coordinates(structural_data).tolist()
+    for point, xyz in zip(structural_data.points, coords):
+        yield point.name, xyz
+
+def iter_beams(structural_data):
+    """Yield (name, value) for every beam, with end points resolved through node IDs"""
+    beams = structural_data.beams
+    diameters = read_column(beams, 'diameter').tolist()
+    starts = model_index.node_indices(structural_data, read_column(beams, 'start_node', np.int32)).tolist()
+    ends = model_index.node_indices(structural_data, read_column(beams, 'end_node', np.int32)).tolist()
+    point_names = [point.name for point in structural_data.points] if len(beams) else []
+    for beam, diameter, start, end in zip(beams, diameters, starts, ends):
+        beam_data = {
+            "start_point": point_names[start] if start >= 0 else beam.start_point,
+            "end_point": point_names[end] if end >= 0 else beam.end_point
+        }
+        if beam.section_name:
+            beam_data["section"] = beam.section_name
+        else:
+            beam_data["diameter"] = diameter
+        yield beam.name, beam_data
+
+def iter_shells(structural_data):
+    """Yield (name, value) for every shell, with points resolved through node IDs"""
+    shells = structural_data.shells
+    thicknesses = read_column(shells, 'thickness').tolist()
+    offsets, indices = model_index.shell_point_indices(structural_data)
+    offsets = offsets.tolist()
+    indices = indices.tolist()
+    point_names = [point.name for point in structural_data.points] if len(shells) else []
+    for h, (shell, thickness) in enumerate(zip(shells, thicknesses)):
+        shell_indices = indices[offsets[h]:offsets[h + 1]]
+        if -1 in shell_indices or not shell_indices:
+            # Unresolved names only survive in the text
+            names = model_index.split_point_list(shell.point_list)
+        else:
+            names = [point_names[i] for i in shell_indices]
+        yield shell.name, {
+            "points": names,
+            "thickness": thickness
+        }
+
+def iter_sections(structural_data):
+    """Yield (name, value) for every section"""
+    for section in structural_data.sections:
+        yield section.name, section_to_dict(section)
+
+# Element kinds in export order
+ELEMENT_WRITERS = (
+    ('points', iter_points),
+    ('beams', iter_beams),
+    ('shells', iter_shells),
+    ('sections', iter_sections),
+)
+
+def iter_elements(structural_data, metadata=None):
+    """Yield (kind, name, value) for every element, in export order"""
+    for kind, iter_kind in ELEMENT_WRITERS:
+        for name, value in iter_kind(structural_data):
+            yield kind, name, value
+
+    if metadata is not None:
+        yield 'metadata', None, metadata
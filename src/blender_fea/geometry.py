@@ -0,0 +1,652 @@
+"""
+Vectorised geometry for structural members
+
+Everything here works on NumPy arrays only - no bpy - so whole models can be
+built in a handful of array operations and written to a mesh in one go with
+foreach_set (see write_mesh_arrays).
+
+A beam is a prism: a 2D section outline swept from its start point to its end
+point. The outline and the face layout of the prism only depend on the
+section, so they are computed once per section as a ProfileTemplate and
+reused for every beam using that section.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Circular sections are drawn as polygons with this many sides
+CIRCLE_SIDES = 8
+
+# Below this the beam has no usable direction
+MIN_BEAM_LENGTH = 1e-9
+
+
+# Section types and how their dimensions map onto a profile (see section_profile)
+SOLID_TYPES = ('CIRCULAR', 'RECTANGULAR', 'POLYGONAL')
+OPEN_TYPES = ('I_SECTION', 'CHANNEL', 'ANGLE')
+HOLLOW_TYPES = ('TUBE', 'BOX')
+SECTION_TYPES = SOLID_TYPES + OPEN_TYPES + HOLLOW_TYPES
+
+# Wall thicknesses of sections that do not give them
+DEFAULT_WALLS = {'web_thickness': 0.006, 'flange_thickness': 0.01, 'wall_thickness': 0.005}
+
+# Walls are kept thinner than this fraction of the dimension they cut into
+MAX_WALL_FRACTION = 0.49
+
+
+class ProfileTemplate:
+    """Section outline and prism face layout shared by every beam with the same section
+
+    outline            (m, 2) section outline in the beam's local x/y plane; for
+                       hollow sections the outer ring followed by the inner ring
+    hollow             True when the outline is an outer and an inner ring of
+                       equal size, joined by quads at the ends
+    face_loop_starts   (F,)   first loop of each face
+    loop_indices       (L,)   vertex of each loop - start end is 0..m-1, finish end is m..2m-1
+    """
+
+    def __init__(self, outline, inner=None):
+        self.hollow = inner is not None
+        if self.hollow:
+            outline = np.concatenate((outline, inner))
+        self.outline = np.ascontiguousarray(outline, dtype=np.float64)
+        faces = prism_faces(len(self.outline), self.hollow)
+        self.face_loop_starts, self.loop_indices = flatten_faces(faces)
+
+    @property
+    def vertex_count(self):
+        return 2 * len(self.outline)
+
+    @property
+    def face_count(self):
+        return len(self.face_loop_starts)
+
+    @property
+    def loop_count(self):
+        return len(self.loop_indices)
+
+
+SectionProperties = namedtuple('SectionProperties', 'area iy iz j wy wz')
+SectionProperties.__doc__ = """Geometric properties of a section about its centroid
+
+iy is the second moment of area about the section's horizontal (width)
+axis - the major axis of an I-section - and iz about its vertical axis;
+wy and wz are the matching elastic section moduli and j the torsion constant.
+"""
+
+_TEMPLATE_CACHE = {}
+_PROPERTIES_CACHE = {}
+
+def section_profile(section_type, diameter=0.1, width=0.1, height=0.15, sides=6,
+                    web_thickness=0.0, flange_thickness=0.0, wall_thickness=0.0):
+    """(section_type, size1, size2, sides, t1, t2) profile for a section's dimensions
+
+    size1/t1 run along the section's width (local x), size2/t2 along its
+    height (local y): t1 is the web thickness of open sections, t2 the
+    flange thickness. Hollow sections have one wall thickness for both.
+    """
+    if section_type == 'RECTANGULAR':
+        return section_type, width, height, 4, 0.0, 0.0
+    if section_type == 'POLYGONAL':
+        return section_type, diameter, diameter, sides, 0.0, 0.0
+    if section_type in OPEN_TYPES:
+        return section_type, width, height, 0, web_thickness, flange_thickness
+    if section_type == 'BOX':
+        return section_type, width, height, 4, wall_thickness, wall_thickness
+    if section_type == 'TUBE':
+        return section_type, diameter, diameter, CIRCLE_SIDES, wall_thickness, wall_thickness
+    return 'CIRCULAR', diameter, diameter, CIRCLE_SIDES, 0.0, 0.0
+
+def profile_from_value(value):
+    """Profile of a section in the JSON value format"""
+    return section_profile(
+        value.get('type', 'CIRCULAR'),
+        diameter=value.get('diameter', 0.1),
+        width=value.get('width', 0.1),
+        height=value.get('height', 0.15),
+        sides=value.get('sides', 6),
+        **{key: value.get(key, default) for key, default in DEFAULT_WALLS.items()}
+    )
+
+def section_value(section_type, diameter=0.1, width=0.1, height=0.15, sides=6,
+                  web_thickness=0.0, flange_thickness=0.0, wall_thickness=0.0):
+    """A section in the JSON value format: its type, the dimensions it uses and its properties"""
+    value = {"type": section_type}
+    if section_type in ('CIRCULAR', 'TUBE'):
+        value["diameter"] = diameter
+    elif section_type == 'POLYGONAL':
+        value["diameter"] = diameter
+        value["sides"] = sides
+    else:
+        value["width"] = width
+        value["height"] = height
+    if section_type in OPEN_TYPES:
+        value["web_thickness"] = web_thickness
+        value["flange_thickness"] = flange_thickness
+    elif section_type in HOLLOW_TYPES:
+        value["wall_thickness"] = wall_thickness
+
+    properties = section_properties(*profile_from_value(value))
+    value["properties"] = {"A": properties.area, "Iy": properties.iy, "Iz": properties.iz,
+                           "J": properties.j, "Wy": properties.wy, "Wz": properties.wz}
+    return value
+
+def walls_fit(section_type, size1, size2, sides, t1, t2):
+    """True if the walls of an open or hollow section leave room for the rest of it"""
+    if section_type in ('I_SECTION', 'CHANNEL'):
+        return 0 < t1 < size1 and 0 < 2 * t2 < size2
+    if section_type == 'ANGLE':
+        return 0 < t1 < size1 and 0 < t2 < size2
+    if section_type in HOLLOW_TYPES:
+        return 0 < 2 * t1 < size1 and 0 < 2 * t2 < size2
+    return True
+
+def polygon_outline(diameter, sides):
+    """Regular polygon outline inscribed in a circle of the given diameter"""
+    angles = np.arange(sides) * (2.0 * np.pi / sides)
+    radius = diameter / 2.0
+    return np.column_stack((np.cos(angles) * radius, np.sin(angles) * radius))
+
+def rectangle_outline(width, height):
+    """Rectangle outline centred on the beam axis, counter-clockwise"""
+    w, h = width / 2.0, height / 2.0
+    return np.array(((-w, -h), (w, -h), (w, h), (-w, h)), dtype=np.float64)
+
+def i_section_outline(width, height, web, flange):
+    """Doubly symmetric I/H outline, flanges along the width"""
+    w, h, t = width / 2.0, height / 2.0, web / 2.0
+    f = h - flange
+    return np.array(((-w, -h), (w, -h), (w, -f), (t, -f), (t, f), (w, f),
+                     (w, h), (-w, h), (-w, f), (-t, f), (-t, -f), (-w, -f)), dtype=np.float64)
+
+def channel_outline(width, height, web, flange):
+    """Channel outline, web on the -x side and flanges pointing +x, centroid at the origin"""
+    f = height - flange
+    outline = np.array(((0, 0), (width, 0), (width, flange), (web, flange), (web, f),
+                         (width, f), (width, height), (0, height)), dtype=np.float64)
+    return outline - polygon_centroid(outline)
+
+def angle_outline(width, height, web, flange):
+    """L outline, vertical leg on the -x side and horizontal leg at the bottom, centroid at the origin"""
+    outline = np.array(((0, 0), (width, 0), (width, flange), (web, flange), (web, height), (0, height)),
+                       dtype=np.float64)
+    return outline - polygon_centroid(outline)
+
+def clamp_walls(section_type, size1, size2, t1, t2):
+    """Wall thicknesses limited so that the outline never folds over itself"""
+    if section_type == 'ANGLE':
+        return min(t1, 2 * MAX_WALL_FRACTION * size1), min(t2, 2 * MAX_WALL_FRACTION * size2)
+    if section_type in OPEN_TYPES:
+        return min(t1, 2 * MAX_WALL_FRACTION * size1), min(t2, MAX_WALL_FRACTION * size2)
+    if section_type in HOLLOW_TYPES:
+        return min(t1, MAX_WALL_FRACTION * size1), min(t2, MAX_WALL_FRACTION * size2)
+    return t1, t2
+
+def section_rings(section_type, size1, size2, sides, t1=0.0, t2=0.0):
+    """(outer, inner) outline rings for a profile - inner is None for solid and open sections"""
+    t1, t2 = clamp_walls(section_type, size1, size2, t1, t2)
+    if section_type == 'I_SECTION':
+        return i_section_outline(size1, size2, t1, t2), None
+    if section_type == 'CHANNEL':
+        return channel_outline(size1, size2, t1, t2), None
+    if section_type == 'ANGLE':
+        return angle_outline(size1, size2, t1, t2), None
+    if section_type == 'BOX':
+        return rectangle_outline(size1, size2), rectangle_outline(size1 - 2 * t1, size2 - 2 * t2)
+    if section_type == 'TUBE':
+        return polygon_outline(size1, sides or CIRCLE_SIDES), polygon_outline(size1 - 2 * t1, sides or CIRCLE_SIDES)
+    return section_outline(section_type, size1, size2, sides), None
+
+def section_outline(section_type, size1, size2, sides):
+    """Outline for a solid section type and its two characteristic sizes"""
+    if section_type == 'RECTANGULAR':
+        return rectangle_outline(size1, size2)
+    if section_type == 'CIRCULAR':
+        return polygon_outline(size1, sides or CIRCLE_SIDES)
+    return polygon_outline(size1, sides)
+
+def box_profile(section_type, size1, size2, sides, t1=0.0, t2=0.0):
+    """Solid rectangular profile of a section's bounding box - its low-detail stand-in"""
+    return 'RECTANGULAR', size1, size2, 4, 0.0, 0.0
+
+def profile_template(section_type, size1, size2, sides, t1=0.0, t2=0.0):
+    """Return the cached ProfileTemplate for a section description"""
+    key = (section_type, float(size1), float(size2), int(sides), float(t1), float(t2))
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        template = ProfileTemplate(*section_rings(*key))
+        _TEMPLATE_CACHE[key] = template
+    return template
+
+def clear_template_cache():
+    """Forget all cached profile templates and section properties"""
+    _TEMPLATE_CACHE.clear()
+    _PROPERTIES_CACHE.clear()
+
+def polygon_centroid(outline):
+    """Centroid of a simple counter-clockwise polygon"""
+    x, y = outline[:, 0], outline[:, 1]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    cross = x * yn - xn * y
+    area = cross.sum() / 2.0
+    return np.array(((((x + xn) * cross).sum()), ((y + yn) * cross).sum())) / (6.0 * area)
+
+def polygon_moments(outline):
+    """(area, Ixx, Iyy) of a simple counter-clockwise polygon about the origin
+
+    Ixx integrates y^2 (bending about the x axis), Iyy integrates x^2.
+    """
+    x, y = outline[:, 0], outline[:, 1]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    cross = x * yn - xn * y
+    area = cross.sum() / 2.0
+    ixx = ((y * y + y * yn + yn * yn) * cross).sum() / 12.0
+    iyy = ((x * x + x * xn + xn * xn) * cross).sum() / 12.0
+    return area, ixx, iyy
+
+def torsion_constant(section_type, size1, size2, t1, t2, area, polar):
+    """Saint-Venant torsion constant J
+
+    Exact for circles and tubes, the series approximation for rectangles,
+    sum of b t^3 / 3 over the plates of open sections, Bredt's formula for
+    boxes and A^4 / (4 pi^2 Ip) for other solid polygons.
+    """
+    if section_type == 'CIRCULAR':
+        return np.pi * size1 ** 4 / 32.0
+    if section_type == 'TUBE':
+        return np.pi * (size1 ** 4 - (size1 - 2 * t1) ** 4) / 32.0
+    if section_type == 'RECTANGULAR':
+        a, b = max(size1, size2), min(size1, size2)
+        return a * b ** 3 * (1.0 / 3.0 - 0.21 * (b / a) * (1.0 - b ** 4 / (12.0 * a ** 4)))
+    if section_type in ('I_SECTION', 'CHANNEL'):
+        return (2.0 * size1 * t2 ** 3 + (size2 - 2.0 * t2) * t1 ** 3) / 3.0
+    if section_type == 'ANGLE':
+        return (size1 * t2 ** 3 + (size2 - t2) * t1 ** 3) / 3.0
+    if section_type == 'BOX':
+        enclosed = (size1 - t1) * (size2 - t2)
+        return 4.0 * enclosed ** 2 / (2.0 * (size1 - t1) / t2 + 2.0 * (size2 - t2) / t1)
+    return area ** 4 / (4.0 * np.pi ** 2 * polar) if polar > 0 else 0.0
+
+def section_properties(section_type, size1, size2, sides, t1=0.0, t2=0.0):
+    """Cached SectionProperties for a profile (see section_profile)
+
+    Circles and tubes use the exact circular formulas; every other section
+    is integrated over the outline it is drawn with, so what is exported
+    matches what is displayed.
+    """
+    key = (section_type, float(size1), float(size2), int(sides), float(t1), float(t2))
+    properties = _PROPERTIES_CACHE.get(key)
+    if properties is not None:
+        return properties
+
+    t1, t2 = clamp_walls(section_type, key[1], key[2], key[4], key[5])
+    if section_type in ('CIRCULAR', 'TUBE'):
+        inner = size1 - 2 * t1 if section_type == 'TUBE' else 0.0
+        area = np.pi * (size1 ** 2 - inner ** 2) / 4.0
+        iy = iz = np.pi * (size1 ** 4 - inner ** 4) / 64.0
+        reach_y = reach_z = size1 / 2.0
+    else:
+        outer, inner = section_rings(*key)
+        area, iy, iz = polygon_moments(outer)
+        if inner is not None:
+            hole = polygon_moments(inner)
+            area, iy, iz = area - hole[0], iy - hole[1], iz - hole[2]
+        reach_y = np.abs(outer[:, 1]).max()
+        reach_z = np.abs(outer[:, 0]).max()
+
+    j = torsion_constant(section_type, key[1], key[2], t1, t2, area, iy + iz)
+    properties = SectionProperties(
+        float(area), float(iy), float(iz), float(j),
+        float(iy / reach_y) if reach_y else 0.0,
+        float(iz / reach_z) if reach_z else 0.0,
+    )
+    _PROPERTIES_CACHE[key] = properties
+    return properties
+
+def prism_faces(ring_size, hollow=False):
+    """Faces of a prism over an outline, as lists of template vertex indices
+
+    A hollow outline is an outer and an inner ring of ring_size / 2 vertices
+    each; its ends are rings of quads instead of single caps.
+    """
+    m = ring_size
+    if not hollow:
+        faces = [list(range(m - 1, -1, -1)), list(range(m, 2 * m))]    # start and end caps
+        for i in range(m):
+            j = (i + 1) % m
+            faces.append([i, j, m + j, m + i])
+        return faces
+
+    n = m // 2
+    faces = []
+    for i in range(n):
+        j = (i + 1) % n
+        faces.append([i, n + i, n + j, j])                   # start end
+        faces.append([m + i, m + j, m + n + j, m + n + i])   # finish end
+        faces.append([i, j, m + j, m + i])                   # outside
+        faces.append([n + j, n + i, m + n + i, m + n + j])   # inside
+    return faces
+
+def flatten_faces(faces):
+    """Turn a list of faces into (face_loop_starts, loop_indices) arrays"""
+    totals = np.array([len(face) for face in faces], dtype=np.int32)
+    starts = np.zeros(len(faces), dtype=np.int32)
+    np.cumsum(totals[:-1], out=starts[1:])
+    loops = np.fromiter((v for face in faces for v in face), dtype=np.int32, count=int(totals.sum()))
+    return starts, loops
+
+def beam_frames(starts, ends):
+    """Local frames for many beams at once
+
+    Local Z runs from start to end, local Y points as close to world Z as it can
+    (world Y for vertical beams), matching to_track_quat('Z', 'Y').
+    Returns x, y, z unit vectors (B, 3) and the beam lengths (B,).
+    """
+    axis = np.asarray(ends, dtype=np.float64) - np.asarray(starts, dtype=np.float64)
+    length = np.linalg.norm(axis, axis=1)
+    z = axis / np.where(length > MIN_BEAM_LENGTH, length, 1.0)[:, None]
+
+    reference = np.zeros_like(z)
+    vertical = np.abs(z[:, 2]) > 0.999
+    reference[~vertical, 2] = 1.0
+    reference[vertical, 1] = 1.0
+
+    x = np.cross(reference, z)
+    x /= np.maximum(np.linalg.norm(x, axis=1), MIN_BEAM_LENGTH)[:, None]
+    y = np.cross(z, x)
+    return x, y, z, length
+
+def frame_matrices(starts, ends):
+    """(B, 4, 4) world matrices placing a beam's local prism at its centre, Z along the beam"""
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    x, y, z, length = beam_frames(starts, ends)
+
+    matrices = np.zeros((len(starts), 4, 4), dtype=np.float64)
+    matrices[:, :3, 0] = x
+    matrices[:, :3, 1] = y
+    matrices[:, :3, 2] = z
+    matrices[:, :3, 3] = (starts + ends) / 2.0
+    matrices[:, 3, 3] = 1.0
+    return matrices, length
+
+def unit_frame_matrices(starts, ends):
+    """(B, 4, 4) world matrices for a unit-length prism, scaled along local Z to each beam's length"""
+    matrices, length = frame_matrices(starts, ends)
+    matrices[:, :3, 2] *= length[:, None]
+    return matrices
+
+def prism_local_vertices(template, length):
+    """Vertices of one prism centred on its origin with its axis along local Z"""
+    m = len(template.outline)
+    verts = np.empty((2 * m, 3), dtype=np.float64)
+    verts[:m, :2] = template.outline
+    verts[m:, :2] = template.outline
+    verts[:m, 2] = -length / 2.0
+    verts[m:, 2] = length / 2.0
+    return verts
+
+def build_beam_arrays(starts, ends, template_ids, templates):
+    """Vertex and face arrays for many beams in world space, in beam order
+
+    starts, ends   (B, 3) end coordinates
+    template_ids   (B,)   index into templates for each beam
+    templates      list of ProfileTemplate
+
+    Returns a dict with verts (V, 3), face_loop_starts (F,), loop_indices (L,),
+    face_beam (F,) - the beam each face belongs to - and per-beam vertex_start
+    and face_start offsets so single beams can be sliced back out.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    template_ids = np.asarray(template_ids, dtype=np.int64)
+    beam_count = len(starts)
+
+    vcounts = np.array([t.vertex_count for t in templates], dtype=np.int64)[template_ids]
+    fcounts = np.array([t.face_count for t in templates], dtype=np.int64)[template_ids]
+    lcounts = np.array([t.loop_count for t in templates], dtype=np.int64)[template_ids]
+
+    vertex_start = np.zeros(beam_count + 1, dtype=np.int64)
+    face_start = np.zeros(beam_count + 1, dtype=np.int64)
+    loop_start = np.zeros(beam_count + 1, dtype=np.int64)
+    np.cumsum(vcounts, out=vertex_start[1:])
+    np.cumsum(fcounts, out=face_start[1:])
+    np.cumsum(lcounts, out=loop_start[1:])
+
+    verts = np.empty((vertex_start[-1], 3), dtype=np.float32)
+    face_loop_starts = np.empty(face_start[-1], dtype=np.int32)
+    loop_indices = np.empty(loop_start[-1], dtype=np.int32)
+    face_beam = np.empty(face_start[-1], dtype=np.int32)
+
+    x, y, _z, _length = beam_frames(starts, ends)
+    axis = ends - starts
+
+    # One array pass per distinct section profile
+    for tid in np.unique(template_ids):
+        template = templates[tid]
+        group = np.nonzero(template_ids == tid)[0]
+        m = len(template.outline)
+        ox = template.outline[:, 0]
+        oy = template.outline[:, 1]
+
+        ring = (starts[group, None, :]
+                + ox[None, :, None] * x[group, None, :]
+                + oy[None, :, None] * y[group, None, :])
+        group_verts = np.concatenate((ring, ring + axis[group, None, :]), axis=1)
+        vslots = vertex_start[group, None] + np.arange(2 * m)
+        verts[vslots.ravel()] = group_verts.reshape(-1, 3)
+
+        lslots = loop_start[group, None] + np.arange(template.loop_count)
+        loop_indices[lslots.ravel()] = (template.loop_indices[None, :] + vertex_start[group, None]).ravel()
+
+        fslots = face_start[group, None] + np.arange(template.face_count)
+        face_loop_starts[fslots.ravel()] = (template.face_loop_starts[None, :] + loop_start[group, None]).ravel()
+        face_beam[fslots.ravel()] = np.repeat(group, template.face_count)
+
+    return {
+        'verts': verts,
+        'face_loop_starts': face_loop_starts,
+        'loop_indices': loop_indices,
+        'face_beam': face_beam,
+        'vertex_start': vertex_start,
+        'face_start': face_start,
+    }
+
+# Shells - polygons given as CSR arrays (offsets, vertex indices)
+# Polygons further than this from flat (relative to their size) are triangulated
+PLANAR_TOLERANCE = 1e-5
+
+def polygon_owner(offsets):
+    """Polygon index of every corner of CSR polygons"""
+    sizes = np.diff(offsets)
+    return np.repeat(np.arange(len(sizes)), sizes)
+
+def polygon_normals(points, offsets):
+    """Newell normals of CSR polygons - length is twice the polygon area
+
+    points   (L, 3) polygon corners in CSR order
+    """
+    sizes = np.diff(offsets)
+    owner = polygon_owner(offsets)
+    following = np.arange(len(points)) + 1
+    following[offsets[1:][sizes > 0] - 1] = offsets[:-1][sizes > 0]
+    cross = np.cross(points, points[following])
+    return np.column_stack([np.bincount(owner, weights=cross[:, k], minlength=len(sizes)) for k in range(3)])
+
+def polygon_flatness(points, offsets, normals):
+    """Largest distance of a corner from its polygon's best-fit plane, relative to the polygon's size"""
+    sizes = np.diff(offsets)
+    owner = polygon_owner(offsets)
+    counts = np.maximum(sizes, 1)[:, None]
+    centres = np.column_stack([np.bincount(owner, weights=points[:, k], minlength=len(sizes)) for k in range(3)]) / counts
+    unit = normals / np.maximum(np.linalg.norm(normals, axis=1), MIN_BEAM_LENGTH)[:, None]
+    offset = points - centres[owner]
+    deviation = np.abs(np.einsum('ij,ij->i', offset, unit[owner]))
+    radius = np.linalg.norm(offset, axis=1)
+    worst = np.zeros(len(sizes))
+    reach = np.zeros(len(sizes))
+    np.maximum.at(worst, owner, deviation)
+    np.maximum.at(reach, owner, radius)
+    return worst / np.maximum(reach, MIN_BEAM_LENGTH)
+
+def ear_clip(outline):
+    """Triangles (k, 3) of local corner indices covering a simple 2D polygon
+
+    Falls back to a fan for what is left if no ear can be found (self-
+    intersecting or degenerate outlines).
+    """
+    outline = np.asarray(outline, dtype=np.float64)
+    x, y = outline[:, 0], outline[:, 1]
+    signed_area = (x * np.roll(y, -1) - np.roll(x, -1) * y).sum()
+    remaining = list(range(len(outline))) if signed_area >= 0 else list(range(len(outline) - 1, -1, -1))
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    triangles = []
+    while len(remaining) > 3:
+        n = len(remaining)
+        for k in range(n):
+            i, j, l = remaining[k - 1], remaining[k], remaining[(k + 1) % n]
+            a, b, c = outline[i], outline[j], outline[l]
+            if cross(a, b, c) <= 0:
+                continue
+            if any(cross(a, b, outline[m]) >= 0 and cross(b, c, outline[m]) >= 0 and cross(c, a, outline[m]) >= 0
+                   for m in remaining if m not in (i, j, l)):
+                continue
+            triangles.append((i, j, l))
+            del remaining[k]
+            break
+        else:
+            break
+    triangles.extend((remaining[0], remaining[k], remaining[k + 1]) for k in range(1, len(remaining) - 1))
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+def triangulate_polygons(coords, offsets, indices, tolerance=PLANAR_TOLERANCE):
+    """Mesh faces for CSR polygons, splitting the ones that are not flat
+
+    Flat polygons stay as they are. Warped quads are split along their
+    shorter diagonal in one array pass; warped polygons with more corners
+    are ear-clipped in the plane of their Newell normal.
+
+    coords    (V, 3) vertex coordinates
+    offsets   (P+1,) CSR offsets
+    indices   (L,)   vertex index of every corner
+
+    Returns a dict with face_loop_starts, loop_indices (vertex indices) and
+    face_polygon, the polygon each face came from. Faces are in polygon
+    order, so the faces of one polygon are a contiguous run.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    sizes = np.diff(offsets)
+    points = coords[indices]
+    normals = polygon_normals(points, offsets)
+    warped = (sizes > 3) & (polygon_flatness(points, offsets, normals) > tolerance)
+
+    # Flat polygons (and triangles) are kept whole
+    kept = np.flatnonzero(~warped)
+    kept_corners = ~warped[polygon_owner(offsets)]
+    loops = [indices[kept_corners]]
+    face_sizes = [sizes[kept]]
+    face_polygon = [kept]
+
+    # Warped quads - the shorter diagonal makes the smaller fold
+    quads = np.flatnonzero(warped & (sizes == 4))
+    if len(quads):
+        corner = indices[offsets[quads, None] + np.arange(4)]
+        a, b, c, d = (coords[corner[:, k]] for k in range(4))
+        short_ac = np.linalg.norm(c - a, axis=1) <= np.linalg.norm(d - b, axis=1)
+        tris = np.where(short_ac[:, None, None],
+                        corner[:, [[0, 1, 2], [0, 2, 3]]],
+                        corner[:, [[1, 2, 3], [1, 3, 0]]])
+        loops.append(tris.reshape(-1))
+        face_sizes.append(np.full(2 * len(quads), 3))
+        face_polygon.append(np.repeat(quads, 2))
+
+    # Other warped polygons - one at a time, they are rare
+    for p in np.flatnonzero(warped & (sizes > 4)):
+        corner = indices[offsets[p]:offsets[p + 1]]
+        normal = normals[p] / max(np.linalg.norm(normals[p]), MIN_BEAM_LENGTH)
+        u = np.cross(normal, (1.0, 0.0, 0.0) if abs(normal[0]) < 0.9 else (0.0, 1.0, 0.0))
+        u /= np.linalg.norm(u)
+        v = np.cross(normal, u)
+        local = coords[corner] - coords[corner].mean(axis=0)
+        tris = ear_clip(np.column_stack((local @ u, local @ v)))
+        loops.append(corner[tris].reshape(-1))
+        face_sizes.append(np.full(len(tris), 3))
+        face_polygon.append(np.full(len(tris), p))
+
+    face_sizes = np.concatenate(face_sizes)
+    face_polygon = np.concatenate(face_polygon).astype(np.int64)
+    loops = np.concatenate(loops)
+    if len(face_sizes) != len(kept):
+        # Put the split faces back in place of the polygons they came from
+        old_starts = np.zeros(len(face_sizes), dtype=np.int64)
+        np.cumsum(face_sizes[:-1], out=old_starts[1:])
+        order = np.argsort(face_polygon, kind='stable')
+        face_sizes = face_sizes[order]
+        face_polygon = face_polygon[order]
+        new_starts = np.zeros(len(face_sizes), dtype=np.int64)
+        np.cumsum(face_sizes[:-1], out=new_starts[1:])
+        loops = loops[np.repeat(old_starts[order] - new_starts, face_sizes) + np.arange(len(loops))]
+
+    face_loop_starts = np.zeros(len(face_sizes), dtype=np.int32)
+    np.cumsum(face_sizes[:-1], out=face_loop_starts[1:])
+    return {
+        'face_loop_starts': face_loop_starts,
+        'loop_indices': loops.astype(np.int32),
+        'face_polygon': face_polygon,
+    }
+
+def owner_ranges(owner, count):
+    """(starts, counts) of each owner's run in a sorted owner array
+
+    owner gives the owner (0..count-1) of every face, edge or vertex; owners
+    with nothing get start -1 and count 0.
+    """
+    owner = np.asarray(owner, dtype=np.int64)
+    counts = np.bincount(owner, minlength=count)[:count]
+    starts = np.searchsorted(owner, np.arange(count)).astype(np.int64)
+    starts[counts == 0] = -1
+    return starts, counts
+
+def range_positions(starts, counts):
+    """Every index in the runs [start, start + count), run after run"""
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+def range_owner(starts, counts, total):
+    """Inverse of owner_ranges: the owner of each of total items, -1 where no run covers it"""
+    starts = np.asarray(starts, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    owner = np.full(total, -1, dtype=np.int64)
+    drawn = np.flatnonzero((starts >= 0) & (counts > 0) & (starts + counts <= total))
+    owner[range_positions(starts[drawn], counts[drawn])] = np.repeat(drawn, counts[drawn])
+    return owner
+
+def write_mesh_arrays(mesh, verts, face_loop_starts, loop_indices):
+    """Replace a mesh's geometry with the given arrays using foreach_set"""
+    verts = np.ascontiguousarray(verts, dtype=np.float32)
+    mesh.clear_geometry()
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set('co', verts.ravel())
+    mesh.loops.add(len(loop_indices))
+    mesh.loops.foreach_set('vertex_index', np.ascontiguousarray(loop_indices, dtype=np.int32))
+    mesh.polygons.add(len(face_loop_starts))
+    mesh.polygons.foreach_set('loop_start', np.ascontiguousarray(face_loop_starts, dtype=np.int32))
+    mesh.update(calc_edges=True)
+    return mesh
+
+def write_line_arrays(mesh, verts, edges):
+    """Replace a mesh's geometry with loose edges (no faces) using foreach_set"""
+    mesh.clear_geometry()
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set('vertices', np.ascontiguousarray(edges, dtype=np.int32).ravel())
+    mesh.update()
+    return mesh
@@ -0,0 +1,419 @@
+"""
+Geometry Nodes beam display (GEOMETRY_NODES beam display mode)
+
+Every beam is one edge of a single mesh, FEA_Beam_Edges, whose vertices are
+the structural points. Per-beam data is stored as edge attributes:
+
+    fea_direction  FLOAT_VECTOR  unit vector from start to end
+    fea_up         FLOAT_VECTOR  section "up" (local Y, see geometry.beam_frames)
+    fea_scale      FLOAT_VECTOR  width, height, length (walls scale with the section)
+    fea_profile    INT           which unit profile prototype to use
+    beam_index     INT           index into structural_data.beams
+
+and every beam's geom_start is the index of its edge.
+
+A generated node group turns the edges into beams on the GPU side of things:
+
+    Mesh to Points (Edges) -> Align Euler to Vector (Z to fea_direction,
+    then Y to fea_up) -> Instance on Points (Pick Instance from the unit
+    profile prototypes in FEA_Beam_Profiles, scaled by fea_scale)
+
+so a section edit only rewrites attributes - no beam objects are rebuilt.
+
+Merged shells (utils.build_merged_shells) get their thickness the same way:
+a node group extrudes every face by its fea_thickness FACE attribute.
+
+At the LOW level of detail (see lod) the beam modifier is switched off so
+the bare edges are drawn, and the point cloud gets a Mesh to Points
+modifier in place of its instanced sphere markers.
+"""
+
+import bpy
+import numpy as np
+
+from . import geometry
+from . import model_index
+from . import utils
+
+BEAM_EDGES_NAME = utils.BEAM_EDGES_NAME
+BEAM_TREE_NAME = "FEA_Beam_Sweep"
+PROFILE_COLLECTION_NAME = "FEA_Beam_Profiles"
+MODIFIER_NAME = "FEA Beams"
+SHELL_TREE_NAME = "FEA_Shell_Thickness"
+SHELL_MODIFIER_NAME = "FEA Shell Thickness"
+POINTS_TREE_NAME = "FEA_Point_Dots"
+POINTS_MODIFIER_NAME = "FEA Point Dots"
+
+
+# Node tree helpers - Blender 4.0 replaced tree.inputs/outputs with tree.interface
+def new_node_tree(name, inputs=(), outputs=()):
+    """New GeometryNodeTree with (name, socket_type) group inputs and outputs"""
+    tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    if hasattr(tree, 'interface'):
+        for socket_name, socket_type in inputs:
+            tree.interface.new_socket(socket_name, in_out='INPUT', socket_type=socket_type)  # type: ignore
+        for socket_name, socket_type in outputs:
+            tree.interface.new_socket(socket_name, in_out='OUTPUT', socket_type=socket_type)  # type: ignore
+    else:
+        for socket_name, socket_type in inputs:
+            tree.inputs.new(socket_type, socket_name)  # type: ignore
+        for socket_name, socket_type in outputs:
+            tree.outputs.new(socket_type, socket_name)  # type: ignore
+    return tree
+
+def named_attribute(tree, name, data_type):
+    """Named Attribute node reading one attribute"""
+    node = tree.nodes.new('GeometryNodeInputNamedAttribute')
+    node.data_type = data_type  # type: ignore
+    node.inputs['Name'].default_value = name  # type: ignore
+    return node
+
+def align_to_vector(tree, axis, pivot_axis):
+    """Align Euler to Vector, or its 4.x replacement where the old node is gone"""
+    try:
+        node = tree.nodes.new('FunctionNodeAlignEulerToVector')
+    except RuntimeError:
+        node = tree.nodes.new('FunctionNodeAlignRotationToVector')
+    node.axis = axis  # type: ignore
+    node.pivot_axis = pivot_axis  # type: ignore
+    return node
+
+def ensure_nodes_modifier(obj, name, tree):
+    """Give obj a Geometry Nodes modifier running tree"""
+    modifier = obj.modifiers.get(name)
+    if modifier is None:
+        modifier = obj.modifiers.new(name, 'NODES')
+    modifier.node_group = tree  # type: ignore
+    return modifier
+
+
+# Unit profile prototypes
+def profile_key(profile):
+    """Shape of a profile independent of its size: type, sides and wall-to-size ratios
+
+    Prototypes are scaled by (size1, size2), so thin-walled sections need one
+    prototype per wall ratio; ratios are rounded to keep their number small.
+    """
+    section_type, size1, size2, sides, t1, t2 = profile
+    if section_type in geometry.SOLID_TYPES:
+        return section_type, sides, 0.0, 0.0
+    return section_type, sides, round(t1 / size1, 3), round(t2 / size2, 3)
+
+def prototype_name(key):
+    section_type, sides, r1, r2 = key
+    if section_type in geometry.SOLID_TYPES:
+        return f"FEA_Profile_{section_type}_{sides:02d}"
+    return f"FEA_Profile_{section_type}_{sides:02d}_{r1:.3f}_{r2:.3f}"
+
+def ensure_profile_collection():
+    """Collection of prototypes - kept out of the scene, only used by Collection Info"""
+    collection = bpy.data.collections.get(PROFILE_COLLECTION_NAME)
+    if collection is None:
+        collection = bpy.data.collections.new(PROFILE_COLLECTION_NAME)
+        collection.use_fake_user = True
+    return collection
+
+def ensure_profile_prototypes(keys):
+    """Make sure a unit-size, unit-length prism exists for every profile key
+
+    Returns {key: instance index}. Collection Info with Separate Children
+    orders the prototypes by name, so indices follow the sorted names.
+    """
+    collection = ensure_profile_collection()
+    for key in keys:
+        name = prototype_name(key)
+        if name in collection.objects:
+            continue
+        template = geometry.profile_template(key[0], 1.0, 1.0, key[1], key[2], key[3])
+        mesh = bpy.data.meshes.new(name)
+        geometry.write_mesh_arrays(mesh, geometry.prism_local_vertices(template, 1.0),
+                                   template.face_loop_starts, template.loop_indices)
+        collection.objects.link(bpy.data.objects.new(name, mesh))
+
+    order = sorted(obj.name for obj in collection.objects)
+    return {key: order.index(prototype_name(key)) for key in keys}
+
+
+# The node group
+def ensure_beam_tree():
+    """The node group sweeping unit profiles along the beam edges"""
+    tree = bpy.data.node_groups.get(BEAM_TREE_NAME)
+    if tree is not None:
+        return tree
+
+    tree = new_node_tree(BEAM_TREE_NAME,
+                         inputs=[("Geometry", 'NodeSocketGeometry')],
+                         outputs=[("Geometry", 'NodeSocketGeometry')])
+    nodes = tree.nodes
+    links = tree.links
+
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+
+    to_points = nodes.new('GeometryNodeMeshToPoints')
+    to_points.mode = 'EDGES'  # type: ignore
+
+    direction = named_attribute(tree, "fea_direction", 'FLOAT_VECTOR')
+    up = named_attribute(tree, "fea_up", 'FLOAT_VECTOR')
+    scale = named_attribute(tree, "fea_scale", 'FLOAT_VECTOR')
+    profile = named_attribute(tree, "fea_profile", 'INT')
+
+    align_axis = align_to_vector(tree, 'Z', 'AUTO')
+    align_roll = align_to_vector(tree, 'Y', 'Z')
+
+    prototypes = nodes.new('GeometryNodeCollectionInfo')
+    prototypes.transform_space = 'ORIGINAL'  # type: ignore
+    prototypes.inputs['Collection'].default_value = ensure_profile_collection()  # type: ignore
+    prototypes.inputs['Separate Children'].default_value = True  # type: ignore
+    prototypes.inputs['Reset Children'].default_value = True  # type: ignore
+
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    instance.inputs['Pick Instance'].default_value = True  # type: ignore
+
+    links.new(group_in.outputs[0], to_points.inputs['Mesh'])
+    links.new(direction.outputs['Attribute'], align_axis.inputs['Vector'])
+    links.new(align_axis.outputs['Rotation'], align_roll.inputs['Rotation'])
+    links.new(up.outputs['Attribute'], align_roll.inputs['Vector'])
+    links.new(to_points.outputs['Points'], instance.inputs['Points'])
+    links.new(prototypes.outputs[0], instance.inputs['Instance'])
+    links.new(profile.outputs['Attribute'], instance.inputs['Instance Index'])
+    links.new(align_roll.outputs['Rotation'], instance.inputs['Rotation'])
+    links.new(scale.outputs['Attribute'], instance.inputs['Scale'])
+    links.new(instance.outputs['Instances'], group_out.inputs[0])
+
+    for x, column in enumerate(((group_in,), (to_points, direction, up), (align_axis, align_roll, scale, profile),
+                                (prototypes, instance), (group_out,))):
+        for y, node in enumerate(column):
+            node.location = (x * 250, -y * 180)
+    return tree
+
+
+def ensure_shell_tree():
+    """The node group extruding shell faces along their normals by fea_thickness"""
+    tree = bpy.data.node_groups.get(SHELL_TREE_NAME)
+    if tree is not None:
+        return tree
+
+    tree = new_node_tree(SHELL_TREE_NAME,
+                         inputs=[("Geometry", 'NodeSocketGeometry')],
+                         outputs=[("Geometry", 'NodeSocketGeometry')])
+    nodes = tree.nodes
+    links = tree.links
+
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+    thickness = named_attribute(tree, "fea_thickness", 'FLOAT')
+
+    # Zero-thickness shells stay flat
+    has_thickness = nodes.new('FunctionNodeCompare')
+    has_thickness.data_type = 'FLOAT'  # type: ignore
+    has_thickness.operation = 'GREATER_THAN'  # type: ignore
+    has_thickness.inputs[1].default_value = 0.0  # type: ignore
+
+    extrude = nodes.new('GeometryNodeExtrudeMesh')
+    extrude.mode = 'FACES'  # type: ignore
+    extrude.inputs['Individual'].default_value = False  # type: ignore
+
+    links.new(group_in.outputs[0], extrude.inputs['Mesh'])
+    links.new(thickness.outputs['Attribute'], has_thickness.inputs[0])
+    links.new(has_thickness.outputs['Result'], extrude.inputs['Selection'])
+    links.new(thickness.outputs['Attribute'], extrude.inputs['Offset Scale'])
+    links.new(extrude.outputs['Mesh'], group_out.inputs[0])
+
+    for x, column in enumerate(((group_in, thickness), (has_thickness,), (extrude,), (group_out,))):
+        for y, node in enumerate(column):
+            node.location = (x * 250, -y * 180)
+    return tree
+
+def ensure_points_tree():
+    """The node group drawing every vertex of the point cloud as a bare point"""
+    tree = bpy.data.node_groups.get(POINTS_TREE_NAME)
+    if tree is not None:
+        return tree
+
+    tree = new_node_tree(POINTS_TREE_NAME,
+                         inputs=[("Geometry", 'NodeSocketGeometry')],
+                         outputs=[("Geometry", 'NodeSocketGeometry')])
+    nodes = tree.nodes
+
+    group_in = nodes.new('NodeGroupInput')
+    group_out = nodes.new('NodeGroupOutput')
+    to_points = nodes.new('GeometryNodeMeshToPoints')
+    to_points.mode = 'VERTICES'  # type: ignore
+    to_points.inputs['Radius'].default_value = utils.POINT_RADIUS / 2  # type: ignore
+
+    tree.links.new(group_in.outputs[0], to_points.inputs['Mesh'])
+    tree.links.new(to_points.outputs['Points'], group_out.inputs[0])
+
+    for x, node in enumerate((group_in, to_points, group_out)):
+        node.location = (x * 250, 0)
+    return tree
+
+def set_modifier_enabled(obj, name, enabled):
+    """Show or hide a modifier in the viewport and in renders"""
+    modifier = obj.modifiers.get(name)
+    if modifier is not None:
+        modifier.show_viewport = enabled
+        modifier.show_render = enabled
+
+def set_point_dots(cloud_obj, enabled):
+    """Draw the point cloud's vertices as points (LOW level of detail) or not"""
+    if enabled:
+        ensure_nodes_modifier(cloud_obj, POINTS_MODIFIER_NAME, ensure_points_tree())
+    set_modifier_enabled(cloud_obj, POINTS_MODIFIER_NAME, enabled)
+
+
+# Beam edges and their attributes
+def beam_edge_data(structural_data, beam_indices=None):
+    """Edge and attribute arrays for every beam - or the given beams - whose ends resolve"""
+    beams = structural_data.beams
+    if beam_indices is None:
+        start_indices, end_indices = utils.get_beam_end_indices(structural_data)
+        beam_indices = np.flatnonzero((start_indices >= 0) & (end_indices >= 0))
+        start_indices, end_indices = start_indices[beam_indices], end_indices[beam_indices]
+    else:
+        beam_indices = np.asarray(beam_indices, dtype=np.int64)
+        start_indices, end_indices = utils.get_beam_end_indices(structural_data, [beams[int(b)] for b in beam_indices])
+        drawn = (start_indices >= 0) & (end_indices >= 0)
+        beam_indices, start_indices, end_indices = beam_indices[drawn], start_indices[drawn], end_indices[drawn]
+    coords = model_index.point_coordinates(structural_data).astype(np.float64)
+    starts = coords[start_indices]
+    ends = coords[end_indices]
+    _x, y, z, length = geometry.beam_frames(starts, ends)
+
+    profiles = {}
+    sizes = np.empty((len(beam_indices), 2), dtype=np.float64)
+    keys = []
+    for k, b in enumerate(beam_indices):
+        beam = beams[int(b)]
+        section_key = beam.section_name or ('diameter', beam.diameter)
+        profile = profiles.get(section_key)
+        if profile is None:
+            profile = utils.get_display_profile(beam, structural_data)
+            profiles[section_key] = profile
+        sizes[k] = profile[1], profile[2]
+        keys.append(profile_key(profile))
+
+    key_index = ensure_profile_prototypes(sorted(set(keys)))
+    return {
+        'edges': np.stack([start_indices, end_indices], axis=1),
+        'fea_direction': z,
+        'fea_up': y,
+        'fea_scale': np.column_stack([sizes, length]),
+        'fea_profile': np.array([key_index[key] for key in keys], dtype=np.int32),
+        'beam_index': beam_indices.astype(np.int32),
+    }
+
+def write_edge_attributes(mesh, data):
+    """(Re)write the per-beam edge attributes of the beam edge mesh"""
+    for name, values in data.items():
+        if name == 'edges':
+            continue
+        data_type = 'INT' if values.dtype.kind == 'i' else 'FLOAT_VECTOR'
+        attribute = mesh.attributes.get(name)
+        if attribute is None or attribute.domain != 'EDGE' or attribute.data_type != data_type:
+            if attribute is not None:
+                mesh.attributes.remove(attribute)
+            attribute = mesh.attributes.new(name, data_type, 'EDGE')
+        attribute.data.foreach_set('value' if data_type == 'INT' else 'vector',
+                                   np.ascontiguousarray(values, dtype=np.int32 if data_type == 'INT' else np.float32).ravel())
+
+def ensure_beam_edges_object(structural_data):
+    obj = bpy.data.objects.get(BEAM_EDGES_NAME)
+    if obj is None:
+        obj = bpy.data.objects.new(BEAM_EDGES_NAME, bpy.data.meshes.new(BEAM_EDGES_NAME))
+        utils.move_to_structural_collection(obj)
+    ensure_nodes_modifier(obj, MODIFIER_NAME, ensure_beam_tree())
+    # At the LOW level of detail the edges themselves are the beams
+    set_modifier_enabled(obj, MODIFIER_NAME, structural_data.beam_lod_level != 'LOW')
+    return obj
+
+def build_beam_edges(structural_data):
+    """Write every beam as an edge of FEA_Beam_Edges, with its attributes"""
+    obj = ensure_beam_edges_object(structural_data)
+    mesh = obj.data
+    data = beam_edge_data(structural_data)
+    coords = model_index.point_coordinates(structural_data)
+
+    mesh.clear_geometry()
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    mesh.edges.add(len(data['edges']))
+    mesh.edges.foreach_set('vertices', data['edges'].astype(np.int32).ravel())
+    write_edge_attributes(mesh, data)
+    utils.update_mesh(mesh)
+    utils.set_element_ranges(structural_data.beams, *geometry.owner_ranges(data['beam_index'], len(structural_data.beams)))
+    return obj
+
+def update_beam_attributes(structural_data):
+    """Refresh beam attributes after section or point edits without rebuilding edges
+
+    Falls back to a full rebuild when the set of drawable beams has changed.
+    """
+    obj = bpy.data.objects.get(BEAM_EDGES_NAME)
+    if obj is None:
+        return build_beam_edges(structural_data)
+
+    mesh = obj.data
+    data = beam_edge_data(structural_data)
+    if len(mesh.edges) != len(data['edges']) or len(mesh.vertices) != len(structural_data.points):
+        return build_beam_edges(structural_data)
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edges)
+    if not np.array_equal(edges, data['edges'].ravel()):
+        return build_beam_edges(structural_data)
+
+    coords = model_index.point_coordinates(structural_data)
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    write_edge_attributes(mesh, data)
+    utils.update_mesh(mesh)
+    utils.set_element_ranges(structural_data.beams, *geometry.owner_ranges(data['beam_index'], len(structural_data.beams)))
+    return obj
+
+def update_beam_edges(structural_data, beam_indices):
+    """Rewrite the given beams' edges in place through their ranges - end vertices and edge attributes
+
+    Returns False, without writing anything, when a beam's edge no longer
+    joins its end points, a new profile prototype shifted the instance
+    indices, or so many beams changed that one pass over every edge is
+    cheaper.
+    """
+    obj = bpy.data.objects.get(BEAM_EDGES_NAME)
+    beams = structural_data.beams
+    if obj is None or len(beam_indices) > utils.IN_PLACE_LIMIT * len(beams):
+        return False
+    mesh = obj.data
+    if len(mesh.vertices) != len(structural_data.points):
+        return False
+
+    prototype_count = len(ensure_profile_collection().objects)
+    data = beam_edge_data(structural_data, beam_indices)
+    if len(data['beam_index']) != len(beam_indices) or len(ensure_profile_collection().objects) != prototype_count:
+        return False
+    names = [name for name in data if name not in ('edges', 'beam_index')]
+    if any(mesh.attributes.get(name) is None for name in names):
+        return False
+
+    edges = []
+    for k, b in enumerate(data['beam_index']):
+        edge = beams[int(b)].geom_start
+        if edge < 0 or edge >= len(mesh.edges) or tuple(mesh.edges[edge].vertices) != tuple(data['edges'][k]):
+            return False
+        edges.append(edge)
+
+    coords = model_index.point_coordinates(structural_data)
+    for k, edge in enumerate(edges):
+        for vertex in data['edges'][k]:
+            mesh.vertices[int(vertex)].co = coords[vertex]
+        for name in names:
+            item = mesh.attributes[name].data[edge]
+            if data[name].dtype.kind == 'i':
+                item.value = int(data[name][k])
+            else:
+                item.vector = data[name][k]
+    utils.update_mesh(mesh)
+    return True
+
+def remove_beam_edges():
+    utils.remove_object(BEAM_EDGES_NAME)
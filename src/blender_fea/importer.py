@@ -0,0 +1,393 @@
+"""
+Chunked import of structural JSON into a scene's structural_data
+
+Elements are streamed out of the file by json_stream and committed to the
+PropertyGroups in fixed-size chunks, so neither the parsed document nor a
+large list of pending elements is ever held in memory. Geometry is built once
+everything has been committed (build_geometry), using the batch builders.
+
+Merge imports (merge_elements) instead compare incoming elements with the
+existing model by name and content and only touch what differs.
+"""
+
+import numpy as np
+
+from . import exporter
+from . import geometry
+from . import json_stream
+from . import live_sync
+from . import lod
+from . import model_index
+from . import utils
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def set_point(point, coords):
+    point.x, point.y, point.z = coords
+
+def set_section(section, section_data):
+    section.section_type = section_data.get('type', 'CIRCULAR')
+
+    if section.section_type in ('CIRCULAR', 'TUBE'):
+        section.diameter = section_data.get('diameter', 0.1)
+    elif section.section_type == 'POLYGONAL':
+        section.poly_diameter = section_data.get('diameter', 0.1)
+        section.sides = section_data.get('sides', 6)
+    else:
+        section.width = section_data.get('width', 0.1)
+        section.height = section_data.get('height', 0.15)
+
+    if section.section_type in geometry.OPEN_TYPES:
+        section.web_thickness = section_data.get('web_thickness', geometry.DEFAULT_WALLS['web_thickness'])
+        section.flange_thickness = section_data.get('flange_thickness', geometry.DEFAULT_WALLS['flange_thickness'])
+    elif section.section_type in geometry.HOLLOW_TYPES:
+        section.wall_thickness = section_data.get('wall_thickness', geometry.DEFAULT_WALLS['wall_thickness'])
+
+def set_beam(beam, beam_data):
+    beam.start_point = beam_data['start_point']
+    beam.end_point = beam_data['end_point']
+
+    if 'section' in beam_data:
+        beam.section_name = beam_data['section']
+    else:
+        beam.section_name = ""
+        beam.diameter = beam_data.get('diameter', 0.1)
+
+def set_shell(shell, shell_data):
+    shell.point_list = ",".join(shell_data['points'])
+    shell.thickness = shell_data.get('thickness', 0.05)
+
+def is_valid(kind, value):
+    """Whether an incoming element value can be imported at all"""
+    if kind == 'beams':
+        return isinstance(value, dict) and 'start_point' in value and 'end_point' in value
+    if kind == 'shells':
+        return isinstance(value, dict) and 'points' in value
+    return True
+
+SETTERS = {
+    'points': set_point,
+    'sections': set_section,
+    'beams': set_beam,
+    'shells': set_shell,
+}
+
+def commit_elements(structural_data, kind, items):
+    collection = getattr(structural_data, kind)
+    setter = SETTERS[kind]
+    for name, value in items:
+        if is_valid(kind, value):
+            element = collection.add()
+            element.name = name
+            setter(element, value)
+            if kind == 'points':
+                element.node_id = model_index.new_node_id(structural_data)
+
+def iter_commit(elements, structural_data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Commit (kind, name, value) elements into structural_data
+
+    Elements are committed chunk_size at a time; after each chunk this yields
+    (kind, counts) where counts maps every element kind to the number of
+    elements committed so far. No geometry is built - call build_geometry()
+    when the generator is exhausted.
+    """
+    counts = dict.fromkeys(json_stream.ELEMENT_KINDS, 0)
+    pending_kind = None
+    pending = []
+
+    for kind, name, value in elements:
+        if name is None:
+            continue    # metadata
+
+        if pending and kind != pending_kind:
+            commit_elements(structural_data, pending_kind, pending)
+            counts[pending_kind] += len(pending)
+            pending = []
+            yield pending_kind, counts
+
+        pending_kind = kind
+        pending.append((name, value))
+
+        if len(pending) >= chunk_size:
+            commit_elements(structural_data, kind, pending)
+            counts[kind] += len(pending)
+            pending = []
+            yield kind, counts
+
+    if pending:
+        commit_elements(structural_data, pending_kind, pending)
+        counts[pending_kind] += len(pending)
+        yield pending_kind, counts
+
+    # Beams and shells read before their points could not be linked by node ID yet
+    model_index.invalidate(structural_data)
+    model_index.resolve_beam_nodes(structural_data)
+    model_index.resolve_shell_nodes(structural_data)
+
+def iter_import(fp, structural_data, chunk_size=DEFAULT_CHUNK_SIZE, reader=None):
+    """Stream elements from a JSON file object into structural_data (see iter_commit)"""
+    yield from iter_commit(json_stream.iter_structural_data(fp, reader), structural_data, chunk_size)
+
+def iter_build_geometry(structural_data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Create visuals for everything in structural_data after an import
+
+    Work that has to be done element by element is split into chunks; yields
+    ('geometry', kind) after each step.
+    """
+    # Draw the new model at the level of detail its size calls for
+    lod.update_levels(structural_data)
+
+    if structural_data.point_display_mode == 'INSTANCED':
+        utils.sync_point_cloud(structural_data)
+        yield 'geometry', 'points'
+    else:
+        for i, point in enumerate(structural_data.points):
+            utils.create_point_sphere(point, structural_data.point_lod_level)
+            if (i + 1) % chunk_size == 0:
+                yield 'geometry', 'points'
+
+    if structural_data.beam_display_mode == 'OBJECTS':
+        for i, _beam_obj in enumerate(utils.iter_beam_objects(structural_data)):
+            if (i + 1) % chunk_size == 0:
+                yield 'geometry', 'beams'
+    else:
+        utils.build_beam_visuals(structural_data)
+    yield 'geometry', 'beams'
+
+    if structural_data.shell_display_mode == 'MERGED':
+        utils.build_merged_shells(structural_data)
+    else:
+        for i, shell in enumerate(structural_data.shells):
+            utils.create_shell_from_data(shell, structural_data)
+            if (i + 1) % chunk_size == 0:
+                yield 'geometry', 'shells'
+
+    # Everything was just built - edits recorded while committing are stale
+    live_sync.discard(structural_data)
+    yield 'geometry', 'shells'
+
+def build_geometry(structural_data):
+    """Create visuals for everything in structural_data in one go"""
+    for _step in iter_build_geometry(structural_data):
+        pass
+
+def iter_import_file(fp, structural_data, chunk_size=DEFAULT_CHUNK_SIZE, reader=None, merge_tolerance=0.0):
+    """A whole import - streaming, committing and geometry - as a sequence of small steps
+
+    Yields (kind, counts) while elements are being committed and then
+    ('geometry', kind) while visuals are built. Driving this to exhaustion is
+    the same as import_file(); the modal importer runs it a few steps per tick.
+    With merge_tolerance > 0, coincident points are merged before any
+    geometry is built.
+    """
+    yield from iter_import(fp, structural_data, chunk_size, reader)
+    if merge_tolerance > 0:
+        utils.merge_coincident_points(structural_data, merge_tolerance, rebuild=False)
+    yield from iter_build_geometry(structural_data, chunk_size)
+
+def import_file(filepath, structural_data, chunk_size=DEFAULT_CHUNK_SIZE, merge_tolerance=0.0):
+    """Stream a structural JSON file into structural_data and build its geometry
+
+    Returns the per-kind element counts (as read, before any merging).
+    """
+    counts = dict.fromkeys(json_stream.ELEMENT_KINDS, 0)
+    with json_stream.open_model(filepath) as file:
+        for stage, detail in iter_import_file(file, structural_data, chunk_size, merge_tolerance=merge_tolerance):
+            if stage != 'geometry':
+                counts = detail
+
+    return counts
+
+def import_model(structural_model, structural_data, chunk_size=DEFAULT_CHUNK_SIZE, merge_tolerance=0.0):
+    """Push a model.StructuralModel into structural_data and build its geometry
+
+    With merge_tolerance > 0, coincident points are merged before any
+    geometry is built. Returns the per-kind element counts (before merging).
+    """
+    counts = dict.fromkeys(json_stream.ELEMENT_KINDS, 0)
+    for _kind, counts in iter_commit(structural_model.iter_elements(), structural_data, chunk_size):
+        pass
+
+    if merge_tolerance > 0:
+        utils.merge_coincident_points(structural_data, merge_tolerance, rebuild=False)
+    build_geometry(structural_data)
+    return counts
+
+
+# Merge import - only add, update or remove what differs from the current model
+def _f32(value):
+    """Compare floats at the precision FloatProperty stores them"""
+    return float(np.float32(value))
+
+def content_key(kind, value):
+    """Hashable summary of an element's content in the JSON value format"""
+    if kind == 'points':
+        return tuple(_f32(c) for c in value)
+    if kind == 'beams':
+        if 'section' in value:
+            return (value['start_point'], value['end_point'], value['section'])
+        return (value['start_point'], value['end_point'], None, _f32(value.get('diameter', 0.1)))
+    if kind == 'shells':
+        return (tuple(name.strip() for name in value['points']), _f32(value.get('thickness', 0.05)))
+
+    section_type, size1, size2, sides, t1, t2 = geometry.profile_from_value(value)
+    return (section_type, _f32(size1), _f32(size2), int(sides), _f32(t1), _f32(t2))
+
+TO_DICT = {
+    'points': lambda point: [point.x, point.y, point.z],
+    'sections': exporter.section_to_dict,
+    'beams': exporter.beam_to_dict,
+    'shells': exporter.shell_to_dict,
+}
+
+def _diff_points(structural_data, incoming):
+    """Added and moved point names, compared as whole arrays"""
+    table = model_index.name_table(structural_data, 'points')
+    names = list(incoming)
+    indices = np.array([table.get(name, -1) for name in names], dtype=np.int64)
+    new_coords = np.array([incoming[name] for name in names], dtype=np.float32).reshape(-1, 3)
+
+    existing = indices >= 0
+    moved = np.zeros(len(names), dtype=bool)
+    if existing.any():
+        old_coords = model_index.point_coordinates(structural_data)[indices[existing]]
+        moved[existing] = np.any(old_coords != new_coords[existing], axis=1)
+
+    added = [name for name, found in zip(names, existing) if not found]
+    updated = [name for name, changed in zip(names, moved) if changed]
+    return added, updated
+
+def _diff_elements(structural_data, kind, incoming):
+    """Added and changed element names for sections, beams or shells"""
+    table = model_index.name_table(structural_data, kind)
+    collection = getattr(structural_data, kind)
+    to_dict = TO_DICT[kind]
+
+    added = []
+    updated = []
+    for name, value in incoming.items():
+        index = table.get(name)
+        if index is None:
+            added.append(name)
+        elif content_key(kind, value) != content_key(kind, to_dict(collection[index])):
+            updated.append(name)
+    return added, updated
+
+def _remove_element_object(structural_data, kind, name):
+    element = model_index.get_element(structural_data, kind, name)
+    if element is not None:
+        utils.remove_element_object(element)
+
+def merge_elements(elements, structural_data):
+    """Bring structural_data in line with an element stream, touching only the differences
+
+    Elements are matched by name and compared by content_key. Elements missing
+    from the stream are removed. Only geometry of added/changed elements and of
+    members attached to moved points or changed sections is regenerated.
+    Returns {kind: {'added': [...], 'updated': [...], 'removed': [...]}}.
+    """
+    incoming = {kind: {} for kind in json_stream.ELEMENT_KINDS}
+    for kind, name, value in elements:
+        if name is not None and is_valid(kind, value):
+            incoming[kind][name] = value
+
+    changes = {}
+    for kind in json_stream.ELEMENT_KINDS:
+        if kind == 'points':
+            added, updated = _diff_points(structural_data, incoming[kind])
+        else:
+            added, updated = _diff_elements(structural_data, kind, incoming[kind])
+        table = model_index.name_table(structural_data, kind)
+        removed = [name for name in table if name not in incoming[kind]]
+        changes[kind] = {'added': added, 'updated': updated, 'removed': removed}
+
+    # Members whose geometry depends on something that changed
+    moved_points = set()
+    for key in ('added', 'updated', 'removed'):
+        moved_points.update(changes['points'][key])
+    changed_sections = set(changes['sections']['updated']) | set(changes['sections']['removed']) | set(changes['sections']['added'])
+
+    rebuild_beams = set(changes['beams']['added']) | set(changes['beams']['updated'])
+    rebuild_shells = set(changes['shells']['added']) | set(changes['shells']['updated'])
+    if moved_points or changed_sections:
+        for beam in structural_data.beams:
+            if beam.start_point in moved_points or beam.end_point in moved_points or beam.section_name in changed_sections:
+                rebuild_beams.add(beam.name)
+    if moved_points:
+        moved_ids = [model_index.node_id_of(structural_data, name) for name in moved_points]
+        _offsets, node_ids = model_index.shell_connectivity(structural_data)
+        hits = np.isin(node_ids, [node_id for node_id in moved_ids if node_id])
+        if changes['points']['added']:
+            # Unresolved shell nodes may refer to one of the new points
+            hits |= model_index.node_indices(structural_data, node_ids) < 0
+        for h in model_index.shells_using(structural_data, np.flatnonzero(hits)):
+            rebuild_shells.add(structural_data.shells[int(h)].name)
+
+    # Old visuals of everything that is removed or rebuilt
+    for name in rebuild_beams | set(changes['beams']['removed']):
+        _remove_element_object(structural_data, 'beams', name)
+    for name in rebuild_shells | set(changes['shells']['removed']):
+        _remove_element_object(structural_data, 'shells', name)
+    if structural_data.point_display_mode == 'OBJECTS':
+        for name in set(changes['points']['updated']) | set(changes['points']['removed']):
+            _remove_element_object(structural_data, 'points', name)
+
+    # Apply the data changes - sections first so beams can resolve them
+    for kind in ('sections', 'points', 'beams', 'shells'):
+        collection = getattr(structural_data, kind)
+        setter = SETTERS[kind]
+        table = model_index.name_table(structural_data, kind)
+        for name in changes[kind]['updated']:
+            setter(collection[table[name]], incoming[kind][name])
+        commit_elements(structural_data, kind, ((name, incoming[kind][name]) for name in changes[kind]['added']))
+
+    for kind in ('shells', 'beams', 'points', 'sections'):
+        collection = getattr(structural_data, kind)
+        table = model_index.name_table(structural_data, kind)
+        for index in sorted((table[name] for name in changes[kind]['removed']), reverse=True):
+            collection.remove(index)
+        model_index.invalidate(structural_data, kind)
+    model_index.resolve_beam_nodes(structural_data)
+    model_index.resolve_shell_nodes(structural_data)
+
+    # Regenerate only the affected geometry
+    if moved_points:
+        if structural_data.point_display_mode == 'INSTANCED':
+            utils.sync_point_cloud(structural_data)
+        else:
+            for name in set(changes['points']['added']) | set(changes['points']['updated']):
+                utils.create_point_sphere(model_index.get_element(structural_data, 'points', name),
+                                          structural_data.point_lod_level)
+
+    beam_table = model_index.name_table(structural_data, 'beams')
+    shell_table = model_index.name_table(structural_data, 'shells')
+    if structural_data.beam_display_mode in utils.SHARED_BEAM_MODES:
+        if changes['beams']['added'] or changes['beams']['removed']:
+            utils.build_beam_visuals(structural_data)
+        elif rebuild_beams:
+            # Same beams - rewrite the affected ranges of the shared mesh in place
+            utils.rebuild_members(structural_data, [beam_table[name] for name in rebuild_beams if name in beam_table])
+    else:
+        for name in rebuild_beams:
+            beam = model_index.get_element(structural_data, 'beams', name)
+            if beam is not None:
+                utils.create_beam_from_data(beam, structural_data)
+
+    if structural_data.shell_display_mode == 'MERGED':
+        if changes['shells']['added'] or changes['shells']['removed']:
+            utils.build_merged_shells(structural_data)
+        elif rebuild_shells:
+            utils.rebuild_members(structural_data, shell_indices=[shell_table[name] for name in rebuild_shells if name in shell_table])
+    else:
+        for name in rebuild_shells:
+            shell = model_index.get_element(structural_data, 'shells', name)
+            if shell is not None:
+                utils.create_shell_from_data(shell, structural_data)
+
+    return changes
+
+def merge_file(filepath, structural_data):
+    """Merge a structural JSON file into structural_data (see merge_elements)"""
+    with json_stream.open_model(filepath) as file:
+        return merge_elements(json_stream.iter_structural_data(file), structural_data)
@@ -0,0 +1,263 @@
+"""
+Streaming reader and writer for structural JSON files
+
+json.load has to hold the whole document as Python objects. Model files are
+one big object of the form
+
+    {"structural_data": {"points": {...}, "beams": {...}, "shells": {...},
+                         "sections": {...}, "metadata": {...}}}
+
+so this module walks that outer structure by hand and only decodes one
+element value at a time (with json's own C scanner), reading the file in
+fixed-size blocks. Memory use stays flat however large the file is.
+
+write_structural_data does the reverse: it writes the same outer structure
+by hand and encodes one element at a time, so an export never has to build
+the whole document either.
+
+open_model opens model files for either direction, transparently
+(de)compressing gzip and xz streams, so compressed models also go through
+the streaming reader and writer a block at a time.
+
+No bpy in here - it can be used outside Blender.
+"""
+
+import gzip
+import io
+import json
+import lzma
+
+ELEMENT_KINDS = ('points', 'sections', 'beams', 'shells')
+
+READ_SIZE = 1 << 16
+
+# Encoded elements buffered before each write
+WRITE_BATCH = 1000
+
+# Compression formats recognised by their leading magic bytes
+MAGIC_BYTES = (
+    ('gzip', b'\x1f\x8b'),
+    ('xz', b'\xfd7zXZ\x00'),
+)
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'xz': '.xz'}
+
+# Passed to gzip - level 9 costs a lot of time for very little on model files
+GZIP_LEVEL = 6
+
+_WHITESPACE = ' \t\n\r'
+
+
+def detect_compression(fileobj):
+    """'gzip', 'xz' or None, from the magic bytes of a seekable binary file object"""
+    position = fileobj.tell()
+    head = fileobj.read(6)
+    fileobj.seek(position)
+    for compression, magic in MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+def compression_from_extension(filepath):
+    for compression, extension in COMPRESSION_EXTENSIONS.items():
+        if filepath.lower().endswith(extension):
+            return compression
+    return None
+
+def open_model(filepath, mode='r', fileobj=None, compression=None):
+    """Open a model file as UTF-8 text, (de)compressing on the fly
+
+    Reading detects gzip/xz from the file's magic bytes, whatever its name.
+    Writing compresses with `compression` ('gzip', 'xz' or None), which
+    defaults to what the extension (.gz/.xz) implies. A binary fileobj may be
+    given for reading (e.g. to follow progress through fileobj.tell()); it is
+    not closed along with the returned stream when the file is compressed.
+    """
+    if mode == 'w':
+        compression = compression or compression_from_extension(filepath)
+        if compression == 'gzip':
+            return gzip.open(filepath, 'wt', encoding='utf-8', compresslevel=GZIP_LEVEL)
+        if compression == 'xz':
+            return lzma.open(filepath, 'wt', encoding='utf-8')
+        return open(filepath, 'w', encoding='utf-8')
+
+    if fileobj is None:
+        with open(filepath, 'rb') as file:
+            compression = detect_compression(file)
+        if compression == 'gzip':
+            return gzip.open(filepath, 'rt', encoding='utf-8')
+        if compression == 'xz':
+            return lzma.open(filepath, 'rt', encoding='utf-8')
+        return open(filepath, 'r', encoding='utf-8')
+
+    compression = detect_compression(fileobj)
+    if compression == 'gzip':
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+    elif compression == 'xz':
+        fileobj = lzma.LZMAFile(fileobj, mode='rb')
+    return io.TextIOWrapper(fileobj, encoding='utf-8')
+
+
+class StreamReader:
+    """Pull parser over a text file object, decoding one JSON value at a time"""
+
+    def __init__(self, fp, read_size=READ_SIZE):
+        self.fp = fp
+        self.read_size = read_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.chars_read = 0
+        self.decoder = json.JSONDecoder()
+
+    @property
+    def chars_consumed(self):
+        return self.chars_read - (len(self.buffer) - self.pos)
+
+    def _fill(self, size=None):
+        """Read another block, dropping the part of the buffer already consumed"""
+        if self.eof:
+            return False
+        block = self.fp.read(size or self.read_size)
+        if not block:
+            self.eof = True
+            return False
+        self.chars_read += len(block)
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer) or not self._fill():
+                return
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it ('' at end of file)"""
+        self.skip_whitespace()
+        if self.pos < len(self.buffer):
+            return self.buffer[self.pos]
+        return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at character {self.chars_consumed}, found '{found}'")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode the next complete JSON value"""
+        self.skip_whitespace()
+        size = self.read_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # A value running to the end of the buffer may be cut short (e.g. a number)
+            if end >= len(self.buffer) and self._fill(size):
+                size *= 2
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_object_keys(self):
+        """Yield the keys of an object whose '{' has just been consumed
+
+        The caller must consume each key's value before asking for the next key.
+        """
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key at character {self.chars_consumed}")
+            self.expect(':')
+            yield key
+
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' at character {self.chars_consumed}, found '{separator}'")
+
+
+def iter_structural_data(fp, reader=None):
+    """Yield (kind, name, value) for every element in a structural JSON file
+
+    kind is one of ELEMENT_KINDS for model elements. Any other member of
+    structural_data (e.g. metadata) is yielded whole as (key, None, value).
+    Pass a StreamReader to be able to follow progress through chars_consumed.
+    """
+    reader = reader or StreamReader(fp)
+    reader.expect('{')
+    for key in reader.iter_object_keys():
+        if key != 'structural_data' or reader.peek() != '{':
+            reader.read_value()
+            continue
+
+        reader.expect('{')
+        for kind in reader.iter_object_keys():
+            if kind in ELEMENT_KINDS and reader.peek() == '{':
+                reader.expect('{')
+                for name in reader.iter_object_keys():
+                    yield kind, name, reader.read_value()
+            else:
+                yield kind, None, reader.read_value()
+
+
+def write_structural_data(fp, elements, extra=None, indent=None):
+    """Write a structural JSON document to a text file object
+
+    elements is a sequence of (kind, pairs), pairs being an iterable of
+    (name, value) written as that kind's object one element at a time. extra
+    maps further members of structural_data (e.g. metadata) to plain values.
+    With indent=None the output is compact; otherwise it matches
+    json.dump(..., indent=indent).
+    """
+    if indent is None:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        newline = [''] * 4
+        colon = ':'
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, indent=indent).encode
+        newline = ['\n' + ' ' * (indent * level) for level in range(4)]
+        colon = ': '
+
+    members = [(kind, pairs, True) for kind, pairs in elements]
+    members += [(key, value, False) for key, value in (extra or {}).items()]
+
+    fp.write('{' + newline[1] + '"structural_data"' + colon + '{')
+    for m, (key, content, streamed) in enumerate(members):
+        fp.write((',' if m else '') + newline[2] + encode(key) + colon)
+
+        if not streamed:
+            fp.write(encode(content).replace('\n', newline[2]))
+            continue
+
+        fp.write('{')
+        batch = []
+        empty = True
+        for name, value in content:
+            batch.append(newline[3] + encode(name) + colon + encode(value).replace('\n', newline[3]))
+            if len(batch) >= WRITE_BATCH:
+                fp.write((',' if not empty else '') + ','.join(batch))
+                empty = False
+                batch = []
+        if batch:
+            fp.write((',' if not empty else '') + ','.join(batch))
+            empty = False
+        fp.write('}' if empty else newline[2] + '}')
+
+    fp.write((newline[1] + '}' if members else '}') + newline[0] + '}')
@@ -0,0 +1,152 @@
+"""
+Live sync - redraw what an edit touched, without pressing "Update"
+
+With structural_data.live_sync on, every edit to a point, beam, shell or
+section is recorded by its property update callback (mark), and points
+moved in the viewport are picked up from the depsgraph updates - point
+objects (OBJECTS) by their location, point cloud vertices (INSTANCED) by
+their position. Mesh data only changes when Edit Mode writes it back, so
+cloud vertices moved in Edit Mode are picked up on leaving it.
+
+Every mark re-arms a short timer, so a burst of edits - e.g. while dragging
+a slider or a point - is redrawn once, DEBOUNCE seconds after the last
+edit, in one batch (flush):
+
+    moved points      -> their point visuals, plus the beams and shells
+                         attached to them (model_index.elements_at)
+    edited beams      -> those beams
+    edited shells     -> those shells
+    edited sections   -> the beams using them (model_index.beams_with_sections),
+                         where the display mode does not already update
+                         them in place
+
+Separate objects are rebuilt one by one. The shared merged and Geometry
+Nodes meshes are rewritten in place through the members' geom_start /
+geom_count ranges (utils.rebuild_members), so the cost of a flush follows
+the size of the edit; only when an edit changes their layout, or touches
+a large part of the model, are they rebuilt whole.
+"""
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+from . import model_index
+from . import utils
+
+# Seconds without further edits before redrawing
+DEBOUNCE = 0.05
+
+# structural_data.as_pointer() -> {'scene': scene name, kind: set of names}
+_pending = {}
+
+
+def mark(structural_data, kind, name):
+    """Record an edited element for the next flush, if live sync is on"""
+    if not structural_data.live_sync or utils.in_bulk_edit():
+        return
+    pending = _pending.setdefault(structural_data.as_pointer(), {kind: set() for kind in model_index.KINDS})
+    pending['scene'] = structural_data.id_data.name
+    pending[kind].add(name)
+    # Debounce - restart the wait on every edit
+    if bpy.app.timers.is_registered(flush):
+        bpy.app.timers.unregister(flush)
+    bpy.app.timers.register(flush, first_interval=DEBOUNCE)
+
+def discard(structural_data=None):
+    """Forget pending edits for one model (e.g. after everything was rebuilt), or for all"""
+    if structural_data is None:
+        _pending.clear()
+    else:
+        _pending.pop(structural_data.as_pointer(), None)
+
+def point_object_table(structural_data):
+    """{object pointer: point index} for point objects, cached with the other derived data"""
+    return model_index.cached(structural_data, 'point_objects', lambda data: {
+        point.obj.as_pointer(): i for i, point in enumerate(data.points) if point.obj is not None})
+
+def pull_point_objects(scene, depsgraph):
+    """Copy the location of point objects moved in the viewport back into their points"""
+    structural_data = scene.structural_data
+    if structural_data.point_display_mode != 'OBJECTS':
+        return
+    for update in depsgraph.updates:
+        if not update.is_updated_transform or not isinstance(update.id, bpy.types.Object):
+            continue
+        obj = update.id.original
+        # Objects usually still carry their point's name; renamed ones are found by pointer
+        point = model_index.get_element(structural_data, 'points', obj.name)
+        if point is None or point.obj != obj:
+            index = point_object_table(structural_data).get(obj.as_pointer())
+            point = None if index is None else structural_data.points[index]
+        if point is None:
+            continue
+        location = tuple(obj.location)
+        if not np.allclose(location, (point.x, point.y, point.z)):
+            point.x, point.y, point.z = location
+
+def pull_point_cloud(scene, depsgraph):
+    """Copy point cloud vertices moved in the viewport back into their points"""
+    structural_data = scene.structural_data
+    if structural_data.point_display_mode != 'INSTANCED':
+        return
+    cloud_obj = bpy.data.objects.get(utils.POINT_CLOUD_NAME)
+    if cloud_obj is None:
+        return
+    if not any(update.is_updated_geometry and update.id.original in (cloud_obj, cloud_obj.data)
+               for update in depsgraph.updates):
+        return
+
+    mesh = cloud_obj.data
+    points = structural_data.points
+    # Vertex i is point i (sync_point_cloud) - anything else is not ours to read
+    if len(mesh.vertices) != len(points):
+        return
+    coords = np.empty(len(points) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    coords = coords.reshape(-1, 3)
+    moved = np.flatnonzero(np.any(coords != model_index.point_coordinates(structural_data), axis=1))
+    for i in moved:
+        point = points[int(i)]
+        point.x, point.y, point.z = coords[i]
+
+@persistent
+def live_sync_depsgraph_update(scene, depsgraph):
+    """Collect viewport edits; marking them (re)starts the flush timer"""
+    structural_data = getattr(scene, 'structural_data', None)
+    if structural_data is None or not structural_data.live_sync or utils.in_bulk_edit():
+        return
+    pull_point_objects(scene, depsgraph)
+    pull_point_cloud(scene, depsgraph)
+
+def flush():
+    """Redraw everything edited since the last flush (bpy.app.timers callback)"""
+    pending_models = list(_pending.values())
+    _pending.clear()
+    for pending in pending_models:
+        scene = bpy.data.scenes.get(pending['scene'])
+        if scene is not None and scene.structural_data.live_sync:
+            sync_edits(scene.structural_data, pending)
+    return None
+
+def sync_edits(structural_data, pending):
+    """Rebuild the visuals affected by a set of edited element names"""
+    def indices(kind):
+        table = model_index.name_table(structural_data, kind)
+        return np.array(sorted(table[name] for name in pending[kind] if name in table), dtype=np.int64)
+
+    points = indices('points')
+    beams = indices('beams')
+    shells = indices('shells')
+
+    if len(points):
+        utils.update_point_visuals(structural_data, points)
+        beams = np.union1d(beams, model_index.elements_at(structural_data, 'beams', points))
+        shells = np.union1d(shells, model_index.elements_at(structural_data, 'shells', points))
+
+    # Shared per-section meshes (OBJECTS) and Geometry Nodes attributes already
+    # follow section edits; the merged mesh has to be rebuilt
+    if pending['sections'] and structural_data.beam_display_mode == 'MERGED':
+        beams = np.union1d(beams, model_index.beams_with_sections(structural_data, pending['sections']))
+
+    utils.rebuild_members(structural_data, beams, shells)
@@ -0,0 +1,118 @@
+"""
+Display level of detail for points and beams
+
+Each kind of element is drawn at one of three levels:
+
+    FULL     points: UV-sphere markers     beams: swept section profiles
+    MEDIUM   points: icosahedron markers   beams: bounding boxes of their sections
+    LOW      points: bare points           beams: plain lines
+
+With structural_data.lod_mode set to AUTO the level is the most detailed
+one whose triangle count (elements x triangles per element) fits in
+TRIANGLE_BUDGET. The budget shrinks as the nearest 3D viewport moves away
+from the model - a model that covers a few pixels does not need its
+flanges - so the viewport's frame time stays bounded however large the
+model is. A timer (check_view) re-evaluates the levels every
+CHECK_INTERVAL seconds and redraws a kind only when its level changes.
+
+The levels in use are stored in structural_data.point_lod_level and
+beam_lod_level, which the geometry builders in utils read, so a saved file
+reopens at the level it was drawn with.
+"""
+
+import bpy
+import numpy as np
+
+from . import model_index
+from . import utils
+
+LEVELS = ('FULL', 'MEDIUM', 'LOW')
+
+# Rough number of triangles drawn per element at each level
+POINT_TRIANGLES = {'FULL': 224, 'MEDIUM': 20, 'LOW': 0}
+BEAM_TRIANGLES = {'FULL': 32, 'MEDIUM': 12, 'LOW': 0}
+
+# Triangles the viewport may spend on each kind of element
+TRIANGLE_BUDGET = 2_000_000
+
+# Smallest fraction of the budget left when the model is far away
+MIN_DETAIL = 0.05
+
+# Seconds between checks of the viewport distance
+CHECK_INTERVAL = 1.0
+
+
+def choose_level(count, triangles, budget):
+    """Most detailed level whose triangle count for count elements fits in budget"""
+    for level in LEVELS:
+        if count * triangles[level] <= budget:
+            return level
+    return LEVELS[-1]
+
+def view_detail(extent, distance):
+    """Share of the triangle budget for a model of this size seen from this distance
+
+    1 while the model fills the view, falling off as it gets smaller on screen.
+    """
+    if extent <= 0 or distance <= 0:
+        return 1.0
+    return float(np.clip(extent / distance, MIN_DETAIL, 1.0))
+
+def nearest_view_distance(center):
+    """Distance from the nearest 3D viewport's eye to center, or None without a 3D viewport"""
+    window_manager = bpy.context.window_manager
+    if window_manager is None:
+        return None
+
+    nearest = None
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            region_3d = area.spaces.active.region_3d
+            if region_3d is None:
+                continue
+            eye = np.array(region_3d.view_matrix.inverted().translation)
+            distance = float(np.linalg.norm(eye - center))
+            nearest = distance if nearest is None else min(nearest, distance)
+    return nearest
+
+def compute_levels(structural_data):
+    """{'points': level, 'beams': level} for the model's size and the current view"""
+    if structural_data.lod_mode != 'AUTO':
+        return {'points': structural_data.lod_mode, 'beams': structural_data.lod_mode}
+
+    detail = 1.0
+    coords = model_index.point_coordinates(structural_data)
+    if len(coords):
+        low, high = coords.min(axis=0), coords.max(axis=0)
+        distance = nearest_view_distance((low + high) / 2.0)
+        if distance is not None:
+            detail = view_detail(float(np.linalg.norm(high - low)), distance)
+
+    budget = TRIANGLE_BUDGET * detail
+    return {
+        'points': choose_level(len(structural_data.points), POINT_TRIANGLES, budget),
+        'beams': choose_level(len(structural_data.beams), BEAM_TRIANGLES, budget),
+    }
+
+def update_levels(structural_data):
+    """Store freshly computed levels, returning the kinds whose level changed"""
+    levels = compute_levels(structural_data)
+    changed = []
+    if structural_data.point_lod_level != levels['points']:
+        structural_data.point_lod_level = levels['points']
+        changed.append('points')
+    if structural_data.beam_lod_level != levels['beams']:
+        structural_data.beam_lod_level = levels['beams']
+        changed.append('beams')
+    return changed
+
+def check_view():
+    """Re-evaluate AUTO levels for the current scene and redraw what changed (bpy.app.timers callback)"""
+    structural_data = getattr(bpy.context.scene, 'structural_data', None)
+    if structural_data is not None and structural_data.lod_mode == 'AUTO' and not utils.in_bulk_edit():
+        changed = update_levels(structural_data)
+        if changed:
+            utils.apply_level_of_detail(structural_data, changed)
+    return CHECK_INTERVAL
@@ -0,0 +1,233 @@
+"""
+Array-backed structural model, independent of Blender
+
+StructuralModel holds a whole model as flat NumPy arrays - point coordinates,
+integer beam and shell connectivity, section tables - plus interned name
+lists. It is the same layout as the binary format (binary_format), so a
+.feab file loads straight into it, and JSON goes through the streaming
+reader and writer (json_stream).
+
+Inside Blender the scene's PropertyGroups (properties.StructuralProperties)
+remain the model of record. get_model() takes a read-only snapshot of a
+scene's structural_data as a StructuralModel - cached, and taken again
+after edits - for whole-model work such as validation and export, and
+importer.import_model() copies a model into the PropertyGroups. The
+add-on's file operators go through it: import is StructuralModel.load()
+then import_model(), export is get_model(...).save(). Only the modal
+"Import Large JSON" streams the file straight into the PropertyGroups, so
+that it can show progress while reading.
+
+No bpy in here - it can be used outside Blender, e.g.
+
+    import sys
+    sys.path.insert(0, "<add-on>/src")
+    from blender_fea.model import StructuralModel
+
+    model = StructuralModel.load("frame.json.gz")
+    print(model.counts(), model.beam_lengths().sum())
+    model.save("frame.feab")
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from . import binary_format
+from . import exporter
+from . import geometry
+from . import json_stream
+from . import model_index
+from . import validation
+
+
+class StructuralModel:
+    """Structural model stored as arrays
+
+    References that do not resolve to an element are -1 in the connectivity
+    arrays; their names are kept in beam_refs {(beam, column): name} (column
+    0 start, 1 end, 2 section) and shell_refs {position in shell_nodes: name}
+    so that nothing is lost on a round trip.
+    """
+
+    def __init__(self, arrays=None, metadata=None):
+        if arrays is None:
+            arrays, _metadata = binary_format.arrays_from_elements(())
+
+        strings = [sys.intern(text) for text in binary_format.decode_strings(arrays)]
+        self.metadata = dict(metadata or {})
+
+        self.point_names = [strings[i] for i in arrays['point_name']]
+        self.coords = np.array(arrays['point_coords'], dtype=np.float64).reshape(-1, 3)
+
+        self.section_names = [strings[i] for i in arrays['section_name']]
+        self.section_type = np.array(arrays['section_type'], dtype=np.int8)
+        self.section_dims = np.array(arrays['section_dims'], dtype=np.float64).reshape(-1, 4)
+        self.section_sides = np.array(arrays['section_sides'], dtype=np.int32)
+        self.section_walls = np.array(arrays['section_walls'], dtype=np.float64).reshape(-1, 3)
+
+        self.beam_names = [strings[i] for i in arrays['beam_name']]
+        self.beam_nodes = np.array(arrays['beam_nodes'], dtype=np.int32).reshape(-1, 2)
+        self.beam_section = np.array(arrays['beam_section'], dtype=np.int32)
+        self.beam_diameter = np.array(arrays['beam_diameter'], dtype=np.float64)
+        self.beam_refs = {(int(b), int(column)): strings[s] for b, column, s in arrays['beam_unresolved']}
+
+        self.shell_names = [strings[i] for i in arrays['shell_name']]
+        self.shell_offsets = np.array(arrays['shell_offsets'], dtype=np.int64)
+        self.shell_nodes = np.array(arrays['shell_nodes'], dtype=np.int32)
+        self.shell_thickness = np.array(arrays['shell_thickness'], dtype=np.float64)
+        self.shell_refs = {int(position): strings[s] for position, s in arrays['shell_unresolved']}
+
+        self._lookups = {}
+
+    # Construction
+    @classmethod
+    def from_elements(cls, elements):
+        """Build a model from (kind, name, value) tuples in the JSON value format"""
+        arrays, metadata = binary_format.arrays_from_elements(elements)
+        return cls(arrays, metadata)
+
+    @classmethod
+    def from_structural_data(cls, structural_data):
+        """Snapshot of a scene's structural_data PropertyGroups"""
+        return cls.from_elements(exporter.iter_elements(structural_data))
+
+    @classmethod
+    def load(cls, filepath):
+        """Read a binary (.feab) or JSON model file, compressed or not"""
+        if binary_format.is_binary_model(filepath):
+            arrays, metadata = binary_format.read_model(filepath, mmap=False)
+            return cls(arrays, metadata)
+        with json_stream.open_model(filepath) as file:
+            return cls.from_elements(json_stream.iter_structural_data(file))
+
+    # Output
+    def to_arrays(self):
+        """The model in the binary_format array layout"""
+        strings = binary_format.StringTable()
+        arrays = {
+            'point_name': np.array([strings.add(n) for n in self.point_names], dtype=np.int32),
+            'point_coords': self.coords,
+            'section_name': np.array([strings.add(n) for n in self.section_names], dtype=np.int32),
+            'section_type': self.section_type,
+            'section_dims': self.section_dims,
+            'section_sides': self.section_sides,
+            'section_walls': self.section_walls,
+            'beam_name': np.array([strings.add(n) for n in self.beam_names], dtype=np.int32),
+            'beam_nodes': self.beam_nodes,
+            'beam_section': self.beam_section,
+            'beam_diameter': self.beam_diameter,
+            'beam_unresolved': np.array(
+                [(b, column, strings.add(name)) for (b, column), name in sorted(self.beam_refs.items())],
+                dtype=np.int32).reshape(-1, 3),
+            'shell_name': np.array([strings.add(n) for n in self.shell_names], dtype=np.int32),
+            'shell_offsets': self.shell_offsets,
+            'shell_nodes': self.shell_nodes,
+            'shell_unresolved': np.array(
+                [(position, strings.add(name)) for position, name in sorted(self.shell_refs.items())],
+                dtype=np.int32).reshape(-1, 2),
+            'shell_thickness': self.shell_thickness,
+        }
+        arrays['strings_offsets'], arrays['strings_blob'] = strings.to_arrays()
+        return arrays
+
+    def iter_elements(self, metadata=None):
+        """Yield (kind, name, value) in the JSON value format, in export order"""
+        if metadata is None:
+            metadata = self.metadata
+        return binary_format.iter_elements(self.to_arrays(), metadata)
+
+    def save(self, filepath, indent=2, compression=None, metadata=None):
+        """Write the model - binary if filepath ends in .feab, otherwise (optionally compressed) JSON
+
+        metadata replaces the model's own metadata in the file, if given.
+        """
+        if metadata is None:
+            metadata = self.metadata
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        if filepath.lower().endswith(binary_format.EXTENSION):
+            binary_format.write_model(filepath, self.to_arrays(), metadata)
+            return
+
+        elements = {kind: [] for kind in ('points', 'beams', 'shells', 'sections')}
+        for kind, name, value in self.iter_elements(metadata={}):
+            elements[kind].append((name, value))
+        extra = {"metadata": metadata} if metadata else None
+        with json_stream.open_model(filepath, 'w', compression=compression) as file:
+            json_stream.write_structural_data(file, list(elements.items()), extra, indent=indent)
+
+    # Lookups
+    def counts(self):
+        return {
+            'points': len(self.point_names),
+            'sections': len(self.section_names),
+            'beams': len(self.beam_names),
+            'shells': len(self.shell_names),
+        }
+
+    def index_of(self, kind, name):
+        """Index of the first element of a kind with this name, or None"""
+        table = self._lookups.get(kind)
+        if table is None:
+            table = {}
+            for i, element_name in enumerate(getattr(self, kind[:-1] + '_names')):
+                table.setdefault(element_name, i)
+            self._lookups[kind] = table
+        return table.get(name)
+
+    # Analysis
+    def beam_vectors(self):
+        """(B, 3) end minus start for every beam - NaN where a node is unresolved"""
+        vectors = np.full((len(self.beam_names), 3), np.nan)
+        resolved = np.all(self.beam_nodes >= 0, axis=1)
+        nodes = self.beam_nodes[resolved]
+        vectors[resolved] = self.coords[nodes[:, 1]] - self.coords[nodes[:, 0]]
+        return vectors
+
+    def beam_lengths(self):
+        return np.linalg.norm(self.beam_vectors(), axis=1)
+
+    def shell_sizes(self):
+        """Number of vertices of every shell"""
+        return np.diff(self.shell_offsets)
+
+    def section_profile(self, s):
+        """geometry profile tuple of section s"""
+        section_type = binary_format.SECTION_TYPES[self.section_type[s]]
+        dims = self.section_dims[s]
+        web, flange, wall = self.section_walls[s]
+        return geometry.section_profile(
+            section_type,
+            diameter=dims[3] if section_type == 'POLYGONAL' else dims[0],
+            width=dims[1], height=dims[2], sides=int(self.section_sides[s]),
+            web_thickness=web, flange_thickness=flange, wall_thickness=wall,
+        )
+
+    def section_properties(self):
+        """(S, 6) array of A, Iy, Iz, J, Wy, Wz for every section (cached per section shape)"""
+        table = np.zeros((len(self.section_names), 6))
+        for s in range(len(self.section_names)):
+            table[s] = geometry.section_properties(*self.section_profile(s))
+        return table
+
+    def validate(self):
+        """Check the whole model, returning a list of validation.Diagnostic"""
+        return validation.validate(self)
+
+    def bounds(self):
+        """(min, max) corners of the point cloud, or None when there are no points"""
+        if not len(self.coords):
+            return None
+        return self.coords.min(axis=0), self.coords.max(axis=0)
+
+
+def get_model(structural_data):
+    """Cached StructuralModel mirroring a scene's structural_data
+
+    Rebuilt on first use after the PropertyGroups change (model_index
+    invalidation). Treat the returned model as read-only.
+    """
+    return model_index.cached(structural_data, 'model', StructuralModel.from_structural_data)
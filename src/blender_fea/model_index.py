@@ -0,0 +1,368 @@
+"""
+Name -> index lookups for the structural model
+
+CollectionProperty lookups by name are linear scans, so resolving every beam
+end or shell vertex by scanning structural_data.points costs O(B*P). This
+module keeps a dict per collection (points, sections, beams, shells) mapping
+element names to collection indices, plus a cached coordinate array for the
+points, so each lookup is O(1).
+
+Tables are rebuilt lazily on the first lookup after they have been
+invalidated. Operators that add, remove or rename elements call invalidate();
+the name and coordinate properties also invalidate through their update
+callbacks, so edits made in the UI are picked up too.
+
+Points also carry integer node IDs (StructuralPoint.node_id) that beams
+and shells refer to; node_lookup() maps IDs to point indices with one array,
+and shell_connectivity() gathers every shell's node IDs into CSR arrays.
+incidence() inverts both into point -> beams / shells CSR arrays.
+beams_with_sections() answers section -> beams from a cached index in the same way.
+
+Anything else derived from the whole model (e.g. model.get_model) can be
+kept here with cached(); it is dropped whenever any table is invalidated.
+"""
+
+import numpy as np
+
+KINDS = ('points', 'sections', 'beams', 'shells')
+
+# Cached whole-model data that has to go when a point moves (connectivity does not)
+COORDINATE_DEPENDENT = ('model',)
+
+# structural_data.as_pointer() -> {kind: (count, {name: index}), 'coords': array, ...}
+_indexes = {}
+
+
+def _tables(structural_data):
+    return _indexes.setdefault(structural_data.as_pointer(), {})
+
+def invalidate(structural_data, kind=None):
+    """Drop cached tables for one collection kind, or for the whole model"""
+    key = structural_data.as_pointer()
+    if kind is None:
+        _indexes.pop(key, None)
+        return
+    tables = _indexes.get(key)
+    if tables is not None:
+        tables.pop(kind, None)
+        if kind == 'points':
+            tables.pop('coords', None)
+            tables.pop('nodes', None)
+        _drop_derived(tables)
+
+def invalidate_coordinates(structural_data):
+    """Drop the cached point coordinate array and whatever is built from coordinates"""
+    tables = _indexes.get(structural_data.as_pointer())
+    if tables is not None:
+        tables.pop('coords', None)
+        for key in COORDINATE_DEPENDENT:
+            tables.pop(key, None)
+
+def invalidate_derived(structural_data):
+    """Drop cached whole-model data only (for edits that keep names and coordinates)"""
+    tables = _indexes.get(structural_data.as_pointer())
+    if tables is not None:
+        _drop_derived(tables)
+
+def _drop_derived(tables):
+    for key in [key for key in tables if key not in KINDS and key not in ('coords', 'nodes')]:
+        del tables[key]
+
+def cached(structural_data, key, build):
+    """Return tables[key], calling build(structural_data) if it is not cached"""
+    tables = _tables(structural_data)
+    value = tables.get(key)
+    if value is None:
+        value = build(structural_data)
+        tables[key] = value
+    return value
+
+def clear():
+    """Forget every cached index (e.g. after loading a new .blend file)"""
+    _indexes.clear()
+
+def name_table(structural_data, kind):
+    """Return the {name: index} dict for a collection, rebuilding it if stale"""
+    tables = _tables(structural_data)
+    collection = getattr(structural_data, kind)
+    entry = tables.get(kind)
+
+    if entry is None or entry[0] != len(collection):
+        # First occurrence wins, as with the old linear scans
+        table = {}
+        for i, element in enumerate(collection):
+            table.setdefault(element.name, i)
+        entry = (len(collection), table)
+        tables[kind] = entry
+
+    return entry[1]
+
+def index_of(structural_data, kind, name):
+    """Collection index of the named element, or None"""
+    index = name_table(structural_data, kind).get(name)
+    if index is None:
+        return None
+
+    # Cheap guard against edits that bypassed invalidation
+    collection = getattr(structural_data, kind)
+    if collection[index].name != name:
+        invalidate(structural_data, kind)
+        index = name_table(structural_data, kind).get(name)
+    return index
+
+def get_element(structural_data, kind, name):
+    """The named element of a collection, or None"""
+    index = index_of(structural_data, kind, name)
+    if index is None:
+        return None
+    return getattr(structural_data, kind)[index]
+
+def point_coordinates(structural_data):
+    """Cached (N, 3) array of all point coordinates, read in bulk with foreach_get
+
+    The returned array is shared - copy it before modifying.
+    """
+    tables = _tables(structural_data)
+    points = structural_data.points
+    coords = tables.get('coords')
+
+    if coords is None or len(coords) != len(points):
+        count = len(points)
+        coords = np.empty((count, 3), dtype=np.float32)
+        column = np.empty(count, dtype=np.float32)
+        for axis, attr in enumerate(('x', 'y', 'z')):
+            points.foreach_get(attr, column)
+            coords[:, axis] = column
+        tables['coords'] = coords
+
+    return coords
+
+def point_position(structural_data, name):
+    """(x, y, z) of the named point, or None"""
+    index = index_of(structural_data, 'points', name)
+    if index is None:
+        return None
+    point = structural_data.points[index]
+    return (point.x, point.y, point.z)
+
+# Integer node IDs
+def new_node_id(structural_data):
+    """Hand out the next unused node ID"""
+    node_id = structural_data.next_node_id
+    structural_data.next_node_id = node_id + 1
+    return node_id
+
+def node_lookup(structural_data):
+    """Cached array mapping node ID -> point index (-1 where the ID is not in use)"""
+    tables = _tables(structural_data)
+    points = structural_data.points
+    entry = tables.get('nodes')
+
+    if entry is None or entry[0] != len(points):
+        ids = np.empty(len(points), dtype=np.int32)
+        points.foreach_get('node_id', ids)
+        lookup = np.full(int(ids.max(initial=0)) + 1, -1, dtype=np.int64)
+        # Reversed so the first point with an ID wins
+        lookup[ids[::-1]] = np.arange(len(ids) - 1, -1, -1)
+        lookup[0] = -1
+        entry = (len(points), lookup)
+        tables['nodes'] = entry
+
+    return entry[1]
+
+def node_indices(structural_data, node_ids):
+    """Point indices for an array of node IDs (-1 for unknown IDs)"""
+    lookup = node_lookup(structural_data)
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    known = (node_ids > 0) & (node_ids < len(lookup))
+    return np.where(known, lookup[np.where(known, node_ids, 0)], -1)
+
+def node_index(structural_data, node_id):
+    """Point index for one node ID, or None"""
+    lookup = node_lookup(structural_data)
+    if 0 < node_id < len(lookup) and lookup[node_id] >= 0:
+        return int(lookup[node_id])
+    return None
+
+def node_id_of(structural_data, name):
+    """Node ID of the named point, or 0 if there is no such point"""
+    index = index_of(structural_data, 'points', name)
+    if index is None:
+        return 0
+    return structural_data.points[index].node_id
+
+def assign_node_ids(structural_data):
+    """Give every point without a unique node ID a new one
+
+    Used to migrate models saved before node IDs existed.
+    """
+    points = structural_data.points
+    ids = np.empty(len(points), dtype=np.int32)
+    points.foreach_get('node_id', ids)
+
+    _unique, first = np.unique(ids, return_index=True)
+    needs_id = np.ones(len(ids), dtype=bool)
+    needs_id[first] = False
+    needs_id |= ids <= 0
+    if not needs_id.any():
+        return 0
+
+    start = max(structural_data.next_node_id, int(ids.max(initial=0)) + 1)
+    count = int(needs_id.sum())
+    ids[needs_id] = np.arange(start, start + count, dtype=np.int32)
+    points.foreach_set('node_id', ids)
+    structural_data.next_node_id = start + count
+    invalidate(structural_data, 'points')
+    return count
+
+def resolve_beam_nodes(structural_data):
+    """Fill in beam start_node/end_node from the point names where they do not resolve
+
+    Returns the number of beam ends that still refer to no point.
+    """
+    beams = structural_data.beams
+    unresolved = 0
+    for attr, name_attr in (('start_node', 'start_point'), ('end_node', 'end_point')):
+        ids = np.empty(len(beams), dtype=np.int32)
+        beams.foreach_get(attr, ids)
+        for b in np.flatnonzero(node_indices(structural_data, ids) < 0):
+            beam = beams[int(b)]
+            node_id = node_id_of(structural_data, getattr(beam, name_attr))
+            setattr(beam, attr, node_id)
+            unresolved += node_id == 0
+    return unresolved
+
+# Shell connectivity
+def split_point_list(text):
+    """Point names from a shell's comma separated point_list"""
+    return [name.strip() for name in text.split(",") if name.strip()]
+
+def set_shell_nodes(structural_data, shell):
+    """Resolve shell.point_list into the shell's node ID list (0 for unknown names)"""
+    names = split_point_list(shell.point_list)
+    nodes = shell.nodes
+    if len(nodes) != len(names):
+        nodes.clear()
+        for _name in names:
+            nodes.add()
+    node_ids = np.array([node_id_of(structural_data, name) for name in names], dtype=np.int32)
+    nodes.foreach_set('node_id', node_ids)
+    invalidate_derived(structural_data)
+
+def _build_shell_connectivity(structural_data):
+    shells = structural_data.shells
+    counts = np.fromiter((len(shell.nodes) for shell in shells), dtype=np.int64, count=len(shells))
+    offsets = np.zeros(len(shells) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    node_ids = np.empty(offsets[-1], dtype=np.int32)
+    for h, shell in enumerate(shells):
+        if counts[h]:
+            shell.nodes.foreach_get('node_id', node_ids[offsets[h]:offsets[h + 1]])
+    return offsets, node_ids
+
+def shell_connectivity(structural_data):
+    """Cached CSR arrays (offsets, node_ids) over all shells
+
+    Shell h uses node_ids[offsets[h]:offsets[h + 1]]. Treat as read-only.
+    """
+    return cached(structural_data, 'shell_connectivity', _build_shell_connectivity)
+
+def shell_point_indices(structural_data):
+    """CSR (offsets, point indices) over all shells - -1 where a node is unresolved"""
+    offsets, node_ids = shell_connectivity(structural_data)
+    return offsets, node_indices(structural_data, node_ids)
+
+def shells_using(structural_data, positions):
+    """Shell indices owning the given positions of the CSR node array"""
+    offsets, _node_ids = shell_connectivity(structural_data)
+    return np.unique(np.searchsorted(offsets, positions, side='right') - 1)
+
+def resolve_shell_nodes(structural_data):
+    """Re-resolve shells whose node list is missing or refers to unknown nodes
+
+    Also migrates shells saved before node lists existed. Returns the number
+    of shells that were re-resolved.
+    """
+    offsets, indices = shell_point_indices(structural_data)
+    counts = np.diff(offsets)
+    stale = np.zeros(len(counts), dtype=bool)
+    stale[shells_using(structural_data, np.flatnonzero(indices < 0))] = True
+    stale |= counts == 0
+
+    shells = structural_data.shells
+    resolved = 0
+    for h in np.flatnonzero(stale):
+        shell = shells[int(h)]
+        if shell.point_list.strip():
+            set_shell_nodes(structural_data, shell)
+            resolved += 1
+    return resolved
+
+# Node -> element incidence
+def _csr_by_point(point_count, point_indices, element_indices):
+    """CSR (offsets, elements) listing the elements at each point"""
+    keep = point_indices >= 0
+    point_indices = point_indices[keep]
+    element_indices = element_indices[keep]
+    order = np.argsort(point_indices, kind='stable')
+    offsets = np.zeros(point_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(point_indices, minlength=point_count), out=offsets[1:])
+    return offsets, element_indices[order]
+
+def _build_incidence(structural_data):
+    point_count = len(structural_data.points)
+    beams = structural_data.beams
+
+    ends = np.empty((2, len(beams)), dtype=np.int32)
+    beams.foreach_get('start_node', ends[0])
+    beams.foreach_get('end_node', ends[1])
+    ends = node_indices(structural_data, ends)
+    beam_ids = np.broadcast_to(np.arange(len(beams)), ends.shape)
+    # A beam from a point to itself is listed once
+    ends[1][ends[1] == ends[0]] = -1
+
+    offsets, shell_points = shell_point_indices(structural_data)
+    shell_ids = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    pairs = np.unique(np.stack([shell_points, shell_ids]), axis=1) if len(shell_ids) else np.empty((2, 0), dtype=np.int64)
+
+    return {
+        'beams': _csr_by_point(point_count, ends.ravel(), beam_ids.ravel()),
+        'shells': _csr_by_point(point_count, pairs[0], pairs[1]),
+    }
+
+def incidence(structural_data):
+    """Cached point -> element incidence
+
+    Returns {'beams': (offsets, beam_indices), 'shells': (offsets, shell_indices)};
+    the elements at point i are indices[offsets[i]:offsets[i + 1]]. Only
+    resolved references are listed. Treat as read-only.
+    """
+    return cached(structural_data, 'incidence', _build_incidence)
+
+def elements_at(structural_data, kind, point_indices):
+    """Sorted unique beam or shell indices attached to any of the given points"""
+    offsets, elements = incidence(structural_data)[kind]
+    point_indices = np.atleast_1d(np.asarray(point_indices, dtype=np.int64))
+    point_indices = point_indices[(point_indices >= 0) & (point_indices < len(offsets) - 1)]
+    if not len(point_indices):
+        return np.empty(0, dtype=np.int64)
+    starts = offsets[point_indices]
+    counts = offsets[point_indices + 1] - starts
+    # Gather every [start, start + count) range in one go
+    positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return np.unique(elements[positions])
+
+# Section -> beams
+def _build_section_beams(structural_data):
+    beams_by_section = {}
+    for b, beam in enumerate(structural_data.beams):
+        beams_by_section.setdefault(beam.section_name, []).append(b)
+    return {name: np.array(indices, dtype=np.int64) for name, indices in beams_by_section.items()}
+
+def beams_with_sections(structural_data, section_names):
+    """Sorted beam indices using any of the named sections, from a cached section -> beams index"""
+    beams_by_section = cached(structural_data, 'section_beams', _build_section_beams)
+    found = [beams_by_section[name] for name in section_names if name in beams_by_section]
+    if not found:
+        return np.empty(0, dtype=np.int64)
+    return np.unique(np.concatenate(found))
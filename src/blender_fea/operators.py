@@ -6,15 +6,23 @@ Operators for Structural Model
 # from sys import path as sys_path
 import random
 import math
+import numpy as np
 from mathutils import Vector
 import bpy
 from bpy.types import Operator, UIList
 from bpy.props import StringProperty
 from . import utils
+from . import coloring
+from . import model_index
+from . import importer
+from . import json_stream
+from . import binary_format
+from . import model
+from . import validation
 from . import bl_info  # type: ignore # 
 # from blender_fea import bl_info # does not work
-import json
 import os
+import time
 import logging
 log = logging.getLogger(__name__) # logging added as example
 
@@ -32,20 +40,25 @@ class STRUCTURAL_OT_organize_collections(Operator):
         
         # Move points
         for point in structural_data.points:
-            if point.name in bpy.data.objects:
-                obj = bpy.data.objects[point.name]
+            obj = utils.get_element_object(point)
+            if obj is not None:
                 utils.move_to_structural_collection(obj)
         
+        for name in (utils.POINT_CLOUD_NAME, utils.POINT_MARKER_NAME, utils.BEAM_MESH_NAME, utils.BEAM_EDGES_NAME,
+                     utils.SHELL_MESH_NAME):
+            if name in bpy.data.objects:
+                utils.move_to_structural_collection(bpy.data.objects[name])
+        
         # Move beams
         for beam in structural_data.beams:
-            if beam.name in bpy.data.objects:
-                obj = bpy.data.objects[beam.name]
+            obj = utils.get_element_object(beam)
+            if obj is not None:
                 utils.move_to_structural_collection(obj)
         
         # Move shells
         for shell in structural_data.shells:
-            if shell.name in bpy.data.objects:
-                obj = bpy.data.objects[shell.name]
+            obj = utils.get_element_object(shell)
+            if obj is not None:
                 utils.move_to_structural_collection(obj)
         
         self.report({'INFO'}, "All structural objects organized into collections")
@@ -68,6 +81,7 @@ class STRUCTURAL_OT_add_section(Operator):
         section.height = 0.15
         section.sides = 6
         section.poly_diameter = 0.1
+        model_index.invalidate(structural_data, 'sections')
         
         self.report({'INFO'}, f"Added section: {section.name}")
         return {'FINISHED'}
@@ -93,6 +107,7 @@ class STRUCTURAL_OT_delete_section(Operator):
                 return {'CANCELLED'}
             
             structural_data.sections.remove(structural_data.active_section_index)
+            model_index.invalidate(structural_data, 'sections')
             
             if structural_data.active_section_index >= len(structural_data.sections):
                 structural_data.active_section_index = len(structural_data.sections) - 1
@@ -112,15 +127,11 @@ class STRUCTURAL_OT_add_point(Operator):
         point.x = 0.0
         point.y = 0.0
         point.z = 0.0
+        point.node_id = model_index.new_node_id(structural_data)
+        model_index.invalidate(structural_data, 'points')
         
         # Create visual representation
-        with bpy.context.temp_override(**bpy.context.copy()):  # type: ignore
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.1, location=(point.x, point.y, point.z))
-        sphere = context.active_object
-        sphere.name = point.name  # type: ignore
-        
-        # Move to Structural Model collection
-        utils.move_to_structural_collection(sphere)
+        utils.create_point_visual(point, structural_data)
 
         self.report({'INFO'}, f"Added point: {point.name}")
         return {'FINISHED'}
@@ -129,19 +140,35 @@ class STRUCTURAL_OT_delete_point(Operator):
     bl_idname = "structural.delete_point"
     bl_label = "Delete Selected Point"
     
+    cascade: bpy.props.BoolProperty(  # type: ignore
+        name="Delete Attached Members",
+        description="Also delete the beams and shells that use this point",
+        default=True
+    )
+    
     def execute(self, context):
         structural_data = context.scene.structural_data # type: ignore
         
         if structural_data.points and structural_data.active_point_index >= 0:
             point = structural_data.points[structural_data.active_point_index]
             
+            # Members attached to the point, straight from the incidence index
+            if self.cascade:
+                beam_indices = model_index.elements_at(structural_data, 'beams', structural_data.active_point_index)
+                shell_indices = model_index.elements_at(structural_data, 'shells', structural_data.active_point_index)
+                utils.remove_members(structural_data, beam_indices, shell_indices)
+                if len(beam_indices) or len(shell_indices):
+                    self.report({'INFO'}, f"Deleted {len(beam_indices)} beams and {len(shell_indices)} shells attached to {point.name}")
+            
             # Remove visual object
-            if point.name in bpy.data.objects:
-                obj = bpy.data.objects[point.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
+            utils.remove_element_object(point)
             
             # Remove from collection
             structural_data.points.remove(structural_data.active_point_index)
+            model_index.invalidate(structural_data, 'points')
+            
+            if structural_data.point_display_mode == 'INSTANCED':
+                utils.sync_point_cloud(structural_data)
             
             # Adjust active index
             if structural_data.active_point_index >= len(structural_data.points):
@@ -157,12 +184,19 @@ class STRUCTURAL_OT_update_point_position(Operator):
         structural_data = context.scene.structural_data # type: ignore
         
         if structural_data.points and structural_data.active_point_index >= 0:
-            point = structural_data.points[structural_data.active_point_index]
+            if structural_data.point_display_mode == 'INSTANCED':
+                utils.update_point_vertex(structural_data.active_point_index, structural_data)
             
             # Update visual object position
-            if point.name in bpy.data.objects:
-                obj = bpy.data.objects[point.name]
-                obj.location = (point.x, point.y, point.z)
+            else:
+                utils.update_point_visuals(structural_data, [structural_data.active_point_index])
+            
+            # Only the members attached to this point need new geometry
+            utils.rebuild_members(
+                structural_data,
+                model_index.elements_at(structural_data, 'beams', structural_data.active_point_index),
+                model_index.elements_at(structural_data, 'shells', structural_data.active_point_index),
+            )
         
         return {'FINISHED'}
 
@@ -181,9 +215,13 @@ class STRUCTURAL_OT_add_beam(Operator):
         beam.name = f"Beam_{len(structural_data.beams)}"
         beam.start_point = structural_data.points[0].name
         beam.end_point = structural_data.points[1].name
+        model_index.invalidate(structural_data, 'beams')
         
         # Create the beam geometry
-        utils.create_beam_from_data(beam, structural_data)
+        if structural_data.beam_display_mode in utils.SHARED_BEAM_MODES:
+            utils.build_beam_visuals(structural_data)
+        else:
+            utils.create_beam_from_data(beam, structural_data)
         
         self.report({'INFO'}, f"Added beam: {beam.name}")
         return {'FINISHED'}
@@ -196,14 +234,8 @@ class STRUCTURAL_OT_delete_beam(Operator):
         structural_data = context.scene.structural_data # type: ignore
         
         if structural_data.beams and structural_data.active_beam_index >= 0:
-            beam = structural_data.beams[structural_data.active_beam_index]
-            
-            # Remove visual object
-            if beam.name in bpy.data.objects:
-                obj = bpy.data.objects[beam.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
-            
-            structural_data.beams.remove(structural_data.active_beam_index)
+            # Removes its object, or its faces from the merged beam mesh
+            utils.remove_members(structural_data, beam_indices=[structural_data.active_beam_index])
             
             if structural_data.active_beam_index >= len(structural_data.beams):
                 structural_data.active_beam_index = len(structural_data.beams) - 1
@@ -220,10 +252,12 @@ class STRUCTURAL_OT_update_beam(Operator):
         if structural_data.beams and structural_data.active_beam_index >= 0:
             beam = structural_data.beams[structural_data.active_beam_index]
             
+            if structural_data.beam_display_mode in utils.SHARED_BEAM_MODES:
+                utils.build_beam_visuals(structural_data)
+                return {'FINISHED'}
+            
             # Remove old beam and create new one
-            if beam.name in bpy.data.objects:
-                obj = bpy.data.objects[beam.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
+            utils.remove_element_object(beam)
             
             utils.create_beam_from_data(beam, structural_data)
         
@@ -234,6 +268,12 @@ class STRUCTURAL_OT_color_beams_by_section_name(bpy.types.Operator):
     bl_label = "Color Beams by Section Name"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         beams_colored = 0
@@ -243,8 +283,8 @@ class STRUCTURAL_OT_color_beams_by_section_name(bpy.types.Operator):
             if not beam_data.section_name or beam_data.section_name == "":
                 continue  # Skip beams without section assignment
                 
-            if beam_data.name in bpy.data.objects:
-                beam_obj = bpy.data.objects[beam_data.name]
+            beam_obj = utils.get_element_object(beam_data)
+            if beam_obj is not None:
                 
                 # Create or get material for this specific section name
                 if beam_data.section_name not in section_materials:
@@ -304,11 +344,44 @@ class STRUCTURAL_OT_color_beams_by_section_name(bpy.types.Operator):
         
         return (r, g, b, 1.0)
 
+class STRUCTURAL_OT_color_beams_by_section_fast(Operator):
+    bl_idname = "structural.color_beams_by_section_fast"
+    bl_label = "Color Beams by Section (Fast)"
+    bl_description = ("Color beams by section name through object colors or a mesh attribute "
+                      "shown in Solid shading - creates no materials")
+    
+    def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
+        structural_data = context.scene.structural_data  # type: ignore
+        
+        if structural_data.beam_display_mode == 'GEOMETRY_NODES':
+            self.report({'WARNING'}, "Geometry Nodes beams cannot be colored one by one - use Objects or Merged display")
+            return {'CANCELLED'}
+        
+        colors = coloring.section_colors(structural_data)
+        beams_colored, color_type = coloring.color_beams_solid(structural_data, colors)
+        coloring.show_solid_colors(context, color_type)
+        
+        sections = len({beam.section_name for beam in structural_data.beams})
+        self.report({'INFO'}, f"Colored {beams_colored} beams ({sections} different sections)")
+        return {'FINISHED'}
+
 class STRUCTURAL_OT_color_beams_by_section_palette(bpy.types.Operator):
     bl_idname = "structural.color_beams_by_section_palette"
     bl_label = "Color Beams by Section (Palette)"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         # Define a nice color palette
@@ -331,8 +404,8 @@ class STRUCTURAL_OT_color_beams_by_section_palette(bpy.types.Operator):
             if not beam_data.section_name or beam_data.section_name == "":
                 continue
                 
-            if beam_data.name in bpy.data.objects:
-                beam_obj = bpy.data.objects[beam_data.name]
+            beam_obj = utils.get_element_object(beam_data)
+            if beam_obj is not None:
                 
                 # Assign color based on section name
                 if beam_data.section_name not in section_colors:
@@ -368,14 +441,20 @@ class STRUCTURAL_OT_color_all_beams_with_sections(bpy.types.Operator):
     bl_label = "Color All Beams (Include Unassigned)"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         beams_colored = 0
         section_materials = {}
         
         for beam_data in structural_data.beams:
-            if beam_data.name in bpy.data.objects:
-                beam_obj = bpy.data.objects[beam_data.name]
+            beam_obj = utils.get_element_object(beam_data)
+            if beam_obj is not None:
                 
                 # Determine section name (use "Unassigned" if none)
                 section_name = beam_data.section_name if beam_data.section_name else "Unassigned"
@@ -436,6 +515,12 @@ class STRUCTURAL_OT_color_beams_emission(bpy.types.Operator):
     )
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         beams_colored = 0
@@ -445,8 +530,8 @@ class STRUCTURAL_OT_color_beams_emission(bpy.types.Operator):
             if not beam_data.section_name:
                 continue
                 
-            if beam_data.name in bpy.data.objects:
-                beam_obj = bpy.data.objects[beam_data.name]
+            beam_obj = utils.get_element_object(beam_data)
+            if beam_obj is not None:
                 
                 if beam_data.section_name not in section_materials:
                     section_materials[beam_data.section_name] = self.create_emission_material(
@@ -523,8 +608,9 @@ class STRUCTURAL_OT_add_shell(Operator):
         # Use first 3 points by default
         point_names = [p.name for p in structural_data.points[:3]]
         shell.point_list = ",".join(point_names)
+        model_index.invalidate(structural_data, 'shells')
         
-        utils.create_shell_from_data(shell, structural_data)
+        utils.update_shell_visual(shell, structural_data)
         
         self.report({'INFO'}, f"Added shell: {shell.name}")
         return {'FINISHED'}
@@ -537,13 +623,8 @@ class STRUCTURAL_OT_delete_shell(Operator):
         structural_data = context.scene.structural_data # type: ignore
         
         if structural_data.shells and structural_data.active_shell_index >= 0:
-            shell = structural_data.shells[structural_data.active_shell_index]
-            
-            if shell.name in bpy.data.objects:
-                obj = bpy.data.objects[shell.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
-            
-            structural_data.shells.remove(structural_data.active_shell_index)
+            # Removes its object, or its faces from the merged shell mesh
+            utils.remove_members(structural_data, shell_indices=[structural_data.active_shell_index])
             
             if structural_data.active_shell_index >= len(structural_data.shells):
                 structural_data.active_shell_index = len(structural_data.shells) - 1
@@ -559,12 +640,7 @@ class STRUCTURAL_OT_update_shell(Operator):
         
         if structural_data.shells and structural_data.active_shell_index >= 0:
             shell = structural_data.shells[structural_data.active_shell_index]
-            
-            if shell.name in bpy.data.objects:
-                obj = bpy.data.objects[shell.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
-            
-            utils.create_shell_from_data(shell, structural_data)
+            utils.update_shell_visual(shell, structural_data)
         
         return {'FINISHED'}
 
@@ -617,141 +693,42 @@ class STRUCTURAL_OT_color_shells_by_thickness(Operator):
     )
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         if not structural_data.shells:
             self.report({'WARNING'}, "No shells found to color")
             return {'CANCELLED'}
         
-        # Find thickness range (only positive thicknesses)
-        thicknesses = [shell.thickness for shell in structural_data.shells if shell.thickness > 0]
-        
-        shells_colored = 0
-        shells_with_zero = 0
-        shells_with_positive = 0
-        
-        if not thicknesses:
-            # All shells have zero or negative thickness
+        thickness = np.empty(len(structural_data.shells), dtype=np.float64)
+        structural_data.shells.foreach_get('thickness', thickness)
+        positive = thickness > 0
+        if not positive.any():
             self.report({'WARNING'}, "No shells with positive thickness found - using zero thickness color")
-            
-            for shell_data in structural_data.shells:
-                if shell_data.name in bpy.data.objects:
-                    shell_obj = bpy.data.objects[shell_data.name]
-                    material = self.create_thickness_material(
-                        shell_data, self.color_zero, self.use_emission, self.emission_strength
-                    )
-                    shell_obj.data.materials.clear()
-                    shell_obj.data.materials.append(material)
-                    shells_colored += 1
-                    shells_with_zero += 1
-            
-            self.report({'INFO'}, f"Colored {shells_colored} shells with zero thickness color")
-            return {'FINISHED'}
-        
-        # We have some positive thicknesses
-        min_thickness = min(thicknesses)
-        max_thickness = max(thicknesses)
-        thickness_range = max_thickness - min_thickness
+        else:
+            self.report({'INFO'}, f"Thickness range: {thickness[positive].min():.3f} to {thickness[positive].max():.3f}")
         
-        self.report({'INFO'}, f"Thickness range: {min_thickness:.3f} to {max_thickness:.3f}")
+        # One shared material; the colours go into Object.color or the merged mesh's fea_color
+        colors = coloring.ramp_colors(thickness, self.color_min, self.color_max, self.color_zero)
+        material = coloring.ensure_attribute_material(self.emission_strength if self.use_emission else 0.0)
+        shells_colored = coloring.color_shells(structural_data, colors, material)
+        coloring.show_material_preview(context)
         
-        for shell_data in structural_data.shells:
-            if shell_data.name in bpy.data.objects:
-                shell_obj = bpy.data.objects[shell_data.name]
-                
-                if shell_data.thickness <= 0:
-                    # Zero or negative thickness - use special color
-                    color = self.color_zero
-                    shells_with_zero += 1
-                else:
-                    # Positive thickness - calculate gradient color
-                    if thickness_range > 0:
-                        normalized_thickness = (shell_data.thickness - min_thickness) / thickness_range
-                    else:
-                        # All positive thicknesses are the same
-                        normalized_thickness = 0.5
-                    
-                    color = self.interpolate_color(self.color_min, self.color_max, normalized_thickness)
-                    shells_with_positive += 1
-                
-                # Create or get material
-                material = self.create_thickness_material(shell_data, color, self.use_emission, self.emission_strength)
-                
-                # Assign material to shell
-                shell_obj.data.materials.clear()
-                shell_obj.data.materials.append(material)
-                shells_colored += 1
-        
-        # Switch to material preview
-        for area in context.screen.areas:  # type: ignore
-            if area.type == 'VIEW_3D':
-                for space in area.spaces:
-                    if space.type == 'VIEW_3D':
-                        space.shading.type = 'MATERIAL'  # type: ignore
-        
-        # Detailed report
+        shells_with_zero = int((~positive).sum())
         report_msg = f"Colored {shells_colored} shells"
-        if shells_with_positive > 0:
-            report_msg += f" ({shells_with_positive} with thickness gradient)"
+        if positive.any():
+            report_msg += f" ({int(positive.sum())} with thickness gradient)"
         if shells_with_zero > 0:
             report_msg += f" ({shells_with_zero} with zero thickness)"
         
         self.report({'INFO'}, report_msg)
         return {'FINISHED'}
     
-    def interpolate_color(self, color_min, color_max, factor):
-        """Interpolate between two colors based on factor (0-1)"""
-        r = color_min[0] + (color_max[0] - color_min[0]) * factor
-        g = color_min[1] + (color_max[1] - color_min[1]) * factor
-        b = color_min[2] + (color_max[2] - color_min[2]) * factor
-        a = color_min[3]  # Keep alpha constant
-        
-        return (r, g, b, a)
-    
-    def create_thickness_material(self, shell_data, color, use_emission, emission_strength):
-        """Create material for shell with thickness-based color"""
-        mat_name = f"FEA_Shell_Thickness_{shell_data.name}"
-        
-        if mat_name in bpy.data.materials:
-            material = bpy.data.materials[mat_name]
-            # Update existing material color
-            if material.use_nodes:
-                if use_emission:
-                    emission = material.node_tree.nodes.get('Emission')  # type: ignore
-                    if emission:
-                        emission.inputs['Color'].default_value = color  # type: ignore
-                        emission.inputs['Strength'].default_value = emission_strength  # type: ignore
-                else:
-                    bsdf = material.node_tree.nodes.get('Principled BSDF')  # type: ignore
-                    if bsdf:
-                        bsdf.inputs['Base Color'].default_value = color  # type: ignore
-            return material
-        
-        # Create new material
-        material = bpy.data.materials.new(name=mat_name)
-        material.use_nodes = True
-        material.node_tree.nodes.clear()  # type: ignore
-        
-        if use_emission:
-            # Use emission shader for bright, clear colors
-            emission = material.node_tree.nodes.new(type='ShaderNodeEmission')  # type: ignore
-            output = material.node_tree.nodes.new(type='ShaderNodeOutputMaterial')  # type: ignore
-            material.node_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])  # type: ignore
-            
-            emission.inputs['Color'].default_value = color  # type: ignore
-            emission.inputs['Strength'].default_value = emission_strength  # type: ignore
-        else:
-            # Use principled BSDF for more natural look
-            bsdf = material.node_tree.nodes.new(type='ShaderNodeBsdfPrincipled')  # type: ignore
-            output = material.node_tree.nodes.new(type='ShaderNodeOutputMaterial')  # type: ignore
-            material.node_tree.links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])  # type: ignore
-            
-            bsdf.inputs['Base Color'].default_value = color  # type: ignore
-            bsdf.inputs['Metallic'].default_value = 0.0  # type: ignore
-            bsdf.inputs['Roughness'].default_value = 0.3  # type: ignore
-        
-        return material
-    
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self)  # type: ignore
 
@@ -759,116 +736,47 @@ class STRUCTURAL_OT_color_shells_thickness_simple(Operator):
     bl_idname = "structural.color_shells_thickness_simple"
     bl_label = "Color Shells by Thickness (Simple)"
     
+    # Color definitions
+    COLOR_ZERO = (0.7, 0.7, 0.7, 1.0)  # Gray for zero thickness
+    COLOR_MIN = (0.0, 0.3, 1.0, 1.0)   # Blue for min thickness
+    COLOR_MAX = (1.0, 0.0, 0.0, 1.0)   # Red for max thickness
+    
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         if not structural_data.shells:
             self.report({'WARNING'}, "No shells found")
             return {'CANCELLED'}
         
-        # Find thickness range (only positive)
-        thicknesses = [shell.thickness for shell in structural_data.shells if shell.thickness > 0]
-        
-        shells_colored = 0
-        shells_zero = 0
-        
-        # Color definitions
-        color_zero = (0.7, 0.7, 0.7, 1.0)  # Gray for zero thickness
-        color_min = (0.0, 0.3, 1.0, 1.0)   # Blue for min thickness
-        color_max = (1.0, 0.0, 0.0, 1.0)   # Red for max thickness
-        
-        if not thicknesses:
-            # Case 1: All shells have zero thickness
+        thickness = np.empty(len(structural_data.shells), dtype=np.float64)
+        structural_data.shells.foreach_get('thickness', thickness)
+        positive = thickness > 0
+        if not positive.any():
             self.report({'INFO'}, "All shells have zero thickness - coloring gray")
-            for shell_data in structural_data.shells:
-                if shell_data.name in bpy.data.objects:
-                    self.color_shell(shell_data, color_zero)
-                    shells_colored += 1
-                    shells_zero += 1
-        elif len(thicknesses) == 1:
-            # Case 2: Only one unique positive thickness
-            single_thickness = thicknesses[0]
-            self.report({'INFO'}, f"All positive thicknesses are {single_thickness:.3f} - using mid-color")
-            for shell_data in structural_data.shells:
-                if shell_data.name in bpy.data.objects:
-                    if shell_data.thickness <= 0:
-                        self.color_shell(shell_data, color_zero)
-                        shells_zero += 1
-                    else:
-                        # All same thickness - use middle of gradient
-                        mid_color = self.interpolate_color(color_min, color_max, 0.5)
-                        self.color_shell(shell_data, mid_color)
-                    shells_colored += 1
+        elif thickness[positive].min() == thickness[positive].max():
+            self.report({'INFO'}, f"All positive thicknesses are {thickness[positive][0]:.3f} - using mid-color")
         else:
-            # Case 3: Multiple different thicknesses
-            min_thickness = min(thicknesses)
-            max_thickness = max(thicknesses)
-            thickness_range = max_thickness - min_thickness
-            
-            self.report({'INFO'}, f"Thickness: {min_thickness:.3f} to {max_thickness:.3f}")
-            
-            for shell_data in structural_data.shells:
-                if shell_data.name in bpy.data.objects:
-                    if shell_data.thickness <= 0:
-                        self.color_shell(shell_data, color_zero)
-                        shells_zero += 1
-                    else:
-                        normalized = (shell_data.thickness - min_thickness) / thickness_range
-                        color = self.interpolate_color(color_min, color_max, normalized)
-                        self.color_shell(shell_data, color)
-                    shells_colored += 1
+            self.report({'INFO'}, f"Thickness: {thickness[positive].min():.3f} to {thickness[positive].max():.3f}")
         
-        # Update viewport
-        for area in context.screen.areas:     # type: ignore
-            if area.type == 'VIEW_3D':
-                for space in area.spaces:
-                    if space.type == 'VIEW_3D':
-                        space.shading.type = 'MATERIAL'     # type: ignore
+        colors = coloring.ramp_colors(thickness, self.COLOR_MIN, self.COLOR_MAX, self.COLOR_ZERO)
+        material = coloring.ensure_attribute_material(emission_strength=1.5)
+        shells_colored = coloring.color_shells(structural_data, colors, material)
+        coloring.show_material_preview(context)
         
         # Detailed report
+        shells_zero = int((~positive).sum())
         if shells_zero > 0:
             self.report({'INFO'}, f"Colored {shells_colored} shells ({shells_zero} with zero thickness)")
         else:
             self.report({'INFO'}, f"Colored {shells_colored} shells")
         
         return {'FINISHED'}
-    
-    def color_shell(self, shell_data, color):
-        """Apply color to a single shell"""
-        shell_obj = bpy.data.objects[shell_data.name]
-        mat_name = f"FEA_Shell_{shell_data.name}"
-        
-        if mat_name in bpy.data.materials:
-            material = bpy.data.materials[mat_name]
-            # Update color
-            if material.use_nodes:
-                emission = material.node_tree.nodes.get('Emission')     # type: ignore
-                if emission:
-                    emission.inputs['Color'].default_value = color     # type: ignore
-            return material
-        
-        material = bpy.data.materials.new(name=mat_name)
-        material.use_nodes = True
-        material.node_tree.nodes.clear()     # type: ignore
-        
-        # Use emission for bright colors
-        emission = material.node_tree.nodes.new(type='ShaderNodeEmission')     # type: ignore
-        output = material.node_tree.nodes.new(type='ShaderNodeOutputMaterial')     # type: ignore
-        material.node_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])     # type: ignore
-        
-        emission.inputs['Color'].default_value = color     # type: ignore
-        emission.inputs['Strength'].default_value = 1.5     # type: ignore
-        
-        shell_obj.data.materials.clear()
-        shell_obj.data.materials.append(material)
-        
-        return material
-    
-    def interpolate_color(self, color_a, color_b, factor):
-        r = color_a[0] + (color_b[0] - color_a[0]) * factor
-        g = color_a[1] + (color_b[1] - color_a[1]) * factor
-        b = color_a[2] + (color_b[2] - color_a[2]) * factor
-        return (r, g, b, 1.0)
 
 class STRUCTURAL_OT_show_thickness_info(bpy.types.Operator):
     bl_idname = "structural.show_thickness_info"
@@ -910,28 +818,26 @@ class STRUCTURAL_OT_clear_all(Operator):
     bl_description = "Remove all structural elements and data"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data # type: ignore
         
         # Remove all objects created by this addon
-        for point in structural_data.points:
-            if point.name in bpy.data.objects:
-                obj = bpy.data.objects[point.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
+        utils.remove_point_visuals(structural_data)
         
-        for beam in structural_data.beams:
-            if beam.name in bpy.data.objects:
-                obj = bpy.data.objects[beam.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
+        utils.remove_beam_visuals(structural_data)
         
-        for shell in structural_data.shells:
-            if shell.name in bpy.data.objects:
-                obj = bpy.data.objects[shell.name]
-                bpy.data.objects.remove(obj, do_unlink=True)
+        utils.remove_shell_visuals(structural_data)
         
         # Clear all collections
         structural_data.points.clear()
         structural_data.beams.clear()
         structural_data.shells.clear()
+        model_index.invalidate(structural_data)
         
         structural_data.active_point_index = 0
         structural_data.active_beam_index = 0
@@ -940,6 +846,40 @@ class STRUCTURAL_OT_clear_all(Operator):
         self.report({'INFO'}, "Cleared all structural data")
         return {'FINISHED'}
 
+def report_elapsed(operator, timer, result):
+    """Report how long a finished operator's bulk_edit section took"""
+    if 'FINISHED' in result:
+        operator.report({'INFO'}, f"{timer.label} took {timer.elapsed:.2f}s")
+
+def report_validation(operator, structural_data):
+    """Validate the whole model, log every finding and report a one-line summary"""
+    diagnostics = model.get_model(structural_data).validate()
+    for line in validation.summary(diagnostics):
+        log.warning(line)
+    
+    if diagnostics:
+        errors = sum(len(d.indices) for d in diagnostics if d.severity == validation.ERROR)
+        warnings = sum(len(d.indices) for d in diagnostics if d.severity == validation.WARNING)
+        operator.report({'WARNING'}, f"Model check: {errors} errors, {warnings} warnings (details in the console)")
+    return diagnostics
+
+class STRUCTURAL_OT_validate_model(Operator):
+    bl_idname = "structural.validate_model"
+    bl_label = "Check Model"
+    bl_description = "Check the model for dangling references, zero-length beams, degenerate shells, duplicate names and unused sections"
+    
+    def execute(self, context):
+        structural_data = context.scene.structural_data # type: ignore
+        diagnostics = model.get_model(structural_data).validate()
+        
+        if not diagnostics:
+            self.report({'INFO'}, "Model check: no problems found")
+            return {'FINISHED'}
+        
+        for diagnostic, line in zip(diagnostics, validation.summary(diagnostics)):
+            self.report({diagnostic.severity}, line)
+        return {'FINISHED'}
+
 class STRUCTURAL_OT_import_json(Operator):
     bl_idname = "structural.import_json"
     bl_label = "Import Structural JSON"
@@ -953,10 +893,43 @@ class STRUCTURAL_OT_import_json(Operator):
     )
     
     filter_glob: StringProperty( # type: ignore
-        default='*.json', options={'HIDDEN'}
+        default='*.json;*.json.gz;*.json.xz', options={'HIDDEN'}
         )
     
+    chunk_size: bpy.props.IntProperty(  # type: ignore
+        name="Chunk Size",
+        description="Number of elements committed at a time while streaming the file",
+        default=importer.DEFAULT_CHUNK_SIZE,
+        min=100,
+        max=1000000
+    )
+    
+    import_mode: bpy.props.EnumProperty(  # type: ignore
+        name="Mode",
+        description="How the file is combined with the current model",
+        items=[
+            ('REPLACE', "Replace", "Clear the current model and import the file"),
+            ('MERGE', "Merge", "Only add, update or remove elements that differ from the file")
+        ],
+        default='REPLACE'
+    )
+    
+    merge_tolerance: bpy.props.FloatProperty(  # type: ignore
+        name="Merge Distance",
+        description="Merge points closer together than this after importing (0 to keep every point)",
+        default=0.0,
+        min=0.0,
+        precision=6,
+        subtype='DISTANCE'
+    )
+    
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data # type: ignore
         
         try:
@@ -966,68 +939,28 @@ class STRUCTURAL_OT_import_json(Operator):
                 self.report({'ERROR'}, f"File not found: {self.filepath}")
                 return {'CANCELLED'}
             
-            with open(self.filepath, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            if self.import_mode == 'MERGE':
+                changes = importer.merge_file(self.filepath, structural_data)
+                summary = ", ".join(
+                    f"{kind}: +{len(c['added'])} ~{len(c['updated'])} -{len(c['removed'])}"
+                    for kind, c in changes.items()
+                )
+                self.report({'INFO'}, f"Merged {os.path.basename(self.filepath)} ({summary})")
+                report_validation(self, structural_data)
+                return {'FINISHED'}
             
-            # Clear existing data
+            # Clear existing data - the file brings its own sections
             bpy.ops.structural.clear_all() # type: ignore
+            structural_data.sections.clear()
+            model_index.invalidate(structural_data)
             
-            # Import points
-            if 'points' in data.get('structural_data', {}):
-                for point_name, coords in data['structural_data']['points'].items():
-                    point = structural_data.points.add()
-                    point.name = point_name
-                    point.x, point.y, point.z = coords
-                    # Create visual representation
-                    with bpy.context.temp_override(**bpy.context.copy()): # type: ignore
-                        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.1, location=(point.x, point.y, point.z))
-                    sphere = context.active_object
-                    sphere.name = point_name  # type: ignore
-                    utils.move_to_structural_collection(sphere)
-            
-            # Import sections (BEFORE beams)
-            if 'sections' in data.get('structural_data', {}):
-                for section_name, section_data in data['structural_data']['sections'].items():
-                    section = structural_data.sections.add()
-                    section.name = section_name
-                    section.section_type = section_data.get('type', 'CIRCULAR')
-                    
-                    if section.section_type == 'CIRCULAR':
-                        section.diameter = section_data.get('diameter', 0.1)
-                    elif section.section_type == 'RECTANGULAR':
-                        section.width = section_data.get('width', 0.1)
-                        section.height = section_data.get('height', 0.15)
-                    elif section.section_type == 'POLYGONAL':
-                        section.poly_diameter = section_data.get('diameter', 0.1)
-                        section.sides = section_data.get('sides', 6)
+            # Load the file as a model, then commit it in fixed-size chunks and build all geometry in one go
+            counts = importer.import_model(model.StructuralModel.load(self.filepath), structural_data,
+                                           self.chunk_size, merge_tolerance=self.merge_tolerance)
             
-            # Import beams (AFTER sections)
-            if 'beams' in data.get('structural_data', {}):
-                for beam_name, beam_data in data['structural_data']['beams'].items():
-                    if isinstance(beam_data, dict) and 'start_point' in beam_data and 'end_point' in beam_data:
-                        beam = structural_data.beams.add()
-                        beam.name = beam_name
-                        beam.start_point = beam_data['start_point']
-                        beam.end_point = beam_data['end_point']
-                        
-                        if 'section' in beam_data:
-                            beam.section_name = beam_data['section']
-                        else:
-                            beam.diameter = beam_data.get('diameter', 0.1)
-                        
-                        utils.create_beam_from_data(beam, structural_data)
-            
-            # Import shells
-            if 'shells' in data.get('structural_data', {}):
-                for shell_name, shell_data in data['structural_data']['shells'].items():
-                    if isinstance(shell_data, dict) and 'points' in shell_data:
-                        shell = structural_data.shells.add()
-                        shell.name = shell_name
-                        shell.point_list = ",".join(shell_data['points'])
-                        shell.thickness = shell_data.get('thickness', 0.05)
-                        utils.create_shell_from_data(shell, structural_data)
-            
-            self.report({'INFO'}, f"Successfully imported {os.path.basename(self.filepath)}")
+            self.report({'INFO'}, f"Successfully imported {os.path.basename(self.filepath)} "
+                        f"({counts['points']} points, {counts['beams']} beams, {counts['shells']} shells)")
+            report_validation(self, structural_data)
             return {'FINISHED'}
             
         except Exception as e:
@@ -1040,6 +973,237 @@ class STRUCTURAL_OT_import_json(Operator):
         context.window_manager.fileselect_add(self) # type: ignore
         return {'RUNNING_MODAL'}
 
+class STRUCTURAL_OT_import_json_modal(Operator):
+    bl_idname = "structural.import_json_modal"
+    bl_label = "Import Structural JSON (Background)"
+    bl_description = "Import a large structural JSON file a chunk at a time with progress (Esc to cancel)"
+    
+    filepath: StringProperty( # type: ignore
+        name="File Path",
+        description="Filepath used for importing the file",
+        maxlen=1024, 
+        subtype='FILE_PATH'
+    )
+    
+    filter_glob: StringProperty( # type: ignore
+        default='*.json;*.json.gz;*.json.xz', options={'HIDDEN'}
+        )
+    
+    chunk_size: bpy.props.IntProperty(  # type: ignore
+        name="Chunk Size",
+        description="Number of elements committed per step",
+        default=1000,
+        min=10,
+        max=1000000
+    )
+    
+    time_budget: bpy.props.FloatProperty(  # type: ignore
+        name="Time Budget",
+        description="Seconds of import work per timer tick before handing control back to the UI",
+        default=0.1,
+        min=0.01,
+        max=2.0,
+        subtype='TIME',
+        unit='TIME'
+    )
+    
+    merge_tolerance: bpy.props.FloatProperty(  # type: ignore
+        name="Merge Distance",
+        description="Merge points closer together than this after importing (0 to keep every point)",
+        default=0.0,
+        min=0.0,
+        precision=6,
+        subtype='DISTANCE'
+    )
+    
+    def execute(self, context):
+        structural_data = context.scene.structural_data # type: ignore
+        
+        if not os.path.exists(self.filepath):
+            self.report({'ERROR'}, f"File not found: {self.filepath}")
+            return {'CANCELLED'}
+        
+        # Headless (-b) runs have no event loop - drive the import to completion here
+        if bpy.app.background or context.window is None:
+            with utils.bulk_edit(context, self.bl_label) as timer:
+                bpy.ops.structural.clear_all() # type: ignore
+                structural_data.sections.clear()
+                counts = importer.import_file(self.filepath, structural_data, self.chunk_size,
+                                              merge_tolerance=self.merge_tolerance)
+            self.report({'INFO'}, f"Imported {counts['points']} points, {counts['beams']} beams, {counts['shells']} shells")
+            report_validation(self, structural_data)
+            report_elapsed(self, timer, {'FINISHED'})
+            return {'FINISHED'}
+        
+        # Keep the current model so Esc can put it back
+        self._snapshot = self.snapshot_model(structural_data)
+        
+        # Progress follows the position in the file on disk, compressed or not
+        self._raw = open(self.filepath, 'rb')
+        self._file = json_stream.open_model(self.filepath, fileobj=self._raw)
+        self._file_size = max(os.path.getsize(self.filepath), 1)
+        
+        # Each step runs in its own bulk_edit so the UI is never left with updates suspended
+        with utils.bulk_edit(context, self.bl_label):
+            bpy.ops.structural.clear_all() # type: ignore
+            structural_data.sections.clear()
+        
+        self._reader = json_stream.StreamReader(self._file)
+        self._steps = importer.iter_import_file(self._file, structural_data, self.chunk_size, self._reader,
+                                                self.merge_tolerance)
+        self._counts = dict.fromkeys(json_stream.ELEMENT_KINDS, 0)
+        self._building = None
+        self._elapsed = 0.0
+        
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.rollback(context)
+            self.finish(context)
+            self.report({'WARNING'}, "Import cancelled - previous model restored")
+            return {'CANCELLED'}
+        
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        
+        deadline = time.perf_counter() + self.time_budget
+        try:
+            with utils.bulk_edit(context, self.bl_label) as timer:
+                while time.perf_counter() < deadline:
+                    stage, detail = next(self._steps)
+                    if stage == 'geometry':
+                        self._building = detail
+                    else:
+                        self._counts = dict(detail)
+        except StopIteration:
+            self._elapsed += timer.elapsed
+            self.finish(context)
+            self.report({'INFO'}, f"Imported {os.path.basename(self.filepath)} "
+                        f"({self._counts['points']} points, {self._counts['beams']} beams, {self._counts['shells']} shells) "
+                        f"in {self._elapsed:.2f}s of import work")
+            report_validation(self, context.scene.structural_data) # type: ignore
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Import failed: {str(e)}")
+            import traceback
+            traceback.print_exc()  # This will show the full error in console
+            self.rollback(context)
+            self.finish(context)
+            return {'CANCELLED'}
+        
+        self._elapsed += timer.elapsed
+        self.show_progress(context)
+        return {'RUNNING_MODAL'}
+    
+    def show_progress(self, context):
+        """Progress bar plus per-element-type counts in the status bar"""
+        if self._building is None:
+            percent = int(90 * self._raw.tell() / self._file_size)
+            activity = "Reading"
+        else:
+            percent = 90 + 3 * ('points', 'beams', 'shells').index(self._building)
+            activity = f"Building {self._building}"
+        
+        counts = self._counts
+        context.window_manager.progress_update(min(percent, 100)) # type: ignore
+        context.workspace.status_text_set(  # type: ignore
+            f"{activity} {os.path.basename(self.filepath)} {percent}% - "
+            f"points {counts['points']} | sections {counts['sections']} | "
+            f"beams {counts['beams']} | shells {counts['shells']} - Esc to cancel"
+        )
+    
+    def snapshot_model(self, structural_data):
+        """The current model as a StructuralModel (None if the model is empty)"""
+        if not (structural_data.points or structural_data.beams or structural_data.shells or structural_data.sections):
+            return None
+        # Never modified - clearing the scene only drops it from the cache
+        return model.get_model(structural_data)
+    
+    def rollback(self, context):
+        """Throw away the partial import and restore the model as it was before"""
+        structural_data = context.scene.structural_data # type: ignore
+        self._steps.close()
+        
+        with utils.bulk_edit(context, self.bl_label):
+            bpy.ops.structural.clear_all() # type: ignore
+            structural_data.sections.clear()
+            model_index.invalidate(structural_data)
+            
+            if self._snapshot:
+                importer.import_model(self._snapshot, structural_data)
+    
+    def finish(self, context):
+        """Stop the timer, close the file and drop the snapshot"""
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer) # type: ignore
+        wm.progress_end() # type: ignore
+        context.workspace.status_text_set(None)  # type: ignore
+        
+        self._file.close()
+        self._raw.close()
+        
+        self._snapshot = None
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self) # type: ignore
+        return {'RUNNING_MODAL'}
+
+class STRUCTURAL_OT_merge_coincident_points(Operator):
+    bl_idname = "structural.merge_coincident_points"
+    bl_label = "Merge Coincident Points"
+    bl_description = "Merge points closer together than a tolerance, reconnecting their beams and shells"
+    
+    tolerance: bpy.props.FloatProperty(  # type: ignore
+        name="Merge Distance",
+        description="Points closer together than this are merged into one",
+        default=0.001,
+        min=0.0,
+        precision=6,
+        subtype='DISTANCE'
+    )
+    
+    def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
+        structural_data = context.scene.structural_data # type: ignore
+        
+        try:
+            merged = utils.merge_coincident_points(structural_data, self.tolerance)
+        except ValueError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        
+        self.report({'INFO'}, f"Merged {merged} coincident points")
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self) # type: ignore
+
+def export_metadata(context):
+    """Metadata block written with every exported model"""
+    # Get version from bl_info
+    version_name = bl_info['name']
+    version_tuple = bl_info['version']
+    version_string = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}"
+    
+    return {
+        "version": version_string,
+        "exported_from": version_name, 
+        "units": context.scene.unit_settings.system,   # type: ignore
+        "scale_length": context.scene.unit_settings.scale_length,   # type: ignore
+        "length_unit": context.scene.unit_settings.length_unit,   # type: ignore
+        "blender_version": bpy.app.version_string
+    }
+
 class STRUCTURAL_OT_export_json(Operator):
     bl_idname = "structural.export_json"
     bl_label = "Export Structural JSON"
@@ -1053,92 +1217,143 @@ class STRUCTURAL_OT_export_json(Operator):
     )
     
     filter_glob: StringProperty( # type: ignore
-        default='*.json', options={'HIDDEN'}
+        default='*.json;*.json.gz;*.json.xz', options={'HIDDEN'}
         )
     
+    compact: bpy.props.BoolProperty(  # type: ignore
+        name="Compact",
+        description="Write JSON without indentation (smaller and faster for large models)",
+        default=False
+    )
+    
+    compression: bpy.props.EnumProperty(  # type: ignore
+        name="Compression",
+        description="Compress the exported file (import detects compression automatically)",
+        items=[
+            ('NONE', "None", "Plain .json"),
+            ('GZIP', "gzip", "Fast compression (.json.gz)"),
+            ('XZ', "xz", "Smaller files, slower to write (.json.xz)")
+        ],
+        default='NONE'
+    )
+    
     def execute(self, context):
         structural_data = context.scene.structural_data # type: ignore
         
         try:
-            # Ensure the filepath has .json extension
+            # Ensure the filepath has the .json extension, plus one for the compression
+            compression = {'NONE': None, 'GZIP': 'gzip', 'XZ': 'xz'}[self.compression]
+            for extension in json_stream.COMPRESSION_EXTENSIONS.values():
+                if self.filepath.lower().endswith('.json' + extension):
+                    self.filepath = self.filepath[:-len(extension)]
             if not self.filepath.lower().endswith('.json'):
                 self.filepath += '.json'
+            if compression:
+                self.filepath += json_stream.COMPRESSION_EXTENSIONS[compression]
             
-            # Get version from bl_info
-            version_name = bl_info['name']
-            version_tuple = bl_info['version']
-            version_string = f"{version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}"
-            scene_units = context.scene.unit_settings.system   # type: ignore
-            scale_length = context.scene.unit_settings.scale_length   # type: ignore
-            length_unit = context.scene.unit_settings.length_unit   # type: ignore
+            metadata = export_metadata(context)
             
-            # Build data structure
-            data = {
-                "structural_data": {
-                    "points": {},
-                    "beams": {},
-                    "shells": {},
-                    "sections": {},
-                    "metadata": {
-                        "version": version_string,
-                        "exported_from": version_name, 
-                        "units": scene_units,
-                        "scale_length": scale_length,
-                        "length_unit": length_unit,
-                        "blender_version": bpy.app.version_string
-                    }
-                }
-            }
+            # Write to file with proper error handling
+            model.get_model(structural_data).save(self.filepath, indent=None if self.compact else 2,
+                                                  compression=compression, metadata=metadata)
             
-            # Export points
-            for point in structural_data.points:
-                data["structural_data"]["points"][point.name] = [point.x, point.y, point.z]
+            self.report({'INFO'}, f"Successfully exported to {self.filepath}")
+            return {'FINISHED'}
             
-            # Export beams
-            for beam in structural_data.beams:
-                beam_data = {
-                    "start_point": beam.start_point,
-                    "end_point": beam.end_point
-                }
-                if beam.section_name:
-                    beam_data["section"] = beam.section_name
-                else:
-                    beam_data["diameter"] = beam.diameter
-                
-                data["structural_data"]["beams"][beam.name] = beam_data
+        except Exception as e:
+            self.report({'ERROR'}, f"Export failed: {str(e)}")
+            import traceback
+            traceback.print_exc()  # This will show the full error in console
+            return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        # Set a sensible default filename
+        import time
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        self.filepath = f"structural_data_{timestamp}.json"
+        context.window_manager.fileselect_add(self)   # type: ignore
+        return {'RUNNING_MODAL'}
+
+class STRUCTURAL_OT_import_binary(Operator):
+    bl_idname = "structural.import_binary"
+    bl_label = "Import Structural Binary"
+    bl_description = "Import structural data from a columnar binary (.feab) file"
+    
+    filepath: StringProperty( # type: ignore
+        name="File Path",
+        description="Filepath used for importing the file",
+        maxlen=1024, 
+        subtype='FILE_PATH'
+    )
+    
+    filter_glob: StringProperty( # type: ignore
+        default='*' + binary_format.EXTENSION, options={'HIDDEN'}
+        )
+    
+    def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
+        structural_data = context.scene.structural_data # type: ignore
+        
+        try:
+            if not os.path.exists(self.filepath):
+                self.report({'ERROR'}, f"File not found: {self.filepath}")
+                return {'CANCELLED'}
             
-            # Export shells
-            for shell in structural_data.shells:
-                data["structural_data"]["shells"][shell.name] = {
-                    "points": [p.strip() for p in shell.point_list.split(",")],
-                    "thickness": shell.thickness
-                }
+            if not binary_format.is_binary_model(self.filepath):
+                self.report({'ERROR'}, f"Not a BlenderFEA binary model: {self.filepath}")
+                return {'CANCELLED'}
             
-            # Export sections
-            for section in structural_data.sections:
-                section_data = {
-                    "type": section.section_type
-                }
-                
-                if section.section_type == 'CIRCULAR':
-                    section_data["diameter"] = section.diameter
-                elif section.section_type == 'RECTANGULAR':
-                    section_data["width"] = section.width
-                    section_data["height"] = section.height
-                elif section.section_type == 'POLYGONAL':
-                    section_data["diameter"] = section.poly_diameter
-                    section_data["sides"] = section.sides
-                
-                data["structural_data"]["sections"][section.name] = section_data
+            # Clear existing data - the file brings its own sections
+            bpy.ops.structural.clear_all() # type: ignore
+            structural_data.sections.clear()
+            model_index.invalidate(structural_data)
             
-            # Write to file with proper error handling
-            import os
-            directory = os.path.dirname(self.filepath)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory, exist_ok=True)
+            counts = importer.import_model(model.StructuralModel.load(self.filepath), structural_data)
             
-            with open(self.filepath, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
+            self.report({'INFO'}, f"Successfully imported {os.path.basename(self.filepath)} "
+                        f"({counts['points']} points, {counts['beams']} beams, {counts['shells']} shells)")
+            report_validation(self, structural_data)
+            return {'FINISHED'}
+            
+        except Exception as e:
+            self.report({'ERROR'}, f"Import failed: {str(e)}")
+            import traceback
+            traceback.print_exc()  # This will show the full error in console
+            return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self) # type: ignore
+        return {'RUNNING_MODAL'}
+
+class STRUCTURAL_OT_export_binary(Operator):
+    bl_idname = "structural.export_binary"
+    bl_label = "Export Structural Binary"
+    bl_description = "Export structural data to a columnar binary (.feab) file"
+    
+    filepath: StringProperty( # type: ignore
+        name="File Path", 
+        description="Filepath used for exporting the file", 
+        maxlen=1024,
+        subtype='FILE_PATH'
+    )
+    
+    filter_glob: StringProperty( # type: ignore
+        default='*' + binary_format.EXTENSION, options={'HIDDEN'}
+        )
+    
+    def execute(self, context):
+        structural_data = context.scene.structural_data # type: ignore
+        
+        try:
+            if not self.filepath.lower().endswith(binary_format.EXTENSION):
+                self.filepath += binary_format.EXTENSION
+            
+            model.get_model(structural_data).save(self.filepath, metadata=export_metadata(context))
             
             self.report({'INFO'}, f"Successfully exported to {self.filepath}")
             return {'FINISHED'}
@@ -1150,10 +1365,8 @@ class STRUCTURAL_OT_export_json(Operator):
             return {'CANCELLED'}
     
     def invoke(self, context, event):
-        # Set a sensible default filename
-        import time
         timestamp = time.strftime("%Y%m%d-%H%M%S")
-        self.filepath = f"structural_data_{timestamp}.json"
+        self.filepath = f"structural_data_{timestamp}{binary_format.EXTENSION}"
         context.window_manager.fileselect_add(self)   # type: ignore
         return {'RUNNING_MODAL'}
 
@@ -1225,6 +1438,12 @@ class STRUCTURAL_OT_create_hexagon_points(Operator):
     )
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         # Clear existing test points if they exist
@@ -1241,10 +1460,11 @@ class STRUCTURAL_OT_create_hexagon_points(Operator):
             point.x = x
             point.y = y
             point.z = z
+            point.node_id = model_index.new_node_id(structural_data)
             point_names.append(point.name)
             
             # Create visual representation
-            self.create_point_visual(point)
+            utils.create_point_visual(point, structural_data)
         
         # Auto-create a shell using these points
         shell = structural_data.shells.add()
@@ -1254,8 +1474,7 @@ class STRUCTURAL_OT_create_hexagon_points(Operator):
         
         # Create the shell geometry
         try:
-            from . import utils
-            utils.create_shell_from_data(shell, structural_data)
+            utils.update_shell_visual(shell, structural_data)
         except Exception as e:
             self.report({'WARNING'}, f"Created points but shell creation failed: {str(e)}")
         else:
@@ -1288,19 +1507,6 @@ class STRUCTURAL_OT_create_hexagon_points(Operator):
         
         return points
     
-    def create_point_visual(self, point):
-        """Create visual sphere for point"""
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=0.1, 
-            location=(point.x, point.y, point.z)
-        )
-        sphere = bpy.context.active_object
-        sphere.name = point.name    # type: ignore
-        
-        # Move to Structural Model collection
-        from . import utils
-        utils.move_to_structural_collection(sphere)
-    
     def cleanup_existing_test_points(self, structural_data):
         """Remove any existing test points and objects"""
         points_to_remove = []
@@ -1310,25 +1516,29 @@ class STRUCTURAL_OT_create_hexagon_points(Operator):
             if point.name.startswith("HexPoint_"):
                 points_to_remove.append(i)
                 # Remove visual object
-                if point.name in bpy.data.objects:
-                    obj = bpy.data.objects[point.name]
-                    bpy.data.objects.remove(obj, do_unlink=True)
+                utils.remove_element_object(point)
         
         # Remove from structural data (reverse to maintain indices)
         for i in sorted(points_to_remove, reverse=True):
             structural_data.points.remove(i)
+        model_index.invalidate(structural_data, 'points')
+        
+        if points_to_remove and structural_data.point_display_mode == 'INSTANCED':
+            utils.sync_point_cloud(structural_data)
         
         # Remove test shell
         shells_to_remove = []
         for i, shell in enumerate(structural_data.shells):
             if shell.name.startswith("Hexagon"):
                 shells_to_remove.append(i)
-                if shell.name in bpy.data.objects:
-                    obj = bpy.data.objects[shell.name]
-                    bpy.data.objects.remove(obj, do_unlink=True)
+                utils.remove_element_object(shell)
         
         for i in sorted(shells_to_remove, reverse=True):
             structural_data.shells.remove(i)
+        model_index.invalidate(structural_data, 'shells')
+        
+        if shells_to_remove and structural_data.shell_display_mode == 'MERGED':
+            utils.build_merged_shells(structural_data)
     
     def invoke(self, context, event):
         return context.window_manager.invoke_props_dialog(self)  # type: ignore
@@ -1340,6 +1550,12 @@ class STRUCTURAL_OT_create_simple_hexagon(Operator):
     bl_description = "Create a simple hexagon with one click"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data  # type: ignore
         
         # Clear existing test points
@@ -1362,14 +1578,11 @@ class STRUCTURAL_OT_create_simple_hexagon(Operator):
             point.x = x
             point.y = y
             point.z = z
+            point.node_id = model_index.new_node_id(structural_data)
             point_names.append(point.name)
             
             # Create visual
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.1, location=(x, y, z))
-            sphere = bpy.context.active_object
-            sphere.name = point.name    # type: ignore
-            from . import utils
-            utils.move_to_structural_collection(sphere)
+            utils.create_point_visual(point, structural_data)
         
         # Create shell
         shell = structural_data.shells.add()
@@ -1379,8 +1592,7 @@ class STRUCTURAL_OT_create_simple_hexagon(Operator):
         
         # Create shell geometry
         try:
-            from . import utils
-            utils.create_shell_from_data(shell, structural_data)
+            utils.update_shell_visual(shell, structural_data)
             self.report({'INFO'}, "Created regular hexagon with 6 points")
         except Exception as e:
             self.report({'ERROR'}, f"Shell creation failed: {str(e)}")
@@ -1395,22 +1607,28 @@ class STRUCTURAL_OT_create_simple_hexagon(Operator):
         for i, point in enumerate(structural_data.points):
             if point.name.startswith(("Hex_", "HexPoint_")):
                 points_to_remove.append(i)
-                if point.name in bpy.data.objects:
-                    bpy.data.objects.remove(bpy.data.objects[point.name], do_unlink=True)
+                utils.remove_element_object(point)
         
         for i in sorted(points_to_remove, reverse=True):
             structural_data.points.remove(i)
+        model_index.invalidate(structural_data, 'points')
+        
+        if points_to_remove and structural_data.point_display_mode == 'INSTANCED':
+            utils.sync_point_cloud(structural_data)
         
         # Remove shells  
         shells_to_remove = []
         for i, shell in enumerate(structural_data.shells):
             if shell.name.startswith(("Hexagon", "Test_Hexagon")):
                 shells_to_remove.append(i)
-                if shell.name in bpy.data.objects:
-                    bpy.data.objects.remove(bpy.data.objects[shell.name], do_unlink=True)
+                utils.remove_element_object(shell)
         
         for i in sorted(shells_to_remove, reverse=True):
             structural_data.shells.remove(i)
+        model_index.invalidate(structural_data, 'shells')
+        
+        if shells_to_remove and structural_data.shell_display_mode == 'MERGED':
+            utils.build_merged_shells(structural_data)
 
 			
 class STRUCTURAL_OT_create_nonplanar_hexagon(Operator):
@@ -1419,6 +1637,12 @@ class STRUCTURAL_OT_create_nonplanar_hexagon(Operator):
     bl_description = "Create a hexagon with points at different Z heights"
     
     def execute(self, context):
+        with utils.bulk_edit(context, self.bl_label) as timer:
+            result = self.edit(context)
+        report_elapsed(self, timer, result)
+        return result
+    
+    def edit(self, context):
         structural_data = context.scene.structural_data    # type: ignore
         
         self.cleanup_test_points(structural_data)
@@ -1440,13 +1664,10 @@ class STRUCTURAL_OT_create_nonplanar_hexagon(Operator):
             point.x = x
             point.y = y
             point.z = z
+            point.node_id = model_index.new_node_id(structural_data)
             point_names.append(point.name)
             
-            bpy.ops.mesh.primitive_uv_sphere_add(radius=0.1, location=(x, y, z))
-            sphere = bpy.context.active_object
-            sphere.name = point.name    # type: ignore
-            from . import utils
-            utils.move_to_structural_collection(sphere)
+            utils.create_point_visual(point, structural_data)
         
         # Create shell - this will test non-planar handling
         shell = structural_data.shells.add()
@@ -1455,8 +1676,7 @@ class STRUCTURAL_OT_create_nonplanar_hexagon(Operator):
         shell.thickness = 0.1
         
         try:
-            from . import utils
-            result = utils.create_shell_from_data(shell, structural_data)
+            result = utils.update_shell_visual(shell, structural_data)
             if result:
                 self.report({'INFO'}, "Created non-planar hexagon - check console for warnings")
             else:
@@ -1485,6 +1705,7 @@ classes = (
     STRUCTURAL_OT_delete_beam,
     STRUCTURAL_OT_update_beam,
     STRUCTURAL_OT_color_beams_by_section_name,
+    STRUCTURAL_OT_color_beams_by_section_fast,
     STRUCTURAL_OT_color_beams_by_section_palette,
     STRUCTURAL_OT_color_all_beams_with_sections,
     STRUCTURAL_OT_color_beams_emission,
@@ -1500,7 +1721,12 @@ classes = (
     STRUCTURAL_UL_beams,
     STRUCTURAL_UL_shells,
     STRUCTURAL_OT_import_json,
+    STRUCTURAL_OT_import_json_modal,
+    STRUCTURAL_OT_merge_coincident_points,
+    STRUCTURAL_OT_validate_model,
     STRUCTURAL_OT_export_json,
+    STRUCTURAL_OT_import_binary,
+    STRUCTURAL_OT_export_binary,
     STRUCTURAL_OT_create_hexagon_points,
     STRUCTURAL_OT_create_simple_hexagon,
     STRUCTURAL_OT_create_nonplanar_hexagon,
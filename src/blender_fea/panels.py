@@ -1,5 +1,7 @@
 import bpy
 from bpy.types import Panel
+from . import geometry
+from . import utils
 
 class VIEW3D_PT_structural_modeling(Panel):
     bl_label = "Structural Modeling"
@@ -22,6 +24,19 @@ class VIEW3D_PT_structural_modeling(Panel):
         box = layout.box()   # type: ignore
         box.label(text="Collection Management")
         box.operator("structural.organize_collections", text="Organize Collections")
+        
+        # Display options
+        structural_data = context.scene.structural_data   # type: ignore
+        box = layout.box()   # type: ignore
+        box.label(text="Display")
+        box.prop(structural_data, "point_display_mode")
+        box.prop(structural_data, "beam_display_mode")
+        box.prop(structural_data, "shell_display_mode")
+        box.prop(structural_data, "lod_mode")
+        if structural_data.lod_mode == 'AUTO':
+            box.label(text=f"Points: {structural_data.point_lod_level.capitalize()}, "
+                           f"beams: {structural_data.beam_lod_level.capitalize()}")
+        box.prop(structural_data, "live_sync")
 
         # Import/Export
         box = layout.box()   # type: ignore
@@ -29,6 +44,12 @@ class VIEW3D_PT_structural_modeling(Panel):
         row = box.row()
         row.operator("structural.import_json", text="Import JSON", icon='IMPORT')
         row.operator("structural.export_json", text="Export JSON", icon='EXPORT')
+        box.operator("structural.import_json_modal", text="Import Large JSON", icon='TIME')
+        row = box.row()
+        row.operator("structural.import_binary", text="Import Binary", icon='IMPORT')
+        row.operator("structural.export_binary", text="Export Binary", icon='EXPORT')
+        box.operator("structural.merge_coincident_points", text="Merge Coincident Points", icon='AUTOMERGE_OFF')
+        box.operator("structural.validate_model", text="Check Model", icon='CHECKMARK')
         
         layout.operator("structural.clear_all", icon='TRASH', text="Clear All")   # type: ignore
 
@@ -54,7 +75,7 @@ class VIEW3D_PT_structural_points(Panel):
         if structural_data.points and structural_data.active_point_index >= 0:
             point = structural_data.points[structural_data.active_point_index]
             box = layout.box()   # type: ignore
-            box.label(text=f"Point: {point.name}")
+            box.label(text=f"Point: {point.name} (node {point.node_id})")
             box.prop(point, "x")
             box.prop(point, "y")
             box.prop(point, "z")
@@ -128,6 +149,29 @@ class VIEW3D_PT_structural_sections(Panel):
             elif section.section_type == 'POLYGONAL':
                 box.prop(section, "sides")
                 box.prop(section, "poly_diameter")
+            elif section.section_type in ('I_SECTION', 'CHANNEL', 'ANGLE'):
+                box.prop(section, "width")
+                box.prop(section, "height")
+                box.prop(section, "web_thickness")
+                box.prop(section, "flange_thickness")
+            elif section.section_type == 'TUBE':
+                box.prop(section, "diameter")
+                box.prop(section, "wall_thickness")
+            elif section.section_type == 'BOX':
+                box.prop(section, "width")
+                box.prop(section, "height")
+                box.prop(section, "wall_thickness")
+            
+            if not geometry.walls_fit(*utils.get_section_profile(section)):
+                box.label(text="Walls are too thick for this section", icon='ERROR')
+            
+            # Section properties, computed once per section shape
+            props = utils.get_section_properties(section)
+            col = box.column(align=True)
+            col.label(text=f"A: {props.area:.4g}")
+            col.label(text=f"Iy: {props.iy:.4g}   Iz: {props.iz:.4g}")
+            col.label(text=f"J: {props.j:.4g}")
+            col.label(text=f"Wy: {props.wy:.4g}   Wz: {props.wz:.4g}")
 
 class STRUCTURAL_PT_visualization(Panel):
     bl_label = "Beam Visualization"
@@ -145,6 +189,7 @@ class STRUCTURAL_PT_visualization(Panel):
         # Beam coloring section
         layout.label(text="Beam Coloring:")   # type: ignore
         layout.operator("structural.color_beams_by_section_name")   # type: ignore
+        layout.operator("structural.color_beams_by_section_fast", text="Fast Section Colors (Solid)")   # type: ignore
         layout.operator("structural.color_beams_emission", text="Bright Beams")   # type: ignore
         layout.separator()   # type: ignore
         
@@ -1,42 +1,215 @@
 import bpy
+import numpy as np
+from bpy.app.handlers import persistent
 from bpy.types import PropertyGroup
-from bpy.props import StringProperty, FloatProperty, CollectionProperty, IntProperty, EnumProperty
+from bpy.props import StringProperty, FloatProperty, CollectionProperty, IntProperty, EnumProperty, BoolProperty, PointerProperty
+from . import utils
+from . import model_index
+from . import live_sync
+from . import lod
+
+def update_beam_name(self, context):
+    """Renaming a beam invalidates the beam name -> index table"""
+    model_index.invalidate(self.id_data.structural_data, 'beams')
+
+def update_shell_name(self, context):
+    """Renaming a shell invalidates the shell name -> index table"""
+    model_index.invalidate(self.id_data.structural_data, 'shells')
+
+def update_section_name(self, context):
+    """Renaming a section invalidates the section name -> index table"""
+    model_index.invalidate(self.id_data.structural_data, 'sections')
+
+@persistent
+def clear_model_index(dummy):
+    """Loading a file or stepping through undo replaces the model wholesale"""
+    model_index.clear()
+
+def update_point_name(self, context):
+    """Renaming a point renames it in every beam attached to it by node ID"""
+    structural_data = self.id_data.structural_data
+    model_index.invalidate(structural_data, 'points')
+    if self.node_id <= 0:
+        return
+
+    beams = structural_data.beams
+    node_ids = np.empty(len(beams), dtype=np.int32)
+    for node_attr, name_attr in (('start_node', 'start_point'), ('end_node', 'end_point')):
+        beams.foreach_get(node_attr, node_ids)
+        for b in np.flatnonzero(node_ids == self.node_id):
+            if getattr(beams[int(b)], name_attr) != self.name:
+                setattr(beams[int(b)], name_attr, self.name)
+    
+    offsets, shell_nodes = model_index.shell_connectivity(structural_data)
+    positions = np.flatnonzero(shell_nodes == self.node_id)
+    for h in model_index.shells_using(structural_data, positions):
+        shell = structural_data.shells[int(h)]
+        names = model_index.split_point_list(shell.point_list)
+        for position in positions[(positions >= offsets[h]) & (positions < offsets[h + 1])]:
+            names[position - offsets[h]] = self.name
+        shell.point_list = ", ".join(names)
+
+def update_beam_start(self, context):
+    """Resolve the start point name to its node ID (in bulk at the end of a bulk_edit section)"""
+    structural_data = self.id_data.structural_data
+    if utils.in_bulk_edit():
+        self.start_node = 0
+        utils.defer_node_resolution(self.id_data)
+    else:
+        self.start_node = model_index.node_id_of(structural_data, self.start_point)
+    model_index.invalidate_derived(structural_data)
+    live_sync.mark(structural_data, 'beams', self.name)
+
+def update_beam_end(self, context):
+    """Resolve the end point name to its node ID (in bulk at the end of a bulk_edit section)"""
+    structural_data = self.id_data.structural_data
+    if utils.in_bulk_edit():
+        self.end_node = 0
+        utils.defer_node_resolution(self.id_data)
+    else:
+        self.end_node = model_index.node_id_of(structural_data, self.end_point)
+    model_index.invalidate_derived(structural_data)
+    live_sync.mark(structural_data, 'beams', self.name)
+
+def update_shell_points(self, context):
+    """Resolve the edited point list to node IDs (in bulk at the end of a bulk_edit section)"""
+    structural_data = self.id_data.structural_data
+    if utils.in_bulk_edit():
+        # An empty node list marks the shell stale for resolve_shell_nodes
+        self.nodes.clear()
+        model_index.invalidate_derived(structural_data)
+        utils.defer_node_resolution(self.id_data)
+    else:
+        model_index.set_shell_nodes(structural_data, self)
+    live_sync.mark(structural_data, 'shells', self.name)
+
+@persistent
+def migrate_node_ids(dummy):
+    """Files saved before node IDs existed: number the points and link beams and shells to them"""
+    for scene in bpy.data.scenes:
+        structural_data = scene.structural_data
+        model_index.assign_node_ids(structural_data)
+        model_index.resolve_beam_nodes(structural_data)
+        model_index.resolve_shell_nodes(structural_data)
+
+@persistent
+def migrate_element_objects(dummy):
+    """Files saved before elements kept their objects: link them up once by name"""
+    for scene in bpy.data.scenes:
+        utils.link_element_objects(scene.structural_data)
+
+def update_point_coordinates(self, context):
+    """Moving a point invalidates the cached coordinate array"""
+    structural_data = self.id_data.structural_data
+    model_index.invalidate_coordinates(structural_data)
+    live_sync.mark(structural_data, 'points', self.name)
+
+def update_beam_data(self, context):
+    """Other beam edits only invalidate cached whole-model data (model.get_model)"""
+    structural_data = self.id_data.structural_data
+    model_index.invalidate_derived(structural_data)
+    live_sync.mark(structural_data, 'beams', self.name)
+
+def update_section_data(self, context):
+    """Section edits update the section's shared mesh, or the Geometry Nodes edge attributes"""
+    structural_data = self.id_data.structural_data
+    model_index.invalidate_derived(structural_data)
+    if structural_data.beam_display_mode == 'OBJECTS':
+        utils.refresh_section_mesh(self, structural_data)
+    elif structural_data.beam_display_mode == 'GEOMETRY_NODES' and not utils.in_bulk_edit():
+        from . import geometry_nodes
+        geometry_nodes.update_beam_attributes(structural_data)
+    live_sync.mark(structural_data, 'sections', self.name)
+
+def update_shell_thickness(self, context):
+    """Merged shells pick up a new thickness by rewriting their face attribute"""
+    structural_data = self.id_data.structural_data
+    model_index.invalidate_derived(structural_data)
+    if structural_data.shell_display_mode == 'MERGED' and not utils.in_bulk_edit():
+        utils.update_shell_thickness_attribute(structural_data)
+    else:
+        live_sync.mark(structural_data, 'shells', self.name)
+
+def update_point_display_mode(self, context):
+    """Swap point visuals over when the display mode changes"""
+    utils.rebuild_point_visuals(self)
+
+def update_beam_display_mode(self, context):
+    """Swap beam visuals over when the display mode changes"""
+    utils.rebuild_beam_visuals(self)
+
+def update_shell_display_mode(self, context):
+    """Swap shell visuals over when the display mode changes"""
+    utils.rebuild_shell_visuals(self)
+
+def update_lod_mode(self, context):
+    """Redraw points and beams whose level of detail the new mode changes"""
+    utils.apply_level_of_detail(self, lod.update_levels(self))
+
+def update_live_sync(self, context):
+    """Edits made while live sync was off are not replayed when it is turned on"""
+    live_sync.discard(self)
 
 # Define ALL PropertyGroup classes first
 class StructuralPoint(PropertyGroup):
-    name: StringProperty(name="Point Name")    # type: ignore
-    x: FloatProperty(name="X", default=0.0)    # type: ignore
-    y: FloatProperty(name="Y", default=0.0)    # type: ignore
-    z: FloatProperty(name="Z", default=0.0)    # type: ignore
+    name: StringProperty(name="Point Name", update=update_point_name)    # type: ignore
+    x: FloatProperty(name="X", default=0.0, update=update_point_coordinates)    # type: ignore
+    y: FloatProperty(name="Y", default=0.0, update=update_point_coordinates)    # type: ignore
+    z: FloatProperty(name="Z", default=0.0, update=update_point_coordinates)    # type: ignore
+    node_id: IntProperty(name="Node ID", description="Stable ID that beams refer to", default=0, min=0)    # type: ignore
+    obj: PointerProperty(name="Object", type=bpy.types.Object, description="Object drawing this element on its own")    # type: ignore
+    geom_start: IntProperty(name="Geometry Start", description="First vertex of this element in the shared display mesh, -1 if not in one", default=-1)    # type: ignore
+    geom_count: IntProperty(name="Geometry Count", description="Number of vertices of this element in the shared display mesh", default=0, min=0)    # type: ignore
 
 class StructuralBeam(PropertyGroup):
-    name: StringProperty(name="Beam Name")    # type: ignore
-    start_point: StringProperty(name="Start Point")    # type: ignore
-    end_point: StringProperty(name="End Point")    # type: ignore
-    diameter: FloatProperty(name="Diameter", default=0.1, min=0.01)    # type: ignore
-    section_name: StringProperty(name="Section")    # type: ignore
+    name: StringProperty(name="Beam Name", update=update_beam_name)    # type: ignore
+    start_point: StringProperty(name="Start Point", update=update_beam_start)    # type: ignore
+    end_point: StringProperty(name="End Point", update=update_beam_end)    # type: ignore
+    start_node: IntProperty(name="Start Node", default=0, min=0)    # type: ignore
+    end_node: IntProperty(name="End Node", default=0, min=0)    # type: ignore
+    diameter: FloatProperty(name="Diameter", default=0.1, min=0.01, update=update_beam_data)    # type: ignore
+    section_name: StringProperty(name="Section", update=update_beam_data)    # type: ignore
+    obj: PointerProperty(name="Object", type=bpy.types.Object, description="Object drawing this element on its own")    # type: ignore
+    geom_start: IntProperty(name="Geometry Start", description="First face (or edge) of this element in the shared display mesh, -1 if not in one", default=-1)    # type: ignore
+    geom_count: IntProperty(name="Geometry Count", description="Number of faces (or edges) of this element in the shared display mesh", default=0, min=0)    # type: ignore
+
+class StructuralNodeRef(PropertyGroup):
+    node_id: IntProperty(name="Node ID", default=0, min=0)    # type: ignore
 
 class StructuralShell(PropertyGroup):
-    name: StringProperty(name="Shell Name")    # type: ignore
-    point_list: StringProperty(name="Points (comma separated)")    # type: ignore
-    thickness: FloatProperty(name="Thickness", default=0.05, min=0.0)    # type: ignore
+    name: StringProperty(name="Shell Name", update=update_shell_name)    # type: ignore
+    point_list: StringProperty(name="Points (comma separated)", update=update_shell_points)    # type: ignore
+    nodes: CollectionProperty(type=StructuralNodeRef)    # type: ignore
+    thickness: FloatProperty(name="Thickness", default=0.05, min=0.0, update=update_shell_thickness)    # type: ignore
+    obj: PointerProperty(name="Object", type=bpy.types.Object, description="Object drawing this element on its own")    # type: ignore
+    geom_start: IntProperty(name="Geometry Start", description="First face of this element in the shared display mesh, -1 if not in one", default=-1)    # type: ignore
+    geom_count: IntProperty(name="Geometry Count", description="Number of faces of this element in the shared display mesh", default=0, min=0)    # type: ignore
 
 class StructuralSection(PropertyGroup):
-    name: StringProperty(name="Section Name")    # type: ignore
+    name: StringProperty(name="Section Name", update=update_section_name)    # type: ignore
     section_type: EnumProperty(    # type: ignore
         name="Section Type",
         items=[
             ('CIRCULAR', "Circular", "Circular cross-section"),
             ('RECTANGULAR', "Rectangular", "Rectangular cross-section"),
             ('POLYGONAL', "Polygonal", "Polygonal cross-section"),
+            ('I_SECTION', "I/H Section", "Doubly symmetric I or H cross-section"),
+            ('CHANNEL', "Channel", "Channel (C/U) cross-section"),
+            ('ANGLE', "Angle", "Angle (L) cross-section"),
+            ('TUBE', "Tube", "Circular hollow cross-section"),
+            ('BOX', "Box", "Rectangular hollow cross-section"),
         ],
-        default='CIRCULAR'
+        default='CIRCULAR',
+        update=update_section_data
     )
-    diameter: FloatProperty(name="Diameter", default=0.1, min=0.01)    # type: ignore
-    width: FloatProperty(name="Width", default=0.1, min=0.01)    # type: ignore
-    height: FloatProperty(name="Height", default=0.15, min=0.01)    # type: ignore
-    sides: IntProperty(name="Sides", default=6, min=3, max=12)    # type: ignore
-    poly_diameter: FloatProperty(name="Diameter", default=0.1, min=0.01)    # type: ignore
+    diameter: FloatProperty(name="Diameter", default=0.1, min=0.01, update=update_section_data)    # type: ignore
+    width: FloatProperty(name="Width", default=0.1, min=0.01, update=update_section_data)    # type: ignore
+    height: FloatProperty(name="Height", default=0.15, min=0.01, update=update_section_data)    # type: ignore
+    sides: IntProperty(name="Sides", default=6, min=3, max=12, update=update_section_data)    # type: ignore
+    poly_diameter: FloatProperty(name="Diameter", default=0.1, min=0.01, update=update_section_data)    # type: ignore
+    web_thickness: FloatProperty(name="Web Thickness", default=0.006, min=0.001, update=update_section_data)    # type: ignore
+    flange_thickness: FloatProperty(name="Flange Thickness", default=0.01, min=0.001, update=update_section_data)    # type: ignore
+    wall_thickness: FloatProperty(name="Wall Thickness", default=0.005, min=0.001, update=update_section_data)    # type: ignore
 
 class StructuralProperties(PropertyGroup):
     points: CollectionProperty(type=StructuralPoint)    # type: ignore
@@ -48,11 +221,79 @@ class StructuralProperties(PropertyGroup):
     active_beam_index: IntProperty(default=0)    # type: ignore
     active_shell_index: IntProperty(default=0)    # type: ignore
     active_section_index: IntProperty(default=0)    # type: ignore
+    
+    next_node_id: IntProperty(default=1, min=1)    # type: ignore
+    
+    point_display_mode: EnumProperty(    # type: ignore
+        name="Point Display",
+        description="How structural points are drawn in the viewport",
+        items=[
+            ('INSTANCED', "Instanced", "All points are vertices of one mesh with sphere markers instanced on them"),
+            ('OBJECTS', "Objects", "One UV-sphere object per point (slow for large models)"),
+        ],
+        default='INSTANCED',
+        update=update_point_display_mode
+    )
+    
+    beam_display_mode: EnumProperty(    # type: ignore
+        name="Beam Display",
+        description="How structural beams are drawn in the viewport",
+        items=[
+            ('OBJECTS', "Objects", "One mesh object per beam"),
+            ('MERGED', "Merged", "All beams in one mesh, built in a single vectorised pass"),
+            ('GEOMETRY_NODES', "Geometry Nodes", "All beams are edges of one mesh, swept by a Geometry Nodes modifier"),
+        ],
+        default='OBJECTS',
+        update=update_beam_display_mode
+    )
+    
+    shell_display_mode: EnumProperty(    # type: ignore
+        name="Shell Display",
+        description="How structural shells are drawn in the viewport",
+        items=[
+            ('OBJECTS', "Objects", "One mesh object per shell"),
+            ('MERGED', "Merged", "All shells in one mesh, thickness drawn by a Geometry Nodes extrusion"),
+        ],
+        default='OBJECTS',
+        update=update_shell_display_mode
+    )
+    
+    lod_mode: EnumProperty(    # type: ignore
+        name="Level of Detail",
+        description="How much detail points and beams are drawn with",
+        items=[
+            ('AUTO', "Auto", "Simplify points and beams as the model grows or the view moves away from it"),
+            ('FULL', "Full", "Sphere markers and full section profiles"),
+            ('MEDIUM', "Medium", "Low-poly markers and bounding boxes of sections"),
+            ('LOW', "Low", "Bare points and beam lines"),
+        ],
+        default='AUTO',
+        update=update_lod_mode
+    )
+    
+    # Levels currently drawn - set by lod.update_levels, not by the user
+    point_lod_level: EnumProperty(    # type: ignore
+        items=[(level, level.capitalize(), "") for level in lod.LEVELS],
+        default='FULL'
+    )
+    beam_lod_level: EnumProperty(    # type: ignore
+        items=[(level, level.capitalize(), "") for level in lod.LEVELS],
+        default='FULL'
+    )
+    
+    live_sync: BoolProperty(    # type: ignore
+        name="Live Sync",
+        description="Redraw points, beams and shells as soon as they are edited, "
+                    "rebuilding only what the edit touched",
+        default=False,
+        update=update_live_sync
+    )
 
 # Collect ALL classes for registration
 classes = (
     StructuralPoint,
     StructuralBeam,
+    StructuralNodeRef,  # Must be registered before StructuralShell
     StructuralShell,
     StructuralSection,  # Must be registered before StructuralProperties
     StructuralProperties,
@@ -66,10 +307,36 @@ def register():
     
     # Register scene property AFTER all classes are registered
     bpy.types.Scene.structural_data = bpy.props.PointerProperty(type=StructuralProperties)    # type: ignore
+    
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if clear_model_index not in handlers:
+            handlers.append(clear_model_index)
+    for handler in (migrate_node_ids, migrate_element_objects):
+        if handler not in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.append(handler)
+    if live_sync.live_sync_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(live_sync.live_sync_depsgraph_update)
+    if not bpy.app.timers.is_registered(lod.check_view):
+        bpy.app.timers.register(lod.check_view, first_interval=lod.CHECK_INTERVAL, persistent=True)
 
 def unregister():
     from bpy.utils import unregister_class
     
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if clear_model_index in handlers:
+            handlers.remove(clear_model_index)
+    for handler in (migrate_node_ids, migrate_element_objects):
+        if handler in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(handler)
+    if live_sync.live_sync_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(live_sync.live_sync_depsgraph_update)
+    if bpy.app.timers.is_registered(live_sync.flush):
+        bpy.app.timers.unregister(live_sync.flush)
+    live_sync.discard()
+    if bpy.app.timers.is_registered(lod.check_view):
+        bpy.app.timers.unregister(lod.check_view)
+    model_index.clear()
+    
     # Remove scene property first
     if hasattr(bpy.types.Scene, 'structural_data'):
         del bpy.types.Scene.structural_data    # type: ignore
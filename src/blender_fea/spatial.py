@@ -0,0 +1,124 @@
+"""
+Spatial hashing for point clouds
+
+Points are binned into a uniform grid of cells the size of the search
+tolerance, so every point within the tolerance of another lies in the same
+or a neighbouring cell. Cells are keyed by one integer, sorted once, and the
+neighbouring cells are then paired up with searchsorted - O(n log n)
+overall with everything done in NumPy, which keeps 10^6 points practical
+(a KD-tree queried point by point from Python would not be).
+
+No bpy in here - it can be used outside Blender.
+"""
+
+import itertools
+
+import numpy as np
+
+# Relative offsets of a cell and its 26 neighbours
+_NEIGHBOURS = np.array(list(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64)
+
+
+def cell_keys(coords, cell_size):
+    """Integer cell key of every point plus the key strides along x, y and z
+
+    Cells are padded by one on every side so that neighbour keys of any
+    point are valid keys too.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    cells = np.floor((coords - coords.min(axis=0)) / cell_size).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    if np.prod(dims.astype(np.float64)) >= 2.0 ** 62:
+        raise ValueError("Tolerance is too small for the extent of the model")
+    strides = np.array([dims[1] * dims[2], dims[2], 1], dtype=np.int64)
+    return cells @ strides, strides
+
+def _expand(counts):
+    """For ranges of the given lengths laid end to end, each item's rank within its range"""
+    total = int(counts.sum())
+    return np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+
+def close_pairs(coords, tolerance):
+    """All index pairs (i, j), i < j, of points no further apart than tolerance
+
+    Returns an (K, 2) int64 array.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    if len(coords) < 2 or tolerance <= 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    keys, strides = cell_keys(coords, tolerance)
+    order = np.argsort(keys, kind='stable')
+    cells, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    tolerance_sq = tolerance * tolerance
+    pairs = []
+
+    # Each pair of neighbouring cells is visited once: the cell itself plus the
+    # 13 neighbours with a larger key
+    offsets = _NEIGHBOURS @ strides
+    for offset in offsets[offsets >= 0]:
+        if offset:
+            found = np.searchsorted(cells, cells + offset)
+            found[found == len(cells)] = 0
+            a = np.flatnonzero(cells[found] == cells + offset)
+            b = found[a]
+        else:
+            a = b = np.flatnonzero(cell_count > 1)
+        if not len(a):
+            continue
+
+        # Every point of cell a against every point of cell b
+        na = cell_count[a]
+        nb = cell_count[b]
+        rank = _expand(na * nb)
+        nb_each = np.repeat(nb, na * nb)
+        first = order[np.repeat(cell_start[a], na * nb) + rank // nb_each]
+        second = order[np.repeat(cell_start[b], na * nb) + rank % nb_each]
+        if not offset:
+            keep = first < second
+            first = first[keep]
+            second = second[keep]
+
+        delta = coords[first] - coords[second]
+        close = np.einsum('ij,ij->i', delta, delta) <= tolerance_sq
+        pair = np.stack([first[close], second[close]], axis=1)
+        pairs.append(np.sort(pair, axis=1))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(pairs)
+
+def group_labels(count, pairs):
+    """Connected components of a graph given by index pairs
+
+    Every index is labelled with the lowest index in its component.
+    """
+    labels = np.arange(count, dtype=np.int64)
+    if not len(pairs):
+        return labels
+    first = pairs[:, 0]
+    second = pairs[:, 1]
+
+    while True:
+        lowest = np.minimum(labels[first], labels[second])
+        updated = labels.copy()
+        np.minimum.at(updated, first, lowest)
+        np.minimum.at(updated, second, lowest)
+        # Pointer jumping so long chains collapse quickly
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+def coincident_representatives(coords, tolerance):
+    """For every point, the index of the point it should be merged into
+
+    Points closer than tolerance are merged transitively; each group is
+    represented by its lowest index, so a point that is kept maps to itself.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    return group_labels(len(coords), close_pairs(coords, tolerance))
@@ -1,9 +1,18 @@
 import math
+import time
+import logging
+from contextlib import contextmanager
 import bpy
 import bmesh
-from mathutils import Vector
+import numpy as np
+from mathutils import Vector, Matrix
 
 from . import DEFAULT_UNITS
+from . import geometry
+from . import model_index
+from . import spatial
+
+log = logging.getLogger(__name__)
 
 # scale is the factor that needs to be applied to the value 
 # to convert it to the default unit
@@ -117,12 +126,137 @@ def convert_units(value, from_unit, to_unit, units_dict):
 
         return result
 
+# Bulk editing - mesh updates, view-layer updates and redraws batched for mass operations
+_bulk_edit_depth = 0
+_deferred_meshes = set()
+_deferred_scenes = set()
+
+class BulkEditTimer:
+    """Timing of a bulk_edit section, filled in when the section ends"""
+    
+    def __init__(self, label):
+        self.label = label
+        self.start = time.perf_counter()
+        self.elapsed = None
+
+@contextmanager
+def bulk_edit(context=None, label="Bulk edit"):
+    """Batch the mesh updates, node ID resolution and redraws of a mass edit
+    
+    Inside the section update_mesh() only records the mesh and beam/shell
+    node IDs are resolved once at the end; on exit the recorded meshes are
+    updated, followed by one view-layer update and one redraw, even if the
+    body raises. Other writes (mesh arrays, object transforms) happen
+    immediately. Nested sections only flush at the outermost level.
+    
+    Undo steps are still recorded - Blender only lets an add-on switch
+    undo off through the user's global preferences. The yielded timer holds
+    the elapsed time once the section has ended, for the caller to report.
+    """
+    global _bulk_edit_depth
+    context = context or bpy.context
+    timer = BulkEditTimer(label)
+    
+    outermost = _bulk_edit_depth == 0
+    _bulk_edit_depth += 1
+    
+    if outermost:
+        window = context.window
+        if window:
+            window.cursor_modal_set('WAIT')
+    
+    try:
+        yield timer
+    finally:
+        _bulk_edit_depth -= 1
+        timer.elapsed = time.perf_counter() - timer.start
+        
+        if outermost:
+            if window:
+                window.cursor_modal_restore()
+            flush_deferred_updates(context)
+        
+        log.info(f"{label}: {timer.elapsed:.3f}s")
+
+def in_bulk_edit():
+    """True while inside a bulk_edit section"""
+    return _bulk_edit_depth > 0
+
+def update_mesh(mesh):
+    """mesh.update(), postponed to the end of the current bulk_edit section if there is one"""
+    if in_bulk_edit():
+        _deferred_meshes.add(mesh.name)
+    else:
+        mesh.update()
+
+def defer_node_resolution(scene):
+    """Resolve the scene's beam and shell node IDs once, at the end of the current bulk_edit section"""
+    _deferred_scenes.add(scene.name)
+
+def resolve_deferred_nodes(structural_data):
+    """Resolve node IDs postponed in the current bulk_edit section, before geometry is built from them"""
+    if structural_data.id_data.name in _deferred_scenes:
+        model_index.resolve_beam_nodes(structural_data)
+        model_index.resolve_shell_nodes(structural_data)
+
+def flush_deferred_updates(context=None):
+    """Run postponed node resolution and mesh updates, then one view-layer update and one redraw"""
+    context = context or bpy.context
+    
+    for scene_name in _deferred_scenes:
+        scene = bpy.data.scenes.get(scene_name)
+        if scene is not None:
+            model_index.resolve_beam_nodes(scene.structural_data)
+            model_index.resolve_shell_nodes(scene.structural_data)
+    _deferred_scenes.clear()
+    
+    for mesh_name in _deferred_meshes:
+        mesh = bpy.data.meshes.get(mesh_name)
+        if mesh is not None:
+            mesh.update()
+    _deferred_meshes.clear()
+    
+    if context.view_layer is not None:
+        context.view_layer.update()
+    
+    if context.screen is not None:
+        for area in context.screen.areas:
+            area.tag_redraw()
+
 def get_point_coordinates(point_name, structural_data):
     """Get coordinates for a point by name"""
-    for point in structural_data.points:
-        if point.name == point_name:
-            return Vector((point.x, point.y, point.z))
-    return None
+    position = model_index.point_position(structural_data, point_name)
+    if position is None:
+        return None
+    return Vector(position)
+
+def get_node_coordinates(node_id, point_name, structural_data):
+    """Get coordinates for a point by node ID, falling back to its name"""
+    index = model_index.node_index(structural_data, node_id)
+    if index is None:
+        return get_point_coordinates(point_name, structural_data)
+    return Vector(get_point_coordinate_array(structural_data)[index])
+
+def get_beam_end_indices(structural_data, beams=None):
+    """Point indices of the start and end of each beam via node IDs (-1 if unresolved)"""
+    resolve_deferred_nodes(structural_data)
+    if beams is None:
+        beams = structural_data.beams
+        starts = np.empty(len(beams), dtype=np.int32)
+        ends = np.empty(len(beams), dtype=np.int32)
+        beams.foreach_get('start_node', starts)
+        beams.foreach_get('end_node', ends)
+    else:
+        starts = np.array([beam.start_node for beam in beams], dtype=np.int32)
+        ends = np.array([beam.end_node for beam in beams], dtype=np.int32)
+    return model_index.node_indices(structural_data, starts), model_index.node_indices(structural_data, ends)
+
+def get_shell_coordinates(shell, structural_data):
+    """(N, 3) coordinates of a shell's resolved nodes, read from its node ID list"""
+    node_ids = np.empty(len(shell.nodes), dtype=np.int32)
+    shell.nodes.foreach_get('node_id', node_ids)
+    indices = model_index.node_indices(structural_data, node_ids)
+    return get_point_coordinate_array(structural_data)[indices[indices >= 0]]
 
 def ensure_structural_collection():
     """Ensure Structural Model collection exists and return it"""
@@ -154,50 +288,266 @@ def move_to_structural_collection(obj):
     
     return obj
 
-def create_beam_from_data(beam, structural_data):
-    """Create beam geometry from beam data with section properties"""
-    start_coords = get_point_coordinates(beam.start_point, structural_data)
-    end_coords = get_point_coordinates(beam.end_point, structural_data)
+# Point display - all points as vertices of a single mesh with instanced markers
+POINT_CLOUD_NAME = "FEA_Points"
+POINT_MARKER_NAME = "FEA_Point_Marker"
+POINT_RADIUS = 0.1
+
+def get_point_coordinate_array(structural_data):
+    """Return an (N, 3) array of all point coordinates (cached - do not modify)"""
+    return model_index.point_coordinates(structural_data)
+
+def ensure_point_marker(cloud_obj, level='FULL'):
+    """Ensure the marker instanced on every point vertex exists, is parented and matches the level of detail"""
+    marker = bpy.data.objects.get(POINT_MARKER_NAME)
+    if marker is None:
+        marker = bpy.data.objects.new(POINT_MARKER_NAME, bpy.data.meshes.new(POINT_MARKER_NAME))
+        move_to_structural_collection(marker)
     
-    if not start_coords or not end_coords:
-        return None
+    if marker.data.get("fea_lod") != level:
+        bm = bmesh.new()
+        if level == 'FULL':
+            bmesh.ops.create_uvsphere(bm, u_segments=16, v_segments=8, radius=POINT_RADIUS)
+        else:
+            bmesh.ops.create_icosphere(bm, subdivisions=1, radius=POINT_RADIUS)
+        bm.to_mesh(marker.data)
+        bm.free()
+        marker.data["fea_lod"] = level
+    
+    # Children of a vertex instancer are drawn once per parent vertex
+    if marker.parent != cloud_obj:
+        marker.parent = cloud_obj
+    
+    # At LOW the vertices are drawn as bare points instead of instancing the marker
+    low = level == 'LOW'
+    cloud_obj.instance_type = 'NONE' if low else 'VERTS'
+    marker.hide_viewport = low
+    marker.hide_render = low
+    from . import geometry_nodes
+    geometry_nodes.set_point_dots(cloud_obj, low)
+    return marker
+
+def ensure_point_cloud(level='FULL'):
+    """Ensure the single mesh object holding one vertex per structural point exists"""
+    cloud_obj = bpy.data.objects.get(POINT_CLOUD_NAME)
+    if cloud_obj is None:
+        mesh = bpy.data.meshes.new(POINT_CLOUD_NAME)
+        cloud_obj = bpy.data.objects.new(POINT_CLOUD_NAME, mesh)
+        move_to_structural_collection(cloud_obj)
+    
+    ensure_point_marker(cloud_obj, level)
+    return cloud_obj
+
+def sync_point_cloud(structural_data):
+    """Rewrite the point cloud vertices from structural_data.points in one bulk pass"""
+    cloud_obj = ensure_point_cloud(structural_data.point_lod_level)
+    mesh = cloud_obj.data
+    coords = get_point_coordinate_array(structural_data)
+    
+    # Same mesh datablock, new vertex array
+    mesh.clear_geometry()
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', coords.ravel())
+    update_mesh(mesh)
+    set_element_ranges(structural_data.points, np.arange(len(coords)), np.ones(len(coords)))
+    return cloud_obj
+
+def add_point_vertex(point, structural_data):
+    """Append the vertex for a newly added point (must be the last point in the collection)"""
+    cloud_obj = ensure_point_cloud(structural_data.point_lod_level)
+    mesh = cloud_obj.data
+    
+    # Vertex index must match collection index - resync if they have drifted apart
+    if len(mesh.vertices) != len(structural_data.points) - 1:
+        return sync_point_cloud(structural_data)
+    
+    mesh.vertices.add(1)
+    mesh.vertices[-1].co = (point.x, point.y, point.z)
+    update_mesh(mesh)
+    point.geom_start = len(mesh.vertices) - 1
+    point.geom_count = 1
+    return cloud_obj
+
+def update_point_vertex(index, structural_data):
+    """Move the vertex for the point at the given collection index"""
+    cloud_obj = ensure_point_cloud(structural_data.point_lod_level)
+    mesh = cloud_obj.data
     
-    # Calculate beam properties
-    distance = (end_coords - start_coords).length
-    center = (start_coords + end_coords) / 2
+    point = structural_data.points[index]
+    vertex = point.geom_start
+    if len(mesh.vertices) != len(structural_data.points) or not 0 <= vertex < len(mesh.vertices):
+        return sync_point_cloud(structural_data)
     
-    # Get section properties
+    mesh.vertices[vertex].co = (point.x, point.y, point.z)
+    update_mesh(mesh)
+    return cloud_obj
+
+def update_point_visuals(structural_data, indices):
+    """Move the visuals of the points at the given collection indices"""
+    if structural_data.point_display_mode == 'INSTANCED':
+        cloud_obj = ensure_point_cloud(structural_data.point_lod_level)
+        mesh = cloud_obj.data
+        if len(mesh.vertices) != len(structural_data.points):
+            return sync_point_cloud(structural_data)
+        # One bulk write beats many single-vertex edits
+        mesh.vertices.foreach_set('co', get_point_coordinate_array(structural_data).ravel())
+        update_mesh(mesh)
+        return cloud_obj
+    
+    for i in indices:
+        point = structural_data.points[int(i)]
+        obj = get_element_object(point)
+        if obj is not None and tuple(obj.location) != (point.x, point.y, point.z):
+            obj.location = (point.x, point.y, point.z)
+
+# UV-sphere (segments, rings) of point objects at each level of detail
+POINT_SPHERE_SEGMENTS = {'FULL': (32, 16), 'MEDIUM': (8, 4), 'LOW': (4, 3)}
+
+def create_point_sphere(point, level='FULL'):
+    """Create a UV-sphere object for a single point (OBJECTS display mode)"""
+    segments, ring_count = POINT_SPHERE_SEGMENTS[level]
+    with bpy.context.temp_override(**bpy.context.copy()):  # type: ignore
+        bpy.ops.mesh.primitive_uv_sphere_add(segments=segments, ring_count=ring_count,
+                                             radius=POINT_RADIUS, location=(point.x, point.y, point.z))
+    sphere = bpy.context.active_object
+    sphere.name = point.name  # type: ignore
+    point.obj = sphere
+    
+    # Move to Structural Model collection
+    move_to_structural_collection(sphere)
+    return sphere
+
+def create_point_visual(point, structural_data):
+    """Create the visual for a point that has just been appended to structural_data.points"""
+    if structural_data.point_display_mode == 'INSTANCED':
+        return add_point_vertex(point, structural_data)
+    return create_point_sphere(point, structural_data.point_lod_level)
+
+def remove_point_visuals(structural_data):
+    """Remove every point visual - sphere objects, the point cloud and its marker"""
+    for point in structural_data.points:
+        remove_element_object(point)
+    clear_element_ranges(structural_data.points)
+    
+    for name in (POINT_MARKER_NAME, POINT_CLOUD_NAME):
+        if name in bpy.data.objects:
+            bpy.data.objects.remove(bpy.data.objects[name], do_unlink=True)
+
+def rebuild_point_visuals(structural_data):
+    """Recreate all point visuals for the current point display mode"""
+    remove_point_visuals(structural_data)
+    
+    if structural_data.point_display_mode == 'INSTANCED':
+        sync_point_cloud(structural_data)
+    else:
+        for point in structural_data.points:
+            create_point_sphere(point, structural_data.point_lod_level)
+
+def get_section_profile(section):
+    """Return the (section_type, size1, size2, sides, t1, t2) profile of a section"""
+    return geometry.section_profile(
+        section.section_type,
+        diameter=section.poly_diameter if section.section_type == 'POLYGONAL' else section.diameter,
+        width=section.width,
+        height=section.height,
+        sides=section.sides,
+        web_thickness=section.web_thickness,
+        flange_thickness=section.flange_thickness,
+        wall_thickness=section.wall_thickness,
+    )
+
+def get_section_properties(section):
+    """Cached geometry.SectionProperties (A, Iy, Iz, J, Wy, Wz) of a section"""
+    return geometry.section_properties(*get_section_profile(section))
+
+def get_beam_profile(beam, structural_data):
+    """Return the profile (see get_section_profile) for a beam, falling back to its diameter"""
     section = get_section_by_name(beam.section_name, structural_data)
     
     if not section:
         # Fallback to circular with diameter
-        section_type = 'CIRCULAR'
-        size1 = beam.diameter
-        size2 = beam.diameter
-        sides = 8
-    else:
-        section_type = section.section_type
-        if section_type == 'CIRCULAR':
-            size1 = section.diameter
-            size2 = section.diameter
-            sides = 8
-        elif section_type == 'RECTANGULAR':
-            size1 = section.width
-            size2 = section.height
-            sides = 4
-        elif section_type == 'POLYGONAL':
-            size1 = section.poly_diameter
-            size2 = section.poly_diameter
-            sides = section.sides
-    
-    # Create beam based on section type
-    if section_type == 'RECTANGULAR':
-        beam_obj = create_rectangular_beam(center, start_coords, end_coords, size1, size2, distance)
+        return geometry.section_profile('CIRCULAR', diameter=beam.diameter)
+    return get_section_profile(section)
+
+def get_display_profile(beam, structural_data):
+    """The profile a beam is drawn with at the current beam level of detail (see lod)"""
+    profile = get_beam_profile(beam, structural_data)
+    if structural_data.beam_lod_level == 'MEDIUM':
+        return geometry.box_profile(*profile)
+    return profile
+
+# Shared section meshes - every beam of a section links the same unit-length
+# prism and is stretched to its length by its object scale
+SECTION_MESH_PREFIX = "FEA_Section_"
+
+def section_mesh_name(beam, structural_data):
+    """Name of the shared mesh for a beam: its section's, or one per fallback diameter"""
+    if get_section_by_name(beam.section_name, structural_data):
+        return SECTION_MESH_PREFIX + beam.section_name
+    return f"{SECTION_MESH_PREFIX}D{beam.diameter:g}"
+
+def get_section_mesh(name, profile, lines=False):
+    """The shared unit-length mesh for a profile, (re)built only if missing or out of date
+    
+    With lines=True the mesh is a single edge along the beam axis (LOW level of detail).
+    """
+    mesh = bpy.data.meshes.get(name)
+    stamp = "LINE" if lines else repr(tuple(profile))
+    if mesh is not None and mesh.get("fea_profile") == stamp:
+        return mesh
+    
+    if mesh is None:
+        mesh = bpy.data.meshes.new(name)
+    if lines:
+        geometry.write_line_arrays(mesh, [(0.0, 0.0, -0.5), (0.0, 0.0, 0.5)], [(0, 1)])
     else:
-        # Circular or Polygonal
-        beam_obj = create_polygonal_beam(center, start_coords, end_coords, size1, sides, distance)
+        template = geometry.profile_template(*profile)
+        geometry.write_mesh_arrays(
+            mesh,
+            geometry.prism_local_vertices(template, 1.0),
+            template.face_loop_starts,
+            template.loop_indices
+        )
+    mesh["fea_profile"] = stamp
+    return mesh
+
+def get_beam_mesh(beam, structural_data):
+    return get_section_mesh(
+        section_mesh_name(beam, structural_data),
+        get_display_profile(beam, structural_data),
+        lines=structural_data.beam_lod_level == 'LOW'
+    )
+
+def refresh_section_mesh(section, structural_data):
+    """Bring a section's shared mesh up to date after an edit - every beam using it follows"""
+    name = SECTION_MESH_PREFIX + section.name
+    if name in bpy.data.meshes:
+        profile = get_section_profile(section)
+        if structural_data.beam_lod_level == 'MEDIUM':
+            profile = geometry.box_profile(*profile)
+        get_section_mesh(name, profile, lines=structural_data.beam_lod_level == 'LOW')
+
+def refresh_beam_meshes(structural_data):
+    """Bring every shared beam mesh up to date, e.g. after a level of detail change"""
+    refreshed = set()
+    for beam in structural_data.beams:
+        name = section_mesh_name(beam, structural_data)
+        if name not in refreshed:
+            refreshed.add(name)
+            get_beam_mesh(beam, structural_data)
+
+def create_beam_from_data(beam, structural_data):
+    """Create a beam object linking its section's shared mesh"""
+    start_coords = get_node_coordinates(beam.start_node, beam.start_point, structural_data)
+    end_coords = get_node_coordinates(beam.end_node, beam.end_point, structural_data)
     
-    beam_obj.name = beam.name   # type: ignore
+    if not start_coords or not end_coords:
+        return None
+    
+    matrices = geometry.unit_frame_matrices([start_coords], [end_coords])
+    beam_obj = bpy.data.objects.new(beam.name, get_beam_mesh(beam, structural_data))
+    beam_obj.matrix_world = Matrix(matrices[0].tolist())
+    beam.obj = beam_obj
     
     # Move to Structural Model collection
     move_to_structural_collection(beam_obj)
@@ -206,102 +556,669 @@ def create_beam_from_data(beam, structural_data):
 
 def get_section_by_name(section_name, structural_data):
     """Find section by name in structural data"""
-    for section in structural_data.sections:
-        if section.name == section_name:
-            return section
-    return None
+    return model_index.get_element(structural_data, 'sections', section_name)
+
+# Batch beam building - all beams resolved and laid out in one NumPy pass
+BEAM_MESH_NAME = "FEA_Beams"
+BEAM_EDGES_NAME = "FEA_Beam_Edges"
+# Display modes where all beams share one object, rebuilt as a whole
+SHARED_BEAM_MODES = ('MERGED', 'GEOMETRY_NODES')
 
-def create_rectangular_beam(center, start_coords, end_coords, width, height, distance):
-    """Create rectangular beam using cube primitive with correct orientation"""
-    if bpy.context.copy() is None:
-        raise ValueError("bpy.context.copy() is None")
+def collect_beam_arrays(structural_data, beams=None):
+    """Resolve beams to coordinate and profile arrays for the batch builders
     
-    with bpy.context.temp_override(**bpy.context.copy()):    # type: ignore
-        bpy.ops.mesh.primitive_cube_add(size=1.0, location=center)
+    Returns (beam_indices, starts, ends, template_ids, templates) for every beam
+    whose end points exist; beams with missing points are left out.
+    """
+    start_indices, end_indices = get_beam_end_indices(structural_data, beams)
+    beams = structural_data.beams if beams is None else beams
+    coords = get_point_coordinate_array(structural_data)
     
-    beam_obj = bpy.context.active_object
+    beam_indices = []
+    start_ids = []
+    end_ids = []
+    template_ids = []
+    templates = []
+    template_lookup = {}
     
-    # Scale to rectangular cross-section
-    # Note: X=width, Y=height, Z=length (distance)
-    beam_obj.scale = (width/2, height/2, distance)   # type: ignore
+    for i, beam in enumerate(beams):
+        start_id = start_indices[i]
+        end_id = end_indices[i]
+        if start_id < 0 or end_id < 0:
+            continue
+        
+        profile = get_display_profile(beam, structural_data)
+        if profile not in template_lookup:
+            template_lookup[profile] = len(templates)
+            templates.append(geometry.profile_template(*profile))
+        
+        beam_indices.append(i)
+        start_ids.append(start_id)
+        end_ids.append(end_id)
+        template_ids.append(template_lookup[profile])
     
-    # Apply scale
-    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+    return (
+        np.array(beam_indices, dtype=np.int64),
+        coords[start_ids].astype(np.float64),
+        coords[end_ids].astype(np.float64),
+        np.array(template_ids, dtype=np.int64),
+        templates,
+    )
+
+def write_beam_index(mesh, domain, values):
+    """Write the beam_index INT attribute on faces (prisms) or edges (lines)"""
+    attribute = mesh.attributes.get("beam_index")
+    if attribute is not None and attribute.domain != domain:
+        mesh.attributes.remove(attribute)
+        attribute = None
+    if attribute is None:
+        attribute = mesh.attributes.new("beam_index", 'INT', domain)
+    attribute.data.foreach_set('value', np.ascontiguousarray(values, dtype=np.int32))
+
+def build_merged_beams(structural_data):
+    """Write every beam into the single FEA_Beams mesh (MERGED display mode)
+    
+    At the LOW level of detail every beam is a loose edge instead of a prism.
+    """
+    beam_indices, starts, ends, template_ids, templates = collect_beam_arrays(structural_data)
+    
+    beam_obj = bpy.data.objects.get(BEAM_MESH_NAME)
+    if beam_obj is None:
+        beam_obj = bpy.data.objects.new(BEAM_MESH_NAME, bpy.data.meshes.new(BEAM_MESH_NAME))
+        move_to_structural_collection(beam_obj)
+    mesh = beam_obj.data
+    
+    if not len(beam_indices):
+        mesh.clear_geometry()
+        clear_element_ranges(structural_data.beams)
+        return beam_obj
+    
+    if structural_data.beam_lod_level == 'LOW':
+        # One loose edge per beam
+        verts = np.stack([starts, ends], axis=1).reshape(-1, 3)
+        edges = np.arange(len(verts)).reshape(-1, 2)
+        geometry.write_line_arrays(mesh, verts, edges)
+        write_beam_index(mesh, 'EDGE', beam_indices)
+        set_element_ranges(structural_data.beams, *geometry.owner_ranges(beam_indices, len(structural_data.beams)))
+        return beam_obj
     
-    # Rotate to align with points
-    # We need to align the Z-axis (length) with the beam direction
-    direction = (end_coords - start_coords).normalized()
+    arrays = geometry.build_beam_arrays(starts, ends, template_ids, templates)
+    geometry.write_mesh_arrays(mesh, arrays['verts'], arrays['face_loop_starts'], arrays['loop_indices'])
     
-    # Create rotation to point Z-axis along the beam direction
-    beam_obj.rotation_euler = direction.to_track_quat('Z', 'Y').to_euler()   # type: ignore
+    # Face -> beam collection index, so faces can be traced back to their beam
+    write_beam_index(mesh, 'FACE', beam_indices[arrays['face_beam']])
+    set_element_ranges(structural_data.beams,
+                       *geometry.owner_ranges(beam_indices[arrays['face_beam']], len(structural_data.beams)))
     
     return beam_obj
 
-def create_polygonal_beam(center, start_coords, end_coords, diameter, sides, distance):
-    """Create circular or polygonal beam using cylinder primitive with correct orientation"""
-    with bpy.context.temp_override(**bpy.context.copy()):     # type: ignore
-        bpy.ops.mesh.primitive_cylinder_add(
-            vertices=sides,
-            radius=diameter/2,
-            depth=distance,  # This should now be correct
-            location=center
-        )
+def iter_beam_objects(structural_data):
+    """Create one object per beam (OBJECTS display mode) sharing one mesh per section
     
-    beam_obj = bpy.context.active_object
+    All transforms are computed in one pass; each object only gets its matrix.
+    Yields the objects one at a time so callers can spread the work out.
+    """
+    start_indices, end_indices = get_beam_end_indices(structural_data)
+    beam_indices = np.flatnonzero((start_indices >= 0) & (end_indices >= 0))
+    if not len(beam_indices):
+        return
     
-    # Rotate to align with points
-    # The cylinder primitive creates with depth along Z-axis
-    direction = (end_coords - start_coords).normalized()
-    beam_obj.rotation_euler = direction.to_track_quat('Z', 'Y').to_euler()   # type: ignore
+    coords = get_point_coordinate_array(structural_data).astype(np.float64)
+    matrices = geometry.unit_frame_matrices(coords[start_indices[beam_indices]], coords[end_indices[beam_indices]])
+    structural_collection = ensure_structural_collection()
     
-    return beam_obj
+    beams = structural_data.beams
+    meshes = {}
+    for k, beam_index in enumerate(beam_indices):
+        beam = beams[int(beam_index)]
+        mesh_name = section_mesh_name(beam, structural_data)
+        mesh = meshes.get(mesh_name)
+        if mesh is None:
+            mesh = meshes[mesh_name] = get_beam_mesh(beam, structural_data)
+        beam_obj = bpy.data.objects.new(beam.name, mesh)
+        beam_obj.matrix_world = Matrix(matrices[k].tolist())
+        structural_collection.objects.link(beam_obj)
+        beam.obj = beam_obj
+        yield beam_obj
 
-def create_shell_from_data(shell, structural_data):
-    """Create shell geometry from shell data and place in Structural Model collection"""
-    point_names = [name.strip() for name in shell.point_list.split(",")]
-    vertices = []
+def create_beam_objects(structural_data):
+    """Create one object per beam (OBJECTS display mode), returning the objects"""
+    return list(iter_beam_objects(structural_data))
+
+def build_beam_visuals(structural_data):
+    """Create geometry for every beam in the current beam display mode"""
+    if structural_data.beam_display_mode == 'MERGED':
+        return build_merged_beams(structural_data)
+    if structural_data.beam_display_mode == 'GEOMETRY_NODES':
+        from . import geometry_nodes
+        return geometry_nodes.build_beam_edges(structural_data)
+    return create_beam_objects(structural_data)
+
+def remove_beam_visuals(structural_data):
+    """Remove every beam visual - per-beam objects, the merged beam mesh and the beam edge mesh"""
+    for beam in structural_data.beams:
+        remove_element_object(beam)
+    clear_element_ranges(structural_data.beams)
+    
+    remove_object(BEAM_MESH_NAME)
+    remove_object(BEAM_EDGES_NAME)
+
+def rebuild_beam_visuals(structural_data):
+    """Recreate all beam visuals for the current beam display mode"""
+    remove_beam_visuals(structural_data)
+    build_beam_visuals(structural_data)
+
+def apply_level_of_detail(structural_data, kinds=('points', 'beams')):
+    """Redraw points and/or beams that are already drawn at their current level of detail (see lod)
+    
+    Shared meshes are rewritten in place; point objects keep the sphere they were created with.
+    """
+    if 'points' in kinds and structural_data.point_display_mode == 'INSTANCED':
+        if POINT_CLOUD_NAME in bpy.data.objects:
+            ensure_point_cloud(structural_data.point_lod_level)
     
-    for point_name in point_names:
-        coords = get_point_coordinates(point_name, structural_data)
-        if coords:
-            vertices.append(coords)
+    if 'beams' in kinds:
+        mode = structural_data.beam_display_mode
+        if mode == 'OBJECTS':
+            refresh_beam_meshes(structural_data)
+        elif (BEAM_MESH_NAME if mode == 'MERGED' else BEAM_EDGES_NAME) in bpy.data.objects:
+            build_beam_visuals(structural_data)
+
+def remove_object(name):
+    """Remove the named object, if there is one"""
+    if name in bpy.data.objects:
+        bpy.data.objects.remove(bpy.data.objects[name], do_unlink=True)
+
+# Element -> geometry references. An element drawn by an object of its own
+# points at it (element.obj), so renames - including Blender's ".001"
+# suffixes - never lose it; an element drawn inside a shared mesh records
+# its run of vertices, faces or edges there (geom_start, geom_count).
+def get_element_object(element):
+    """The object drawing a point, beam or shell on its own, or None"""
+    return element.obj
+
+def remove_element_object(element):
+    """Remove the object drawing an element on its own, if it has one"""
+    obj = element.obj
+    if obj is not None:
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+def get_element_ranges(collection):
+    """(starts, counts) of every element's run in its shared display mesh, read in bulk (start -1 when not drawn)"""
+    starts = np.empty(len(collection), dtype=np.int32)
+    counts = np.empty(len(collection), dtype=np.int32)
+    collection.foreach_get('geom_start', starts)
+    collection.foreach_get('geom_count', counts)
+    return starts, counts
+
+def set_element_ranges(collection, starts, counts):
+    """Record every element's run in a shared display mesh in one bulk write (start -1 when not drawn)"""
+    collection.foreach_set('geom_start', np.ascontiguousarray(starts, dtype=np.int32))
+    collection.foreach_set('geom_count', np.ascontiguousarray(counts, dtype=np.int32))
+
+def clear_element_ranges(collection):
+    set_element_ranges(collection, np.full(len(collection), -1), np.zeros(len(collection)))
+
+def shared_display_mesh(structural_data, kind):
+    """(object, domain, index attribute) of the shared mesh drawing beams or shells, or None
     
-    if len(vertices) < 3:
+    None when each element has its own object, or the mesh is not there.
+    """
+    if kind == 'beams' and structural_data.beam_display_mode == 'MERGED':
+        obj = bpy.data.objects.get(BEAM_MESH_NAME)
+        domain = 'EDGE' if structural_data.beam_lod_level == 'LOW' else 'FACE'
+    elif kind == 'shells' and structural_data.shell_display_mode == 'MERGED':
+        obj = bpy.data.objects.get(SHELL_MESH_NAME)
+        domain = 'FACE'
+    else:
         return None
+    if obj is None:
+        return None
+    return obj, domain, "beam_index" if kind == 'beams' else "shell_index"
+
+def mesh_domain_size(mesh, domain):
+    """Number of faces or edges of a mesh"""
+    return len(mesh.polygons) if domain == 'FACE' else len(mesh.edges)
+
+def link_element_objects(structural_data):
+    """Point elements from older files at their objects by name - once, they are kept from then on
     
-    # Create mesh and object
-    mesh = bpy.data.meshes.new(shell.name)
-    obj = bpy.data.objects.new(shell.name, mesh)
+    Beams and shells drawn in a merged mesh get their ranges back from its
+    beam_index / shell_index attribute instead.
+    """
+    for kind, mode in (('points', structural_data.point_display_mode),
+                       ('beams', structural_data.beam_display_mode),
+                       ('shells', structural_data.shell_display_mode)):
+        collection = getattr(structural_data, kind)
+        if mode == 'OBJECTS':
+            for element in collection:
+                if element.obj is None:
+                    element.obj = bpy.data.objects.get(element.name)
+            continue
+        
+        shared = shared_display_mesh(structural_data, kind)
+        if shared is None:
+            continue
+        obj, domain, index_name = shared
+        attribute = obj.data.attributes.get(index_name)
+        starts, _counts = get_element_ranges(collection)
+        if attribute is None or attribute.domain != domain or (starts >= 0).any():
+            continue
+        owner = np.empty(len(attribute.data), dtype=np.int32)
+        attribute.data.foreach_get('value', owner)
+        set_element_ranges(collection, *geometry.owner_ranges(owner, len(collection)))
+
+def remove_shared_geometry(structural_data, kind, indices):
+    """Delete the faces or edges of the given beams or shells from their merged mesh, through their ranges
     
-    # Move to Structural Model collection (instead of default collection)
-    move_to_structural_collection(obj)
+    Call before the elements are removed from their collection. The
+    index attribute is renumbered for the shrunk collection; returns the
+    ranges to record once the elements are gone, or None if the mesh has to
+    be rebuilt instead.
+    """
+    shared = shared_display_mesh(structural_data, kind)
+    if shared is None:
+        return None
+    obj, domain, index_name = shared
+    mesh = obj.data
+    
+    starts, counts = get_element_ranges(getattr(structural_data, kind))
+    drawn = starts >= 0
+    if counts[drawn].sum() != mesh_domain_size(mesh, domain) or index_name not in mesh.attributes:
+        return None
+    
+    removed = np.zeros(len(starts), dtype=bool)
+    removed[np.asarray(indices, dtype=np.int64)] = True
+    doomed = geometry.range_positions(starts[removed & drawn], counts[removed & drawn])
+    
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    if domain == 'FACE':
+        bm.faces.ensure_lookup_table()
+        bmesh.ops.delete(bm, geom=[bm.faces[int(i)] for i in doomed], context='FACES')
+    else:
+        bm.edges.ensure_lookup_table()
+        bmesh.ops.delete(bm, geom=[bm.edges[int(i)] for i in doomed], context='EDGES')
+    bm.to_mesh(mesh)
+    bm.free()
+    
+    # Later elements move down by the faces/edges removed before them
+    shift = np.cumsum(np.where(removed & drawn, counts, 0)) - np.where(removed & drawn, counts, 0)
+    kept = ~removed
+    new_starts = np.where(drawn, starts - shift, -1)[kept]
+    new_counts = counts[kept]
+    owner = geometry.range_owner(new_starts, new_counts, mesh_domain_size(mesh, domain))
+    mesh.attributes[index_name].data.foreach_set('value', owner.astype(np.int32))
+    update_mesh(mesh)
+    return new_starts, new_counts
+
+# Share of a collection above which a whole merged mesh is rebuilt in one
+# batch rather than rewritten element by element
+IN_PLACE_LIMIT = 0.25
+
+def update_merged_beams(structural_data, beam_indices):
+    """Rewrite the vertices of the given beams in the merged beam mesh, in place through their ranges
+    
+    Returns False, without writing anything, when a beam's layout no longer
+    fits its run (it became drawable or not, or its profile changed shape)
+    or when so many beams changed that one rebuild is cheaper.
+    """
+    beam_obj = bpy.data.objects.get(BEAM_MESH_NAME)
+    beams = structural_data.beams
+    if beam_obj is None or len(beam_indices) > IN_PLACE_LIMIT * len(beams):
+        return False
+    mesh = beam_obj.data
+    
+    subset = [beams[int(b)] for b in beam_indices]
+    drawn, starts, ends, template_ids, templates = collect_beam_arrays(structural_data, subset)
+    if len(drawn) != len(subset):
+        return False
+    
+    writes = []
+    if structural_data.beam_lod_level == 'LOW':
+        # One loose edge per beam
+        for k, beam in enumerate(subset):
+            if beam.geom_start < 0 or beam.geom_count != 1 or beam.geom_start >= len(mesh.edges):
+                return False
+            writes.append((mesh.edges[beam.geom_start].vertices, (starts[k], ends[k])))
+    else:
+        arrays = geometry.build_beam_arrays(starts, ends, template_ids, templates)
+        vertex_start = arrays['vertex_start']
+        for k, beam in enumerate(subset):
+            first, count = beam.geom_start, beam.geom_count
+            if first < 0 or count != templates[template_ids[k]].face_count or first + count > len(mesh.polygons):
+                return False
+            # A beam's vertices are one run, starting at the lowest one its faces use
+            vertex = min(min(mesh.polygons[f].vertices) for f in range(first, first + count))
+            verts = arrays['verts'][vertex_start[k]:vertex_start[k + 1]]
+            if vertex + len(verts) > len(mesh.vertices):
+                return False
+            writes.append((range(vertex, vertex + len(verts)), verts))
+    
+    for vertices, coords in writes:
+        for vertex, co in zip(vertices, coords):
+            mesh.vertices[vertex].co = co
+    update_mesh(mesh)
+    return True
+
+def update_merged_shells(structural_data, shell_indices):
+    """Move the vertices of the given shells in the merged shell mesh, in place through their ranges
+    
+    Faces keep their triangulation. Returns False, without writing
+    anything, when a shell's faces no longer use the shell's points (its
+    point list changed) or when so many shells changed that one rebuild is
+    cheaper.
+    """
+    shell_obj = bpy.data.objects.get(SHELL_MESH_NAME)
+    shells = structural_data.shells
+    if shell_obj is None or len(shell_indices) > IN_PLACE_LIMIT * len(shells):
+        return False
+    mesh = shell_obj.data
+    point_attribute = mesh.attributes.get("point_index")
+    if point_attribute is None or point_attribute.domain != 'POINT':
+        return False
+    
+    offsets, point_indices = model_index.shell_point_indices(structural_data)
+    vertex_points = {}
+    for h in shell_indices:
+        shell = shells[int(h)]
+        first, count = shell.geom_start, shell.geom_count
+        if first < 0 or first + count > len(mesh.polygons):
+            return False
+        vertices = {vertex for f in range(first, first + count) for vertex in mesh.polygons[f].vertices}
+        points = {vertex: point_attribute.data[vertex].value for vertex in vertices}
+        if set(points.values()) != set(point_indices[offsets[h]:offsets[h + 1]].tolist()):
+            return False
+        vertex_points.update(points)
+    
+    coords = get_point_coordinate_array(structural_data)
+    for vertex, point in vertex_points.items():
+        mesh.vertices[vertex].co = coords[point]
+    update_mesh(mesh)
+    return True
+
+def rebuild_members(structural_data, beam_indices=(), shell_indices=()):
+    """Regenerate the geometry of the given beams and shells only
+    
+    Merged and Geometry Nodes displays are rewritten in place, through the
+    elements' geom_start / geom_count ranges, as long as the layout still
+    fits; otherwise the shared mesh is rebuilt.
+    """
+    resolve_deferred_nodes(structural_data)
+    if len(beam_indices):
+        if structural_data.beam_display_mode == 'GEOMETRY_NODES':
+            from . import geometry_nodes
+            if not geometry_nodes.update_beam_edges(structural_data, beam_indices):
+                # Rewrites every edge, or rebuilds the mesh if the edges changed
+                geometry_nodes.update_beam_attributes(structural_data)
+        elif structural_data.beam_display_mode == 'MERGED':
+            if not update_merged_beams(structural_data, beam_indices):
+                build_merged_beams(structural_data)
+        else:
+            for b in beam_indices:
+                beam = structural_data.beams[int(b)]
+                remove_element_object(beam)
+                create_beam_from_data(beam, structural_data)
+    
+    if len(shell_indices):
+        if structural_data.shell_display_mode == 'MERGED':
+            if not update_merged_shells(structural_data, shell_indices):
+                build_merged_shells(structural_data)
+        else:
+            for h in shell_indices:
+                shell = structural_data.shells[int(h)]
+                remove_element_object(shell)
+                create_shell_from_data(shell, structural_data)
+
+def remove_members(structural_data, beam_indices=(), shell_indices=()):
+    """Delete the given beams and shells, data and visuals"""
+    for kind, indices in (('beams', beam_indices), ('shells', shell_indices)):
+        if not len(indices):
+            continue
+        collection = getattr(structural_data, kind)
+        # Merged meshes lose just the removed faces or edges
+        ranges = remove_shared_geometry(structural_data, kind, indices)
+        for i in sorted((int(i) for i in indices), reverse=True):
+            remove_element_object(collection[i])
+            collection.remove(i)
+        model_index.invalidate(structural_data, kind)
+        
+        if ranges is not None:
+            set_element_ranges(collection, *ranges)
+        elif kind == 'beams' and structural_data.beam_display_mode in SHARED_BEAM_MODES:
+            build_beam_visuals(structural_data)
+        elif kind == 'shells' and structural_data.shell_display_mode == 'MERGED':
+            build_merged_shells(structural_data)
+
+def _drop_repeated(names):
+    """Collapse consecutive repeats (including last -> first) left by merging a shell's nodes"""
+    kept = [name for i, name in enumerate(names) if i == 0 or name != names[i - 1]]
+    while len(kept) > 1 and kept[-1] == kept[0]:
+        kept.pop()
+    return kept
+
+def merge_coincident_points(structural_data, tolerance, rebuild=True):
+    """Merge points closer together than tolerance
+    
+    Beams and shells are moved onto the point that is kept (the first of each
+    group) and the other points are deleted. With rebuild, visuals of the
+    affected members are regenerated. Returns the number of points removed.
+    """
+    points = structural_data.points
+    keep = spatial.coincident_representatives(model_index.point_coordinates(structural_data), tolerance)
+    merged = np.flatnonzero(keep != np.arange(len(keep)))
+    if not len(merged):
+        return 0
+    
+    node_ids = np.empty(len(points), dtype=np.int32)
+    points.foreach_get('node_id', node_ids)
+    names = [point.name for point in points]
+    
+    # Read shell connectivity before any edit invalidates it
+    offsets, shell_nodes = model_index.shell_connectivity(structural_data)
+    shell_points = model_index.node_indices(structural_data, shell_nodes)
+    moved = (shell_points >= 0) & (keep[shell_points] != shell_points)
+    changed_shells = model_index.shells_using(structural_data, np.flatnonzero(moved))
+    
+    beams = structural_data.beams
+    changed_beams = set()
+    ids = np.empty(len(beams), dtype=np.int32)
+    for node_attr, name_attr in (('start_node', 'start_point'), ('end_node', 'end_point')):
+        beams.foreach_get(node_attr, ids)
+        ends = model_index.node_indices(structural_data, ids)
+        for b in np.flatnonzero((ends >= 0) & (keep[ends] != ends)):
+            target = keep[ends[b]]
+            setattr(beams[int(b)], name_attr, names[target])
+            setattr(beams[int(b)], node_attr, int(node_ids[target]))
+            changed_beams.add(int(b))
+    
+    for h in changed_shells:
+        shell = structural_data.shells[int(h)]
+        old_names = model_index.split_point_list(shell.point_list)
+        segment = shell_points[offsets[h]:offsets[h + 1]]
+        new_names = [names[keep[i]] if i >= 0 else old_names[k] for k, i in enumerate(segment)]
+        shell.point_list = ", ".join(_drop_repeated(new_names))
+    
+    # Delete the merged points - a few one by one, many by rewriting the collection
+    if structural_data.point_display_mode == 'OBJECTS':
+        for i in merged:
+            remove_element_object(points[int(i)])
+    if len(merged) <= 64:
+        for i in merged[::-1]:
+            points.remove(int(i))
+    else:
+        kept = np.flatnonzero(keep == np.arange(len(keep)))
+        xyz = np.empty((3, len(points)), dtype=np.float32)
+        for axis, attr in enumerate(('x', 'y', 'z')):
+            points.foreach_get(attr, xyz[axis])
+        objects = [point.obj for point in points]
+        points.clear()
+        for i in kept:
+            point = points.add()
+            point.name = names[i]
+            point.obj = objects[i]
+        for axis, attr in enumerate(('x', 'y', 'z')):
+            points.foreach_set(attr, xyz[axis][kept])
+        points.foreach_set('node_id', node_ids[kept])
+    
+    model_index.invalidate(structural_data)
+    structural_data.active_point_index = min(structural_data.active_point_index, len(points) - 1)
+    
+    if rebuild:
+        if structural_data.point_display_mode == 'INSTANCED':
+            sync_point_cloud(structural_data)
+        rebuild_members(structural_data, sorted(changed_beams), changed_shells)
+    return len(merged)
+
+# Merged shells - every shell in one mesh, thickness from a Geometry Nodes offset
+SHELL_MESH_NAME = "FEA_Shells"
+
+def build_merged_shells(structural_data):
+    """Write every shell into the single FEA_Shells mesh (MERGED shell display mode)
+    
+    Faces come straight from the shell connectivity arrays; warped polygons
+    are triangulated. Each face carries fea_thickness and shell_index
+    attributes, and the thickness is drawn by a Geometry Nodes extrusion.
+    """
+    resolve_deferred_nodes(structural_data)
+    from . import geometry_nodes
+    
+    shell_obj = bpy.data.objects.get(SHELL_MESH_NAME)
+    if shell_obj is None:
+        shell_obj = bpy.data.objects.new(SHELL_MESH_NAME, bpy.data.meshes.new(SHELL_MESH_NAME))
+        move_to_structural_collection(shell_obj)
+    mesh = shell_obj.data
+    
+    # Shells with every node resolved and at least 3 of them
+    offsets, point_indices = model_index.shell_point_indices(structural_data)
+    sizes = np.diff(offsets)
+    owner = geometry.polygon_owner(offsets)
+    complete = sizes >= 3
+    complete[owner[point_indices < 0]] = False
+    shell_indices = np.flatnonzero(complete)
+    
+    if not len(shell_indices):
+        mesh.clear_geometry()
+        clear_element_ranges(structural_data.shells)
+        return shell_obj
+    
+    shell_offsets = np.zeros(len(shell_indices) + 1, dtype=np.int64)
+    np.cumsum(sizes[shell_indices], out=shell_offsets[1:])
+    used, local = np.unique(point_indices[complete[owner]], return_inverse=True)
+    coords = get_point_coordinate_array(structural_data)[used].astype(np.float64)
+    faces = geometry.triangulate_polygons(coords, shell_offsets, local)
+    geometry.write_mesh_arrays(mesh, coords, faces['face_loop_starts'], faces['loop_indices'])
+    
+    shells = structural_data.shells
+    thickness = np.empty(len(shells), dtype=np.float32)
+    shells.foreach_get('thickness', thickness)
+    face_shell = shell_indices[faces['face_polygon']]
+    
+    attribute = mesh.attributes.get("fea_thickness") or mesh.attributes.new("fea_thickness", 'FLOAT', 'FACE')
+    attribute.data.foreach_set('value', thickness[face_shell])
+    attribute = mesh.attributes.get("shell_index") or mesh.attributes.new("shell_index", 'INT', 'FACE')
+    attribute.data.foreach_set('value', face_shell.astype(np.int32))
+    # Vertex -> point, so moved points can be written in place (update_merged_shells)
+    attribute = mesh.attributes.get("point_index") or mesh.attributes.new("point_index", 'INT', 'POINT')
+    attribute.data.foreach_set('value', used.astype(np.int32))
+    set_element_ranges(shells, *geometry.owner_ranges(face_shell, len(shells)))
+    
+    geometry_nodes.ensure_nodes_modifier(shell_obj, geometry_nodes.SHELL_MODIFIER_NAME, geometry_nodes.ensure_shell_tree())
+    return shell_obj
+
+def update_shell_thickness_attribute(structural_data):
+    """Rewrite fea_thickness of the merged shell mesh from the shells' current thickness"""
+    shell_obj = bpy.data.objects.get(SHELL_MESH_NAME)
+    if shell_obj is None or "shell_index" not in shell_obj.data.attributes:
+        return
+    mesh = shell_obj.data
+    
+    face_shell = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.attributes["shell_index"].data.foreach_get('value', face_shell)
+    shells = structural_data.shells
+    thickness = np.empty(len(shells), dtype=np.float32)
+    shells.foreach_get('thickness', thickness)
+    if len(face_shell) and face_shell.max() >= len(shells):
+        # Shells were removed since the mesh was built
+        build_merged_shells(structural_data)
+        return
+    mesh.attributes["fea_thickness"].data.foreach_set('value', thickness[face_shell])
+    update_mesh(mesh)
+
+def build_shell_visuals(structural_data):
+    """Create geometry for every shell in the current shell display mode"""
+    if structural_data.shell_display_mode == 'MERGED':
+        return build_merged_shells(structural_data)
+    return [create_shell_from_data(shell, structural_data) for shell in structural_data.shells]
+
+def remove_shell_visuals(structural_data):
+    """Remove every shell visual - per-shell objects and the merged shell mesh"""
+    for shell in structural_data.shells:
+        remove_element_object(shell)
+    clear_element_ranges(structural_data.shells)
+    remove_object(SHELL_MESH_NAME)
+
+def rebuild_shell_visuals(structural_data):
+    """Recreate all shell visuals for the current shell display mode"""
+    remove_shell_visuals(structural_data)
+    build_shell_visuals(structural_data)
+
+def update_shell_visual(shell, structural_data):
+    """Redraw one shell after it was added or edited, returning the object showing it"""
+    resolve_deferred_nodes(structural_data)
+    if structural_data.shell_display_mode == 'MERGED':
+        return build_merged_shells(structural_data)
+    remove_element_object(shell)
+    return create_shell_from_data(shell, structural_data)
+
+def create_shell_from_data(shell, structural_data):
+    """Create shell geometry from shell data and place in Structural Model collection"""
+    coords = np.asarray(get_shell_coordinates(shell, structural_data), dtype=np.float64)
+    
+    if len(coords) < 3:
+        return None
+    
+    # Warped shells are split into triangles, flat ones stay one face
+    offsets = np.array([0, len(coords)])
+    faces = geometry.triangulate_polygons(coords, offsets, np.arange(len(coords)))
+    normal = geometry.polygon_normals(coords, offsets)[0]
+    normal /= max(np.linalg.norm(normal), geometry.MIN_BEAM_LENGTH)
     
     # Create bmesh
     bm = bmesh.new()
     
-    # Add vertices and create face
-    bm_verts = [bm.verts.new(v) for v in vertices]
+    # Add vertices and create faces
+    bm_verts = [bm.verts.new(co) for co in coords]
+    loop_ends = np.append(faces['face_loop_starts'][1:], len(faces['loop_indices']))
     
     try:
-        face = bm.faces.new(bm_verts)
+        bm_faces = [bm.faces.new([bm_verts[i] for i in faces['loop_indices'][start:end]])
+                    for start, end in zip(faces['face_loop_starts'], loop_ends)]
         bm.faces.ensure_lookup_table()
     except ValueError:
-        print(f"Could not create face for shell {shell.name}")
+        log.warning(f"Could not create face for shell {shell.name}")
         bm.free()
         return None
     
     # Extrude for thickness if specified
     if shell.thickness > 0:
-        extruded = bmesh.ops.extrude_face_region(bm, geom=[face])
+        extruded = bmesh.ops.extrude_face_region(bm, geom=bm_faces)
         bmesh.ops.translate(
             bm, 
-            vec=face.normal * shell.thickness,
+            vec=Vector(normal) * shell.thickness,
             verts=[v for v in extruded['geom'] if isinstance(v, bmesh.types.BMVert)]
         )
     
+    # Only a shell that could be built gets a mesh and object
+    mesh = bpy.data.meshes.new(shell.name)
     bm.to_mesh(mesh)
     bm.free()
     
+    obj = bpy.data.objects.new(shell.name, mesh)
+    # Move to Structural Model collection (instead of default collection)
+    move_to_structural_collection(obj)
+    shell.obj = obj
+    
     return obj
 
 
@@ -0,0 +1,183 @@
+"""
+Whole-model validation on StructuralModel arrays
+
+Every check works on the model's arrays at once - a handful of NumPy
+operations per check, whatever the size of the model - and reports every
+offending element, by index and name, in a single Diagnostic:
+
+    dangling_point        beam or shell refers to a point that does not exist
+    dangling_section      beam refers to a section that does not exist
+    zero_length_beam      beam whose ends coincide
+    degenerate_shell      shell with fewer than 3 distinct vertices or no area
+    duplicate_vertex      shell that uses the same point more than once
+    duplicate_name        two elements of one kind share a name
+    unused_section        section no beam refers to
+    invalid_section       open or hollow section whose walls are too thick for it
+
+No bpy in here - it can be used outside Blender.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from . import geometry
+
+ERROR = 'ERROR'
+WARNING = 'WARNING'
+
+Diagnostic = namedtuple('Diagnostic', 'severity code kind indices names message')
+Diagnostic.__doc__ = """One validation finding covering every element it applies to
+
+indices are the elements' positions in their collection (an int array) and
+names their names, in the same order.
+"""
+
+# Shells with less area than this (relative to their size squared) count as degenerate
+MIN_RELATIVE_AREA = 1e-9
+
+
+def _diagnostic(severity, code, kind, indices, all_names, message):
+    indices = np.unique(np.asarray(indices, dtype=np.int64))
+    return Diagnostic(severity, code, kind, indices, [all_names[i] for i in indices], message)
+
+def check_references(model):
+    """Beams and shells whose points or section do not resolve"""
+    found = []
+
+    beams = np.flatnonzero(np.any(model.beam_nodes < 0, axis=1))
+    if len(beams):
+        found.append(_diagnostic(ERROR, 'dangling_point', 'beams', beams, model.beam_names,
+                                 "Beams referring to points that do not exist"))
+
+    sections = [b for (b, column) in model.beam_refs if column == 2]
+    if sections:
+        found.append(_diagnostic(ERROR, 'dangling_section', 'beams', sections, model.beam_names,
+                                 "Beams referring to sections that do not exist"))
+
+    positions = np.flatnonzero(model.shell_nodes < 0)
+    if len(positions):
+        shells = np.searchsorted(model.shell_offsets, positions, side='right') - 1
+        found.append(_diagnostic(ERROR, 'dangling_point', 'shells', shells, model.shell_names,
+                                 "Shells referring to points that do not exist"))
+    return found
+
+def check_beams(model):
+    """Beams of (near) zero length"""
+    lengths = model.beam_lengths()
+    short = np.flatnonzero(lengths < geometry.MIN_BEAM_LENGTH)
+    if not len(short):
+        return []
+    return [_diagnostic(ERROR, 'zero_length_beam', 'beams', short, model.beam_names,
+                        f"Beams shorter than {geometry.MIN_BEAM_LENGTH}")]
+
+def shell_areas(model):
+    """Area of every shell polygon (Newell's method) - NaN where a node is unresolved"""
+    offsets = model.shell_offsets
+    nodes = model.shell_nodes
+    sizes = np.diff(offsets)
+    areas = np.full(len(sizes), np.nan)
+    if not len(nodes):
+        return areas
+
+    # Each vertex paired with the next one of the same shell, wrapping around
+    positions = np.arange(len(nodes))
+    owner = np.repeat(np.arange(len(sizes)), sizes)
+    following = positions + 1
+    last = offsets[1:][sizes > 0] - 1
+    following[last] = offsets[:-1][sizes > 0]
+
+    points = model.coords[np.maximum(nodes, 0)]
+    cross = np.cross(points, points[following])
+    normals = np.zeros((len(sizes), 3))
+    np.add.at(normals, owner, cross)
+    resolved = np.ones(len(sizes), dtype=bool)
+    resolved[owner[nodes < 0]] = False
+    areas[resolved] = 0.5 * np.linalg.norm(normals[resolved], axis=1)
+    return areas
+
+def check_shells(model):
+    """Shells with repeated vertices, too few distinct vertices or no area"""
+    found = []
+    offsets = model.shell_offsets
+    nodes = model.shell_nodes
+    sizes = np.diff(offsets)
+    owner = np.repeat(np.arange(len(sizes)), sizes)
+
+    # Distinct resolved nodes per shell, from unique (shell, node) pairs
+    resolved = nodes >= 0
+    pairs = np.unique(np.stack([owner[resolved], nodes[resolved]]), axis=1) if resolved.any() else np.empty((2, 0), dtype=np.int64)
+    distinct = np.bincount(pairs[0], minlength=len(sizes))
+    repeated = np.flatnonzero(distinct < np.bincount(owner[resolved], minlength=len(sizes)))
+    if len(repeated):
+        found.append(_diagnostic(WARNING, 'duplicate_vertex', 'shells', repeated, model.shell_names,
+                                 "Shells using the same point more than once"))
+
+    # Only fully resolved shells can be measured
+    complete = np.ones(len(sizes), dtype=bool)
+    complete[owner[~resolved]] = False
+    areas = shell_areas(model)
+    extent = np.zeros(len(sizes))
+    if len(nodes):
+        points = model.coords[np.maximum(nodes, 0)]
+        spans = np.zeros((len(sizes), 3))
+        lows = np.full((len(sizes), 3), np.inf)
+        np.minimum.at(lows, owner, points)
+        np.maximum.at(spans, owner, points - lows[owner])
+        extent = np.linalg.norm(spans, axis=1)
+    flat = complete & (areas <= MIN_RELATIVE_AREA * np.maximum(extent, 1.0) ** 2)
+    degenerate = np.flatnonzero(complete & ((distinct < 3) | flat))
+    if len(degenerate):
+        found.append(_diagnostic(ERROR, 'degenerate_shell', 'shells', degenerate, model.shell_names,
+                                 "Shells with fewer than 3 distinct points or no area"))
+    return found
+
+def check_names(model):
+    """Names used by more than one element of the same kind"""
+    found = []
+    for kind, names in (('points', model.point_names), ('sections', model.section_names),
+                        ('beams', model.beam_names), ('shells', model.shell_names)):
+        if not names:
+            continue
+        _unique, inverse, counts = np.unique(np.array(names, dtype=object), return_inverse=True, return_counts=True)
+        duplicated = np.flatnonzero(counts[inverse] > 1)
+        if len(duplicated):
+            found.append(_diagnostic(ERROR, 'duplicate_name', kind, duplicated, names,
+                                     f"{kind.capitalize()} sharing a name"))
+    return found
+
+def check_sections(model):
+    """Sections that no beam uses"""
+    used = np.zeros(len(model.section_names), dtype=bool)
+    used[model.beam_section[model.beam_section >= 0]] = True
+    unused = np.flatnonzero(~used)
+    if not len(unused):
+        return []
+    return [_diagnostic(WARNING, 'unused_section', 'sections', unused, model.section_names,
+                        "Sections not used by any beam")]
+
+def check_section_walls(model):
+    """Open and hollow sections whose walls do not fit inside them"""
+    invalid = [s for s in range(len(model.section_names))
+               if not geometry.walls_fit(*model.section_profile(s))]
+    if not invalid:
+        return []
+    return [_diagnostic(ERROR, 'invalid_section', 'sections', invalid, model.section_names,
+                        "Sections with walls too thick for their size")]
+
+CHECKS = (check_references, check_beams, check_shells, check_names, check_sections, check_section_walls)
+
+def validate(model, checks=CHECKS):
+    """Run every check over a StructuralModel, returning a list of Diagnostics"""
+    diagnostics = []
+    for check in checks:
+        diagnostics.extend(check(model))
+    return diagnostics
+
+def summary(diagnostics):
+    """One line per diagnostic, e.g. 'ERROR zero_length_beam: 3 beams (B1, B7, B9)'"""
+    lines = []
+    for d in diagnostics:
+        shown = ", ".join(d.names[:5]) + (", ..." if len(d.names) > 5 else "")
+        lines.append(f"{d.severity} {d.code}: {len(d.indices)} {d.kind} ({shown})")
+    return lines
@@ -0,0 +1,43 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The bpy-free modules are imported straight from the source tree, as in headless use
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+FRAME = {
+    "structural_data": {
+        "points": {
+            "P1": [0.0, 0.0, 0.0],
+            "P2": [4.0, 0.0, 0.0],
+            "P3": [4.0, 3.0, 0.0],
+            "P4": [0.0, 3.0, 0.0],
+            "P5": [0.0, 0.0, 2.5],
+        },
+        "beams": {
+            "B1": {"start_point": "P1", "end_point": "P2", "section": "IPE"},
+            "B2": {"start_point": "P2", "end_point": "P3", "section": "RHS"},
+            "B3": {"start_point": "P1", "end_point": "P5", "diameter": 0.2},
+            "B4": {"start_point": "P4", "end_point": "P9", "section": "IPE"},
+        },
+        "shells": {
+            "S1": {"points": ["P1", "P2", "P3", "P4"], "thickness": 0.2},
+        },
+        "sections": {
+            "IPE": {"type": "I_SECTION", "width": 0.15, "height": 0.3,
+                    "web_thickness": 0.0071, "flange_thickness": 0.0107},
+            "RHS": {"type": "BOX", "width": 0.2, "height": 0.1, "wall_thickness": 0.008},
+        },
+        "metadata": {"units": {"length": "m"}},
+    }
+}
+
+
+@pytest.fixture
+def frame_file(tmp_path):
+    """A small model as a structural JSON file, with one dangling beam end (B4 -> P9)"""
+    path = tmp_path / "frame.json"
+    path.write_text(json.dumps(FRAME))
+    return str(path)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from blender_fea import binary_format
+from blender_fea.model import StructuralModel
+
+
+def elements(model):
+    return [(kind, name, value) for kind, name, value in model.iter_elements() if kind != 'metadata']
+
+
+def test_load_json(frame_file):
+    model = StructuralModel.load(frame_file)
+
+    assert model.counts() == {'points': 5, 'sections': 2, 'beams': 4, 'shells': 1}
+    assert model.metadata == {"units": {"length": "m"}}
+    np.testing.assert_allclose(model.beam_lengths()[:3], [4.0, 3.0, 2.5])
+    assert np.isnan(model.beam_lengths()[3])
+
+
+@pytest.mark.parametrize("compression", [None, 'gzip', 'xz'])
+def test_json_binary_round_trip(frame_file, tmp_path, compression):
+    original = StructuralModel.load(frame_file)
+
+    binary_path = str(tmp_path / ("frame" + binary_format.EXTENSION))
+    original.save(binary_path)
+    assert binary_format.is_binary_model(binary_path)
+    from_binary = StructuralModel.load(binary_path)
+
+    json_path = str(tmp_path / "again.json")
+    from_binary.save(json_path, indent=None, compression=compression)
+    assert not binary_format.is_binary_model(json_path)
+    from_json = StructuralModel.load(json_path)
+
+    for model in (from_binary, from_json):
+        assert elements(model) == elements(original)
+        assert model.metadata == original.metadata
+        np.testing.assert_array_equal(model.coords, original.coords)
+        np.testing.assert_array_equal(model.beam_nodes, original.beam_nodes)
+        np.testing.assert_array_equal(model.shell_offsets, original.shell_offsets)
+        np.testing.assert_array_equal(model.shell_nodes, original.shell_nodes)
+
+
+def test_unresolved_references_survive(frame_file, tmp_path):
+    path = str(tmp_path / ("frame" + binary_format.EXTENSION))
+    StructuralModel.load(frame_file).save(path)
+    model = StructuralModel.load(path)
+
+    b = model.index_of('beams', 'B4')
+    assert model.beam_nodes[b, 1] == -1
+    assert model.beam_refs[(b, 1)] == "P9"
+
+
+def test_save_metadata_override(frame_file, tmp_path):
+    model = StructuralModel.load(frame_file)
+    for name in ("frame.json", "frame" + binary_format.EXTENSION):
+        path = str(tmp_path / name)
+        model.save(path, metadata={"author": "test"})
+        assert StructuralModel.load(path).metadata == {"author": "test"}
+    assert model.metadata == {"units": {"length": "m"}}
@@ -0,0 +1,38 @@
+import numpy as np
+
+from blender_fea import spatial
+
+
+def brute_force_pairs(coords, tolerance):
+    delta = coords[:, None, :] - coords[None, :, :]
+    close = np.einsum('ijk,ijk->ij', delta, delta) <= tolerance * tolerance
+    return {(i, j) for i, j in zip(*np.nonzero(np.triu(close, k=1)))}
+
+
+def test_close_pairs_match_brute_force():
+    rng = np.random.default_rng(7)
+    coords = rng.uniform(0.0, 1.0, (400, 3))
+    coords[200:] = coords[:200] + rng.normal(0.0, 0.003, (200, 3))
+
+    pairs = spatial.close_pairs(coords, 0.01)
+    found = {tuple(pair) for pair in pairs.tolist()}
+    assert len(found) == len(pairs)
+    assert found == brute_force_pairs(coords, 0.01)
+
+
+def test_representatives_merge_transitively():
+    # 0-1 and 1-2 are within tolerance, 0-2 is not; 3 stands alone
+    coords = np.array([[0.0, 0.0, 0.0], [0.008, 0.0, 0.0], [0.016, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    np.testing.assert_array_equal(spatial.coincident_representatives(coords, 0.01), [0, 0, 0, 3])
+
+
+def test_representatives_keep_lowest_index():
+    coords = np.array([[5.0, 5.0, 5.0], [0.0, 0.0, 0.0], [5.0, 5.0, 5.0], [0.0, 0.0, 1e-6]])
+    np.testing.assert_array_equal(spatial.coincident_representatives(coords, 1e-3), [0, 1, 0, 1])
+
+
+def test_nothing_merged():
+    coords = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    np.testing.assert_array_equal(spatial.coincident_representatives(coords, 0.0), [0, 1])
+    np.testing.assert_array_equal(spatial.coincident_representatives(coords, 0.5), [0, 1])
+    assert spatial.close_pairs(coords[:1], 0.5).shape == (0, 2)
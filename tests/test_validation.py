@@ -0,0 +1,63 @@
+from blender_fea import validation
+from blender_fea.model import StructuralModel
+
+SECTION = {"type": "RECTANGULAR", "width": 0.1, "height": 0.2}
+
+
+def found(model):
+    """{(code, kind): names} of every diagnostic"""
+    return {(d.code, d.kind): d.names for d in model.validate()}
+
+
+def test_clean_model():
+    model = StructuralModel.from_elements([
+        ('points', "P1", [0.0, 0.0, 0.0]),
+        ('points', "P2", [1.0, 0.0, 0.0]),
+        ('points', "P3", [1.0, 1.0, 0.0]),
+        ('beams', "B1", {"start_point": "P1", "end_point": "P2", "section": "R"}),
+        ('shells', "S1", {"points": ["P1", "P2", "P3"], "thickness": 0.1}),
+        ('sections', "R", SECTION),
+    ])
+    assert model.validate() == []
+
+
+def test_references_and_sections(frame_file):
+    diagnostics = found(StructuralModel.load(frame_file))
+
+    assert diagnostics[('dangling_point', 'beams')] == ["B4"]
+    assert ('unused_section', 'sections') not in diagnostics
+    assert ('invalid_section', 'sections') not in diagnostics
+
+
+def test_every_check():
+    model = StructuralModel.from_elements([
+        ('points', "P1", [0.0, 0.0, 0.0]),
+        ('points', "P2", [1.0, 0.0, 0.0]),
+        ('points', "P3", [2.0, 0.0, 0.0]),
+        ('points', "P4", [1.0, 1.0, 0.0]),
+        ('points', "P4", [1.0, 1.0, 0.0]),
+        ('beams', "B1", {"start_point": "P1", "end_point": "P1", "diameter": 0.1}),
+        ('beams', "B2", {"start_point": "P1", "end_point": "P2", "section": "missing"}),
+        ('beams', "B3", {"start_point": "P1", "end_point": "nowhere", "diameter": 0.1}),
+        ('shells', "S1", {"points": ["P1", "P2", "P3"], "thickness": 0.1}),
+        ('shells', "S2", {"points": ["P1", "P2", "P4", "P4"], "thickness": 0.1}),
+        ('shells', "S3", {"points": ["P1", "P2", "nowhere"], "thickness": 0.1}),
+        ('sections', "unused", SECTION),
+        ('sections', "thick", {"type": "BOX", "width": 0.1, "height": 0.1, "wall_thickness": 0.06}),
+    ])
+    diagnostics = found(model)
+
+    assert diagnostics[('zero_length_beam', 'beams')] == ["B1"]
+    assert diagnostics[('dangling_section', 'beams')] == ["B2"]
+    assert diagnostics[('dangling_point', 'beams')] == ["B3"]
+    assert diagnostics[('dangling_point', 'shells')] == ["S3"]
+    # S1 is collinear; S2 repeats P4 but still spans an area
+    assert diagnostics[('degenerate_shell', 'shells')] == ["S1"]
+    assert diagnostics[('duplicate_vertex', 'shells')] == ["S2"]
+    assert diagnostics[('duplicate_name', 'points')] == ["P4", "P4"]
+    assert diagnostics[('unused_section', 'sections')] == ["unused", "thick"]
+    assert diagnostics[('invalid_section', 'sections')] == ["thick"]
+
+    severities = {d.code: d.severity for d in model.validate()}
+    assert severities['duplicate_vertex'] == validation.WARNING
+    assert severities['zero_length_beam'] == validation.ERROR